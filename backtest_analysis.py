@@ -428,8 +428,7 @@ def format_analysis_for_html(analysis: Dict[str, Any]) -> str:
             <div class="improvements-list">
         """
         
-        for imp in improvements:
-            html += f"""
+        html += "".join(f"""
             <div class="improvement-card">
                 <div class="improvement-priority">{imp['priority']}</div>
                 <div class="improvement-content">
@@ -438,7 +437,7 @@ def format_analysis_for_html(analysis: Dict[str, Any]) -> str:
                     <em>Suggestion:</em> {imp['suggestion']}
                 </div>
             </div>
-            """
+            """ for imp in improvements)
         
         html += """
             </div>
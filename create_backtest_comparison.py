@@ -154,6 +154,32 @@ def create_asset_class_summary(all_df):
     print("="*70)
 
 
+# Columns of the report's results tables, in display order
+RESULT_TABLE_COLUMNS = ['Symbol', 'Return [%]', 'Buy & Hold Return [%]', 'Max. Drawdown [%]',
+                        'Win Rate [%]', 'Profit Factor', '# Trades']
+
+
+def _results_table_rows(df):
+    """Build the <tr> rows of a results table, collected in a list and joined once"""
+    rows = []
+    # Plain tuples rather than a Series per row (iterrows)
+    for symbol, ret, buy_hold, max_dd, win_rate, profit_factor, n_trades in (
+            df[RESULT_TABLE_COLUMNS].itertuples(index=False, name=None)):
+        ret_class = 'positive' if ret > 0 else 'negative'
+        rows.append(f"""
+                <tr>
+                    <td><strong>{symbol}</strong></td>
+                    <td class="{ret_class}">{ret:.2f}%</td>
+                    <td>{buy_hold:.2f}%</td>
+                    <td class="negative">{max_dd:.2f}%</td>
+                    <td>{win_rate:.2f}%</td>
+                    <td>{profit_factor:.2f}</td>
+                    <td>{int(n_trades)}</td>
+                </tr>
+        """)
+    return "".join(rows)
+
+
 def create_html_report(all_df, stock_df, forex_df):
     """Create HTML report with results"""
     
@@ -275,19 +301,7 @@ def create_html_report(all_df, stock_df, forex_df):
                 </tr>
     """
     
-    for _, row in stock_df.iterrows():
-        ret_class = 'positive' if row['Return [%]'] > 0 else 'negative'
-        html_content += f"""
-                <tr>
-                    <td><strong>{row['Symbol']}</strong></td>
-                    <td class="{ret_class}">{row['Return [%]']:.2f}%</td>
-                    <td>{row['Buy & Hold Return [%]']:.2f}%</td>
-                    <td class="negative">{row['Max. Drawdown [%]']:.2f}%</td>
-                    <td>{row['Win Rate [%]']:.2f}%</td>
-                    <td>{row['Profit Factor']:.2f}</td>
-                    <td>{int(row['# Trades'])}</td>
-                </tr>
-        """
+    html_content += _results_table_rows(stock_df)
     
     html_content += """
             </table>
@@ -307,19 +321,7 @@ def create_html_report(all_df, stock_df, forex_df):
                 </tr>
     """
     
-    for _, row in forex_df.iterrows():
-        ret_class = 'positive' if row['Return [%]'] > 0 else 'negative'
-        html_content += f"""
-                <tr>
-                    <td><strong>{row['Symbol']}</strong></td>
-                    <td class="{ret_class}">{row['Return [%]']:.2f}%</td>
-                    <td>{row['Buy & Hold Return [%]']:.2f}%</td>
-                    <td class="negative">{row['Max. Drawdown [%]']:.2f}%</td>
-                    <td>{row['Win Rate [%]']:.2f}%</td>
-                    <td>{row['Profit Factor']:.2f}</td>
-                    <td>{int(row['# Trades'])}</td>
-                </tr>
-        """
+    html_content += _results_table_rows(forex_df)
     
     html_content += """
             </table>
@@ -60,6 +60,11 @@ def load_from_database(table_name: str, db_path: str) -> pd.DataFrame:
         else:
             raise ValueError(f"Error loading '{table_name}' from {db_path}: {str(e)}")
     
+    return _normalize_index(df)
+
+
+def _normalize_index(df: pd.DataFrame) -> pd.DataFrame:
+    """Turn a loaded table's timestamp column (or index) into a DatetimeIndex when possible."""
     # Normalize common index/timestamp column names into a proper DatetimeIndex
     # Common names: 'timestamp', 'date', 'datetime', 'index'
     idx_candidates = [c for c in df.columns if c.lower() in ("timestamp", "date", "datetime", "time", "index")]
@@ -94,6 +99,28 @@ def load_from_database(table_name: str, db_path: str) -> pd.DataFrame:
     return df
 
 
+def load_many_from_database(table_names: list, db_path: str) -> dict:
+    """
+    Load several tables from one SQLite database over a single connection.
+    
+    Args:
+        table_names: Names of the tables to load
+        db_path: Database path (e.g., 'sqlite:///forex.db')
+    
+    Returns:
+        Dictionary of table name -> DataFrame, indexed as by `load_from_database`.
+        Tables that do not exist are left out.
+    """
+    engine = create_engine(db_path)
+    with engine.connect() as conn:
+        existing = set(inspect(conn).get_table_names())
+        return {
+            name: _normalize_index(pd.read_sql(f"SELECT * FROM '{name}'", conn))
+            for name in table_names
+            if name in existing
+        }
+
+
 def list_tables(db_path: str) -> list:
     """
     List all tables in the database.
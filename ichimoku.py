@@ -10,8 +10,6 @@ warnings.filterwarnings("ignore", category=FutureWarning)
 import numpy as np
 import pandas as pd
 import pandas_ta as ta
-import plotly.graph_objects as go
-import plotly.express as px
 from database import load_from_database
 
 
@@ -313,6 +311,8 @@ def plot_signals_ichimoku(
     Returns:
         Plotly Figure
     """
+    import plotly.graph_objects as go
+
     data = df.iloc[start_idx:end_idx + 1].copy()
     if data.empty:
         raise ValueError("Selected slice is empty. Check start_idx/end_idx.")
@@ -427,6 +427,8 @@ def plot_ichimoku_cloud(
     Returns:
         Plotly Figure
     """
+    import plotly.graph_objects as go
+
     df = df.copy()
     if df.index.tz is None:
         df.index = df.index.tz_localize("UTC")
@@ -19,6 +19,16 @@ from strategy import SignalStrategy, SimpleSignalStrategy
 from config import CURRENCY_PAIRS, DATABASE_PATH
 from config import STOCKS_DB_PATH, STOCK_SYMBOLS, COMMODITY_SYMBOLS, COMMODITY_NAMES, COMMODITIES_DB_PATH
 
+# Multi-pair summary column -> backtesting.py statistic it is read from
+SUMMARY_STATS = {
+    "Return [%]": "Return [%]",
+    "Max DD [%]": "Max. Drawdown [%]",
+    "Avg DD [%]": "Avg. Drawdown [%]",
+    "Win Rate [%]": "Win Rate [%]",
+    "# Trades": "# Trades",
+    "Exposure [%]": "Exposure Time [%]",
+}
+
 
 def run_backtest_from_database(
     table_name: str,
@@ -188,34 +198,17 @@ def run_all_pairs_backtest(
                 show_plot=show_plot
             )
             
-            rows.append({
-                "Pair": f"{from_sym}/{to_sym}",
-                "Return [%]": safe_get(stats, "Return [%]"),
-                "Max DD [%]": safe_get(stats, "Max. Drawdown [%]"),
-                "Avg DD [%]": safe_get(stats, "Avg. Drawdown [%]"),
-                "Win Rate [%]": safe_get(stats, "Win Rate [%]"),
-                "# Trades": safe_get(stats, "# Trades"),
-                "Exposure [%]": safe_get(stats, "Exposure Time [%]"),
-            })
+            row = {col: safe_get(stats, key) for col, key in SUMMARY_STATS.items()}
         except Exception as e:
             print(f"   ⚠️ Error: {str(e)}")
-            rows.append({
-                "Pair": f"{from_sym}/{to_sym}",
-                "Return [%]": np.nan,
-                "Max DD [%]": np.nan,
-                "Avg DD [%]": np.nan,
-                "Win Rate [%]": np.nan,
-                "# Trades": np.nan,
-                "Exposure [%]": np.nan,
-            })
+            row = dict.fromkeys(SUMMARY_STATS, np.nan)
+        rows.append({"Pair": f"{from_sym}/{to_sym}", **row})
     
     # Create summary DataFrame
     df_summary = pd.DataFrame(rows)
     
-    # Add average row
-    avg_row = {"Pair": "AVERAGE"}
-    for col in ["Return [%]", "Max DD [%]", "Avg DD [%]", "Win Rate [%]", "# Trades", "Exposure [%]"]:
-        avg_row[col] = df_summary[col].mean(skipna=True)
+    # Add average row (one column-wise mean over the stats block)
+    avg_row = {"Pair": "AVERAGE", **df_summary[list(SUMMARY_STATS)].mean(skipna=True).to_dict()}
     
     df_summary = pd.concat([df_summary, pd.DataFrame([avg_row])], ignore_index=True)
     
@@ -30,11 +30,23 @@ Author: M365 Copilot
 import argparse
 import os
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+
+try:
+    import numba
+    from numba import njit, prange
+except Exception:
+    njit = None
+    prange = range
+else:
+    # The parallel kernels are launched from server and build threads. With TBB the
+    # interpreter can hang at exit once that happened off the main thread; OpenMP
+    # is thread-safe without that problem, so prefer it unless the user chose a layer.
+    if not {"NUMBA_THREADING_LAYER", "NUMBA_THREADING_LAYER_PRIORITY"} & set(os.environ):
+        numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
 
 
 # ------------------------------
@@ -68,34 +80,89 @@ def compute_indicators(df: pd.DataFrame, ema_span: int = 50, atr_span: int = 14)
     return df
 
 
+def _jit(func=None, **options):
+    """Compile `func` with Numba when it is installed; otherwise run it as plain Python.
+
+    Use as `@_jit` or `@_jit(parallel=True)`; `options` are passed to `njit`.
+    """
+    if func is None:
+        return lambda f: _jit(f, **options)
+    if njit is None:
+        return func
+    return njit(cache=True, **options)(func)
+
+
+def _as_float_array(values) -> np.ndarray:
+    """Return a contiguous float64 array for the Numba kernels."""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'ema', 'atr')
+
+
+def price_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Extract the OHLC and indicator columns as contiguous float64 arrays.
+
+    Build this once after `compute_indicators` and pass it to
+    `detect_order_blocks` and `refined_backtest` so the kernels share the
+    same arrays instead of each pulling the columns out of the DataFrame.
+    Columns missing from `df` (e.g. before indicators) are skipped.
+    """
+    return {k: _as_float_array(df[k].to_numpy()) for k in PRICE_COLUMNS if k in df.columns}
+
+
 # ------------------------------
 # OB Detection via 3-bar fractals
 # ------------------------------
-def _fractal_pivots(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
-    """Return boolean arrays marking 3-bar swing highs and swing lows."""
-    highs = df['high'].values
-    lows = df['low'].values
-    n = len(df)
-    pivot_high = np.zeros(n, dtype=bool)
-    pivot_low = np.zeros(n, dtype=bool)
-    for i in range(1, n - 1):
-        if highs[i] > highs[i - 1] and highs[i] > highs[i + 1]:
-            pivot_high[i] = True
-        if lows[i] < lows[i - 1] and lows[i] < lows[i + 1]:
-            pivot_low[i] = True
-    return pivot_high, pivot_low
-
-
-def _last_pivot(idx_list: List[int], i: int) -> int:
-    """Index of last pivot <= i; returns None if none."""
-    import bisect
-    pos = bisect.bisect_left(idx_list, i)
-    return idx_list[pos - 1] if pos > 0 else None
+@_jit
+def _detect_ob_kernel(opens, highs, lows, closes, lookback):
+    """
+    Scan for BOS bars and their order-block candles.
+
+    Returns (kind, ob_idx, bos_idx) arrays, kind being 1 for bullish and -1
+    for bearish OBs, in detection order.
+    """
+    n = highs.shape[0]
+    kind = np.empty(2 * n, np.int8)
+    ob_idx = np.empty(2 * n, np.int64)
+    bos_idx = np.empty(2 * n, np.int64)
+    count = 0
+    last_ph = -1
+    last_pl = -1
+    for i in range(2, n):
+        # A 3-bar pivot at i-1 is confirmed by bar i, so it is the last pivot before i
+        k = i - 1
+        if highs[k] > highs[k - 1] and highs[k] > highs[k + 1]:
+            last_ph = k
+        if lows[k] < lows[k - 1] and lows[k] < lows[k + 1]:
+            last_pl = k
+        start = max(0, i - lookback)
+        # Bullish BOS: OB is the last bearish candle within lookback
+        if last_ph >= 0 and highs[i] > highs[last_ph]:
+            for j in range(i - 1, start - 1, -1):
+                if closes[j] < opens[j]:
+                    kind[count] = 1
+                    ob_idx[count] = j
+                    bos_idx[count] = i
+                    count += 1
+                    break
+        # Bearish BOS: OB is the last bullish candle within lookback
+        if last_pl >= 0 and lows[i] < lows[last_pl]:
+            for j in range(i - 1, start - 1, -1):
+                if closes[j] > opens[j]:
+                    kind[count] = -1
+                    ob_idx[count] = j
+                    bos_idx[count] = i
+                    count += 1
+                    break
+    return kind[:count], ob_idx[:count], bos_idx[:count]
 
 
 def detect_order_blocks(
     df: pd.DataFrame,
-    lookback: int = 10
+    lookback: int = 10,
+    arrays: Optional[Dict[str, np.ndarray]] = None
 ) -> pd.DataFrame:
     """
     Detect OBs based on BOS relative to the last 3-bar swing high/low.
@@ -104,66 +171,152 @@ def detect_order_blocks(
       - Bullish BOS: today's high > last swing high ⇒ OB is last bearish candle body within lookback.
       - Bearish BOS: today's low < last swing low ⇒ OB is last bullish candle body within lookback.
 
+    `arrays` is an optional `price_arrays(df)` result to reuse.
+
     Returns: DataFrame with columns:
       ['type','ob_date','bos_date','ob_open','ob_close','ob_high','ob_low']
     """
-    highs = df['high'].values
-    lows = df['low'].values
-    opens = df['open'].values
-    closes = df['close'].values
-    n = len(df)
-
-    ph, pl = _fractal_pivots(df)
-    ph_idx = np.where(ph)[0].tolist()
-    pl_idx = np.where(pl)[0].tolist()
-
-    records = []
-    for i in range(2, n):
-        # Bullish BOS
-        lph = _last_pivot(ph_idx, i)
-        if lph is not None and highs[i] > highs[lph]:
-            start = max(0, i - lookback)
-            j_candidates = [j for j in range(start, i) if closes[j] < opens[j]]
-            if j_candidates:
-                j = j_candidates[-1]
-                records.append(dict(
-                    type='Bullish',
-                    ob_date=df.index[j],
-                    bos_date=df.index[i],
-                    ob_open=float(opens[j]),
-                    ob_close=float(closes[j]),
-                    ob_high=float(highs[j]),
-                    ob_low=float(lows[j]),
-                ))
-        # Bearish BOS
-        lpl = _last_pivot(pl_idx, i)
-        if lpl is not None and lows[i] < lows[lpl]:
-            start = max(0, i - lookback)
-            j_candidates = [j for j in range(start, i) if closes[j] > opens[j]]
-            if j_candidates:
-                j = j_candidates[-1]
-                records.append(dict(
-                    type='Bearish',
-                    ob_date=df.index[j],
-                    bos_date=df.index[i],
-                    ob_open=float(opens[j]),
-                    ob_close=float(closes[j]),
-                    ob_high=float(highs[j]),
-                    ob_low=float(lows[j]),
-                ))
-    ob = pd.DataFrame(records).sort_values('bos_date').reset_index(drop=True)
-    return ob
+    if arrays is None:
+        arrays = price_arrays(df)
+    opens = arrays['open']
+    highs = arrays['high']
+    lows = arrays['low']
+    closes = arrays['close']
+
+    kind, ob_idx, bos_idx = _detect_ob_kernel(opens, highs, lows, closes, int(lookback))
+
+    ob = pd.DataFrame({
+        'type': np.where(kind == 1, 'Bullish', 'Bearish'),
+        'ob_date': df.index[ob_idx],
+        'bos_date': df.index[bos_idx],
+        'ob_open': opens[ob_idx],
+        'ob_close': closes[ob_idx],
+        'ob_high': highs[ob_idx],
+        'ob_low': lows[ob_idx],
+    })
+    return ob.sort_values('bos_date', kind='stable').reset_index(drop=True)
 
 
 # ------------------------------
 # Refined Backtest (partial 1R, BE, 2R)
 # ------------------------------
+@_jit
+def _refined_backtest_kernel(
+    opens, highs, lows, closes, ema, atr,
+    kind, bos_idx, ob_open, ob_close, ob_low, ob_high,
+    entry_wait_bars, atr_threshold, stop_on_tie,
+):
+    """
+    Simulate one trade per OB row.
+
+    Returns (entry_idx, entry, stop, R, outcome_R) arrays aligned with the OB
+    rows; entry_idx is -1 where the OB produced no trade. Prices are mirrored
+    with `s` (+1 bullish, -1 bearish) so one code path handles both sides.
+    """
+    n = highs.shape[0]
+    m = kind.shape[0]
+    entry_idx = np.full(m, -1, np.int64)
+    entry = np.zeros(m)
+    stop_px = np.zeros(m)
+    risk = np.zeros(m)
+    outcome = np.zeros(m)
+
+    for k in range(m):
+        bos_i = bos_idx[k]
+        if bos_i >= n - 1:
+            continue
+        s = 1.0 if kind[k] == 1 else -1.0
+        # Adverse side touches the OB/stop, favourable side reaches the targets
+        adverse = lows if kind[k] == 1 else highs
+        favourable = highs if kind[k] == 1 else lows
+        mid = (ob_open[k] + ob_close[k]) / 2.0
+
+        # Mitigation touch + confirmation candle + EMA bias & ATR filter
+        entry_i = -1
+        end = min(bos_i + 1 + entry_wait_bars, n)
+        for i in range(bos_i + 1, end):
+            if (
+                adverse[i] * s <= mid * s
+                and closes[i] * s > opens[i] * s
+                and closes[i] * s > mid * s
+                and closes[i] * s > ema[i] * s
+                and atr[i] >= atr_threshold
+            ):
+                entry_i = i
+                break
+        if entry_i < 0:
+            continue
+        entry_px = mid
+        stop = ob_low[k] if kind[k] == 1 else ob_high[k]
+        if entry_px * s <= stop * s:
+            continue
+        R = (entry_px - stop) * s
+        r1 = entry_px + s * R
+        r2 = entry_px + 2.0 * s * R
+
+        partial_taken = False
+        exited = False
+        total_R = 0.0
+        for t in range(entry_i + 1, n):
+            adv = adverse[t] * s
+            fav = favourable[t] * s
+            if not partial_taken:
+                stop_hit = adv <= stop * s
+                if stop_hit:
+                    # Stop-first also covers the case where 1R is tagged on the same bar
+                    total_R = -1.0
+                    exited = True
+                    break
+                if fav >= r1 * s:
+                    partial_taken = True
+                    # +0.5R realized; stop moves to BE. Same-bar check for r2 vs BE.
+                    r2_hit_same = fav >= r2 * s
+                    be_hit_same = adv <= entry_px * s
+                    if stop_on_tie and be_hit_same and r2_hit_same:
+                        total_R = 0.5
+                        exited = True
+                        break
+                    if r2_hit_same:
+                        total_R = 0.5 * 1.0 + 0.5 * 2.0
+                        exited = True
+                        break
+                    if be_hit_same:
+                        total_R = 0.5
+                        exited = True
+                        break
+            else:
+                stop_hit = adv <= entry_px * s
+                r2_hit = fav >= r2 * s
+                if stop_hit:
+                    total_R = 0.5
+                    exited = True
+                    break
+                if r2_hit:
+                    total_R = 0.5 * 1.0 + 0.5 * 2.0
+                    exited = True
+                    break
+
+        if not exited:
+            # End-of-series close handling
+            rem_R = (closes[n - 1] - entry_px) * s / R
+            total_R = 0.5 * 1.0 + 0.5 * rem_R if partial_taken else rem_R
+
+        entry_idx[k] = entry_i
+        entry[k] = entry_px
+        stop_px[k] = stop
+        risk[k] = R
+        outcome[k] = total_R
+
+    return entry_idx, entry, stop_px, risk, outcome
+
+
 def refined_backtest(
     df: pd.DataFrame,
     ob: pd.DataFrame,
     entry_wait_bars: int = 60,
     atr_threshold: float = 0.0060,
-    stop_on_tie: bool = True
+    stop_on_tie: bool = True,
+    arrays: Optional[Dict[str, np.ndarray]] = None
 ) -> pd.DataFrame:
     """
     Execute refined backtest:
@@ -172,238 +325,331 @@ def refined_backtest(
       - 50% partial at 1R, move stop to BE, and aim for 2R on remaining half.
       - Conservative 'stop-first' rule when both levels are touched in same bar.
 
+    `arrays` is an optional `price_arrays(df)` result to reuse.
+
     Returns: trades DataFrame with columns:
       ['type','ob_date','bos_date','entry_date','entry','stop','R','outcome_R']
     """
-    highs = df['high'].values
-    lows = df['low'].values
-    opens = df['open'].values
-    closes = df['close'].values
-    n = len(df)
-
-    trades = []
-
-    # Helper: index of date
-    def idx_of(ts) -> int:
-        try:
-            return df.index.get_loc(ts)
-        except KeyError:
-            return df.index.searchsorted(ts)
-
-    for _, row in ob.iterrows():
-        typ = row['type']
-        bos_i = idx_of(row['bos_date'])
-        if bos_i is None or bos_i >= n - 1:
-            continue
+    if ob.empty:
+        return pd.DataFrame()
+    if arrays is None:
+        arrays = price_arrays(df)
+
+    # Locate each BOS bar; dates missing from the index map to their insertion point
+    bos_dates = pd.Index(ob['bos_date'])
+    bos_idx = df.index.get_indexer(bos_dates)
+    missing = bos_idx < 0
+    if missing.any():
+        bos_idx[missing] = df.index.searchsorted(bos_dates[missing])
+
+    entry_idx, entry, stop, risk, outcome = _refined_backtest_kernel(
+        arrays['open'],
+        arrays['high'],
+        arrays['low'],
+        arrays['close'],
+        arrays['ema'],
+        arrays['atr'],
+        np.ascontiguousarray(np.where(ob['type'].to_numpy() == 'Bullish', 1, -1).astype(np.int8)),
+        np.ascontiguousarray(bos_idx.astype(np.int64)),
+        _as_float_array(ob['ob_open'].values),
+        _as_float_array(ob['ob_close'].values),
+        _as_float_array(ob['ob_low'].values),
+        _as_float_array(ob['ob_high'].values),
+        int(entry_wait_bars),
+        float(atr_threshold),
+        bool(stop_on_tie),
+    )
 
-        ob_open = row['ob_open']
-        ob_close = row['ob_close']
-        ob_low = row['ob_low']
-        ob_high = row['ob_high']
-        mid = (ob_open + ob_close) / 2.0
+    taken = entry_idx >= 0
+    if not taken.any():
+        return pd.DataFrame()
+    return pd.DataFrame({
+        'type': ob['type'].to_numpy()[taken],
+        'ob_date': ob['ob_date'].to_numpy()[taken],
+        'bos_date': ob['bos_date'].to_numpy()[taken],
+        'entry_date': df.index[entry_idx[taken]],
+        'entry': entry[taken],
+        'stop': stop[taken],
+        'R': risk[taken],
+        'outcome_R': outcome[taken],
+    })
+
+
+@_jit
+def _scan_obs_kernel(
+    opens, highs, lows, closes, ema, atr, kind, ob_idx, bos_idx,
+    entry_wait_bars, atr_threshold, stop_on_tie,
+):
+    """
+    Simulate the trades of OBs already found by `_detect_ob_kernel`.
 
-        # Search for mitigation + confirmation within window
-        start = bos_i + 1
-        end = min(bos_i + 1 + entry_wait_bars, n)
-        entry_i = None
-        entry_px = None
-
-        if typ == 'Bullish':
-            for i in range(start, end):
-                # mitigation touch
-                if lows[i] <= mid:
-                    # confirmation in zone: candle closes bullish and above mid
-                    if closes[i] > opens[i] and closes[i] > mid:
-                        # Filters: EMA bias & ATR threshold
-                        if df['close'].iloc[i] > df['ema'].iloc[i] and df['atr'].iloc[i] >= atr_threshold:
-                            entry_i = i
-                            entry_px = mid
-                            break
-            if entry_i is None:
-                continue
-            stop = ob_low
-            if entry_px <= stop:
-                continue
-            R = entry_px - stop
-            r1 = entry_px + 1.0 * R
-            r2 = entry_px + 2.0 * R
-
-            partial_taken = False
-            total_R = None
-            exit_i = None
-
-            for t in range(entry_i + 1, n):
-                lo = lows[t]
-                hi = highs[t]
-                if not partial_taken:
-                    stop_hit = lo <= stop
-                    r1_hit = hi >= r1
-
-                    if stop_on_tie:
-                        if stop_hit and r1_hit:
-                            total_R = -1.0
-                            exit_i = t
-                            break
-
-                    if stop_hit:
-                        total_R = -1.0
-                        exit_i = t
-                        break
-                    if r1_hit:
-                        partial_taken = True
-                        # +0.5R realized; move SL to BE
-                        stop_be = entry_px
-                        # Same-bar check for r2 vs BE (conservative stop-first)
-                        r2_hit_same = hi >= r2
-                        be_hit_same = lo <= stop_be
-                        if stop_on_tie and be_hit_same and r2_hit_same:
-                            total_R = 0.5 * 1.0 + 0.0
-                            exit_i = t
-                            break
-                        if r2_hit_same:
-                            total_R = 0.5 * 1.0 + 0.5 * 2.0
-                            exit_i = t
-                            break
-                        if be_hit_same:
-                            total_R = 0.5 * 1.0 + 0.0
-                            exit_i = t
-                            break
-                        trailing = {'stop_be': stop_be, 'r2': r2}
-                        continue
-                else:
-                    stop_hit = lows[t] <= trailing['stop_be']
-                    r2_hit = highs[t] >= trailing['r2']
-                    if stop_on_tie and stop_hit and r2_hit:
-                        total_R = 0.5 * 1.0 + 0.0
-                        exit_i = t
-                        break
-                    if stop_hit:
-                        total_R = 0.5 * 1.0 + 0.0
-                        exit_i = t
-                        break
-                    if r2_hit:
-                        total_R = 0.5 * 1.0 + 0.5 * 2.0
-                        exit_i = t
-                        break
+    Returns (kind, ob_idx, bos_idx, entry_idx, entry, stop, R, outcome_R),
+    covering only the OBs that produced a trade, in detection order.
+    """
+    entry_idx, entry, stop, risk, outcome = _refined_backtest_kernel(
+        opens, highs, lows, closes, ema, atr,
+        kind, bos_idx, opens[ob_idx], closes[ob_idx], lows[ob_idx], highs[ob_idx],
+        entry_wait_bars, atr_threshold, stop_on_tie,
+    )
+    taken = entry_idx >= 0
+    return (
+        kind[taken], ob_idx[taken], bos_idx[taken],
+        entry_idx[taken], entry[taken], stop[taken], risk[taken], outcome[taken],
+    )
 
-            if exit_i is None:
-                # End-of-series close handling
-                if partial_taken:
-                    rem_R = (closes[n - 1] - entry_px) / R
-                    total_R = 0.5 * 1.0 + 0.5 * rem_R
-                else:
-                    total_R = (closes[n - 1] - entry_px) / R
-                exit_i = n - 1
-
-            trades.append(dict(
-                type=typ,
-                ob_date=row['ob_date'],
-                bos_date=row['bos_date'],
-                entry_date=df.index[entry_i],
-                entry=float(entry_px),
-                stop=float(stop),
-                R=float(R),
-                outcome_R=float(total_R),
-            ))
-
-        else:  # Bearish
-            for i in range(start, end):
-                if highs[i] >= mid:
-                    if closes[i] < opens[i] and closes[i] < mid:
-                        if df['close'].iloc[i] < df['ema'].iloc[i] and df['atr'].iloc[i] >= atr_threshold:
-                            entry_i = i
-                            entry_px = mid
-                            break
-            if entry_i is None:
-                continue
-            stop = ob_high
-            if entry_px >= stop:
-                continue
-            R = stop - entry_px
-            r1 = entry_px - 1.0 * R
-            r2 = entry_px - 2.0 * R
-
-            partial_taken = False
-            total_R = None
-            exit_i = None
-
-            for t in range(entry_i + 1, n):
-                lo = lows[t]
-                hi = highs[t]
-                if not partial_taken:
-                    stop_hit = hi >= stop
-                    r1_hit = lo <= r1
-
-                    if stop_on_tie:
-                        if stop_hit and r1_hit:
-                            total_R = -1.0
-                            exit_i = t
-                            break
-
-                    if stop_hit:
-                        total_R = -1.0
-                        exit_i = t
-                        break
-                    if r1_hit:
-                        partial_taken = True
-                        stop_be = entry_px
-                        r2_hit_same = lo <= r2
-                        be_hit_same = hi >= stop_be
-                        if stop_on_tie and be_hit_same and r2_hit_same:
-                            total_R = 0.5 * 1.0 + 0.0
-                            exit_i = t
-                            break
-                        if r2_hit_same:
-                            total_R = 0.5 * 1.0 + 0.5 * 2.0
-                            exit_i = t
-                            break
-                        if be_hit_same:
-                            total_R = 0.5 * 1.0 + 0.0
-                            exit_i = t
-                            break
-                        trailing = {'stop_be': stop_be, 'r2': r2}
-                        continue
-                else:
-                    stop_hit = highs[t] >= trailing['stop_be']
-                    r2_hit = lows[t] <= trailing['r2']
-                    if stop_on_tie and stop_hit and r2_hit:
-                        total_R = 0.5 * 1.0 + 0.0
-                        exit_i = t
-                        break
-                    if stop_hit:
-                        total_R = 0.5 * 1.0 + 0.0
-                        exit_i = t
-                        break
-                    if r2_hit:
-                        total_R = 0.5 * 1.0 + 0.5 * 2.0
-                        exit_i = t
-                        break
 
-            if exit_i is None:
-                if partial_taken:
-                    rem_R = (entry_px - closes[n - 1]) / R
-                    total_R = 0.5 * 1.0 + 0.5 * rem_R
-                else:
-                    total_R = (entry_px - closes[n - 1]) / R
-                exit_i = n - 1
+@_jit
+def _ob_scan_kernel(
+    opens, highs, lows, closes, ema, atr,
+    lookback, entry_wait_bars, atr_threshold, stop_on_tie,
+):
+    """
+    Detect OBs and simulate their trades in one compiled call.
 
-            trades.append(dict(
-                type=typ,
-                ob_date=row['ob_date'],
-                bos_date=row['bos_date'],
-                entry_date=df.index[entry_i],
-                entry=float(entry_px),
-                stop=float(stop),
-                R=float(R),
-                outcome_R=float(total_R),
-            ))
+    Returns (ob_count, kind, ob_idx, bos_idx, entry_idx, entry, stop, R,
+    outcome_R); every array but ob_count covers only the OBs that produced a
+    trade, in detection order.
+    """
+    kind, ob_idx, bos_idx = _detect_ob_kernel(opens, highs, lows, closes, lookback)
+    t_kind, t_ob_idx, t_bos_idx, entry_idx, entry, stop, risk, outcome = _scan_obs_kernel(
+        opens, highs, lows, closes, ema, atr, kind, ob_idx, bos_idx,
+        entry_wait_bars, atr_threshold, stop_on_tie,
+    )
+    return kind.shape[0], t_kind, t_ob_idx, t_bos_idx, entry_idx, entry, stop, risk, outcome
 
-    return pd.DataFrame(trades)
+
+def ob_backtest(
+    df: pd.DataFrame,
+    lookback: int = 10,
+    entry_wait_bars: int = 60,
+    atr_threshold: float = 0.0060,
+    stop_on_tie: bool = True,
+    arrays: Optional[Dict[str, np.ndarray]] = None
+) -> Tuple[int, pd.DataFrame]:
+    """
+    `detect_order_blocks` followed by `refined_backtest`, without the OB DataFrame in between.
+
+    Both steps run in a single kernel on the raw price arrays; pandas is only
+    used to label the resulting trades with their dates. `df` needs the
+    `compute_indicators` columns and `arrays` is an optional `price_arrays(df)`
+    result to reuse.
+
+    Returns: (number of OBs detected, trades DataFrame as from `refined_backtest`)
+    """
+    if arrays is None:
+        arrays = price_arrays(df)
+    ob_count, kind, ob_idx, bos_idx, entry_idx, entry, stop, risk, outcome = _ob_scan_kernel(
+        arrays['open'],
+        arrays['high'],
+        arrays['low'],
+        arrays['close'],
+        arrays['ema'],
+        arrays['atr'],
+        int(lookback),
+        int(entry_wait_bars),
+        float(atr_threshold),
+        bool(stop_on_tie),
+    )
+    return int(ob_count), _scan_trades(df, kind, ob_idx, bos_idx, entry_idx, entry, stop, risk, outcome)
+
+
+def _scan_trades(df, kind, ob_idx, bos_idx, entry_idx, entry, stop, risk, outcome) -> pd.DataFrame:
+    """Label the trade arrays of `_ob_scan_kernel` with `df`'s dates."""
+    if kind.shape[0] == 0:
+        return pd.DataFrame()
+    trades = pd.DataFrame({
+        'type': np.where(kind == 1, 'Bullish', 'Bearish'),
+        'ob_date': df.index[ob_idx],
+        'bos_date': df.index[bos_idx],
+        'entry_date': df.index[entry_idx],
+        'entry': entry,
+        'stop': stop,
+        'R': risk,
+        'outcome_R': outcome,
+    })
+    # Detection order is BOS-date order unless the index itself is out of order
+    if not df.index.is_monotonic_increasing:
+        trades = trades.sort_values('bos_date', kind='stable').reset_index(drop=True)
+    return trades
+
+
+@_jit(parallel=True)
+def _ob_scan_batch_kernel(
+    prices, lengths,
+    lookback, entry_wait_bars, atr_threshold, stop_on_tie,
+):
+    """
+    `_ob_scan_kernel` over a batch of series, one thread per series, detecting
+    each series' OBs once and then simulating them with `_scan_obs_kernel`.
+
+    `prices` is (n_series, len(PRICE_COLUMNS), max_bars), zero-padded past
+    each series' `lengths`. Returns (ob_count, offsets, trade_count,
+    trade_idx, trade_px): trade_idx holds the kind/ob/bos/entry index rows
+    and trade_px the entry/stop/R/outcome_R rows of every series back to
+    back, series i starting at column offsets[i] and valid for
+    trade_count[i] columns.
+    """
+    n_series = prices.shape[0]
+    # First pass: detect each series' OBs into flat buffers; a series yields at
+    # most two OBs per bar, so series i starts at twice the bars before it
+    det_offsets = np.zeros(n_series + 1, np.int64)
+    det_offsets[1:] = np.cumsum(2 * lengths)
+    det_kind = np.empty(det_offsets[n_series], np.int8)
+    det_ob_idx = np.empty(det_offsets[n_series], np.int64)
+    det_bos_idx = np.empty(det_offsets[n_series], np.int64)
+    ob_count = np.zeros(n_series, np.int64)
+    for i in prange(n_series):
+        n = lengths[i]
+        kind, ob_idx, bos_idx = _detect_ob_kernel(
+            prices[i, 0, :n].copy(), prices[i, 1, :n].copy(), prices[i, 2, :n].copy(),
+            prices[i, 3, :n].copy(), lookback,
+        )
+        m = kind.shape[0]
+        lo = det_offsets[i]
+        det_kind[lo:lo + m] = kind
+        det_ob_idx[lo:lo + m] = ob_idx
+        det_bos_idx[lo:lo + m] = bos_idx
+        ob_count[i] = m
+    # Every OB trades at most once, so the OB counts size the (flat) trade buffers
+    offsets = np.zeros(n_series + 1, np.int64)
+    offsets[1:] = np.cumsum(ob_count)
+    trade_count = np.zeros(n_series, np.int64)
+    trade_idx = np.zeros((4, offsets[n_series]), np.int64)
+    trade_px = np.zeros((4, offsets[n_series]))
+    # Second pass: simulate the detected OBs' trades
+    for i in prange(n_series):
+        n = lengths[i]
+        d_lo = det_offsets[i]
+        d_hi = d_lo + ob_count[i]
+        kind, ob_idx, bos_idx, entry_idx, entry, stop, risk, outcome = _scan_obs_kernel(
+            prices[i, 0, :n].copy(), prices[i, 1, :n].copy(), prices[i, 2, :n].copy(),
+            prices[i, 3, :n].copy(), prices[i, 4, :n].copy(), prices[i, 5, :n].copy(),
+            det_kind[d_lo:d_hi].copy(), det_ob_idx[d_lo:d_hi].copy(), det_bos_idx[d_lo:d_hi].copy(),
+            entry_wait_bars, atr_threshold, stop_on_tie,
+        )
+        m = kind.shape[0]
+        lo = offsets[i]
+        hi = lo + m
+        trade_count[i] = m
+        trade_idx[0, lo:hi] = kind
+        trade_idx[1, lo:hi] = ob_idx
+        trade_idx[2, lo:hi] = bos_idx
+        trade_idx[3, lo:hi] = entry_idx
+        trade_px[0, lo:hi] = entry
+        trade_px[1, lo:hi] = stop
+        trade_px[2, lo:hi] = risk
+        trade_px[3, lo:hi] = outcome
+    return ob_count, offsets, trade_count, trade_idx, trade_px
+
+
+def ob_backtest_batch(
+    frames: List[pd.DataFrame],
+    lookback: int = 10,
+    entry_wait_bars: int = 60,
+    atr_threshold: float = 0.0060,
+    stop_on_tie: bool = True
+) -> List[Tuple[int, pd.DataFrame]]:
+    """
+    `ob_backtest` for several independent series in one parallel kernel call.
+
+    Each frame needs the `compute_indicators` columns. The series are packed
+    into one padded float64 array and scanned in parallel threads.
+
+    Returns: one (number of OBs detected, trades DataFrame) pair per frame.
+    """
+    if not frames:
+        return []
+    lengths = np.array([len(df) for df in frames], np.int64)
+    prices = np.zeros((len(frames), len(PRICE_COLUMNS), max(1, int(lengths.max()))))
+    for i, df in enumerate(frames):
+        prices[i, :, :lengths[i]] = df[list(PRICE_COLUMNS)].to_numpy(np.float64).T
+    ob_count, offsets, trade_count, trade_idx, trade_px = _ob_scan_batch_kernel(
+        prices, lengths, int(lookback), int(entry_wait_bars), float(atr_threshold), bool(stop_on_tie),
+    )
+    out = []
+    for i, df in enumerate(frames):
+        lo = offsets[i]
+        hi = lo + trade_count[i]
+        kind, ob_idx, bos_idx, entry_idx = trade_idx[:, lo:hi]
+        entry, stop, risk, outcome = trade_px[:, lo:hi]
+        trades = _scan_trades(df, kind, ob_idx, bos_idx, entry_idx, entry, stop, risk, outcome)
+        out.append((int(ob_count[i]), trades))
+    return out
 
 
 # ------------------------------
 # Reporting & Charts
 # ------------------------------
+@_jit(parallel=True)
+def outcome_r_stats(outcome_r):
+    """
+    Reduce an array of trade R-multiples in one pass.
+
+    Returns (wins, losses, total_R) where wins are trades with R > 0 and
+    everything else counts as a loss.
+    """
+    wins = 0
+    total = 0.0
+    for i in prange(outcome_r.shape[0]):
+        v = outcome_r[i]
+        total += v
+        if v > 0:
+            wins += 1
+    return wins, outcome_r.shape[0] - wins, total
+
+
+@_jit
+def outcome_r_breakdown(outcome_r):
+    """
+    Split trade R-multiples into winners (R > 0) and the rest in one pass.
+
+    Returns (win_sum, loss_sum, win_count, loss_count, largest, smallest);
+    largest/smallest are 0.0 for an empty array.
+    """
+    win_sum = 0.0
+    loss_sum = 0.0
+    win_count = 0
+    largest = -np.inf
+    smallest = np.inf
+    n = outcome_r.shape[0]
+    for i in range(n):
+        v = outcome_r[i]
+        if v > 0:
+            win_sum += v
+            win_count += 1
+        else:
+            loss_sum += v
+        if v > largest:
+            largest = v
+        if v < smallest:
+            smallest = v
+    if n == 0:
+        largest = 0.0
+        smallest = 0.0
+    return win_sum, loss_sum, win_count, n - win_count, largest, smallest
+
+
+def warm_up_kernels() -> None:
+    """
+    Compile (or load from Numba's on-disk cache) every kernel in this module.
+
+    Call once at process start-up so the first backtest request does not pay
+    the JIT compile time. A no-op cost when numba is not installed.
+    """
+    bars = np.array([1.0, 2.0, 1.5, 2.5, 1.0, 3.0])
+    kind, ob_idx, bos_idx = _detect_ob_kernel(bars, bars + 0.5, bars - 0.5, bars[::-1].copy(), 3)
+    _refined_backtest_kernel(
+        bars, bars + 0.5, bars - 0.5, bars[::-1].copy(), bars, bars,
+        np.array([1, -1], np.int8), np.array([1, 2], np.int64),
+        bars[:2].copy(), bars[1:3].copy(), bars[:2] - 1.0, bars[:2] + 1.0,
+        5, 0.0, True,
+    )
+    _ob_scan_kernel(bars, bars + 0.5, bars - 0.5, bars[::-1].copy(), bars, bars, 3, 5, 0.0, True)
+    _ob_scan_batch_kernel(np.stack([bars, bars + 0.5, bars - 0.5, bars[::-1], bars, bars])[None], np.array([6], np.int64), 3, 5, 0.0, True)
+    outcome_r_stats(bars)
+    outcome_r_breakdown(bars)
+
+
 def summarize_trades(trades: pd.DataFrame) -> Dict:
     """Compute global metrics."""
     if trades.empty:
@@ -414,33 +660,42 @@ def summarize_trades(trades: pd.DataFrame) -> Dict:
             'avg_outcome_R': 0.0,
             'win_rate_pos_R': 0.0,
         }
+    r = trades['outcome_R'].to_numpy(dtype=np.float64)
+    kind = trades['type'].to_numpy()
     out = {
-        'num_trades': int(len(trades)),
-        'bullish_trades': int((trades['type'] == 'Bullish').sum()),
-        'bearish_trades': int((trades['type'] == 'Bearish').sum()),
-        'avg_outcome_R': float(trades['outcome_R'].mean()),
-        'win_rate_pos_R': float((trades['outcome_R'] > 0).mean()),
+        'num_trades': int(r.size),
+        'bullish_trades': int((kind == 'Bullish').sum()),
+        'bearish_trades': int((kind == 'Bearish').sum()),
+        'avg_outcome_R': float(r.mean()),
+        'win_rate_pos_R': float((r > 0).mean()),
     }
     return out
 
 
 def year_by_year(trades: pd.DataFrame) -> pd.DataFrame:
     """Aggregate trades by calendar year."""
-    trades = trades.copy()
-    trades['year'] = trades['entry_date'].dt.year
-    by_year = trades.groupby('year').agg(
-        trades=('outcome_R', 'count'),
-        avg_R=('outcome_R', 'mean'),
-        win_rate=('outcome_R', lambda s: (s > 0).mean()),
-        cum_R=('outcome_R', 'sum'),
-        bulls=('type', lambda s: (s == 'Bullish').sum()),
-        bears=('type', lambda s: (s == 'Bearish').sum()),
-    ).reset_index()
+    years, inv = np.unique(trades['entry_date'].dt.year.to_numpy(), return_inverse=True)
+    r = trades['outcome_R'].to_numpy(dtype=np.float64)
+    kind = trades['type'].to_numpy()
+    n = years.size
+    count = np.bincount(inv, minlength=n)
+    cum_r = np.bincount(inv, weights=r, minlength=n)
+    by_year = pd.DataFrame({
+        'year': years,
+        'trades': count,
+        'avg_R': cum_r / count,
+        'win_rate': np.bincount(inv, weights=r > 0, minlength=n) / count,
+        'cum_R': cum_r,
+        'bulls': np.bincount(inv[kind == 'Bullish'], minlength=n),
+        'bears': np.bincount(inv[kind == 'Bearish'], minlength=n),
+    })
     return by_year
 
 
 def plot_equity_curve(trades: pd.DataFrame, outpath: str):
     """Plot cumulative R equity curve (chronological by entry date)."""
+    import matplotlib.pyplot as plt
+
     if trades.empty:
         return
     srt = trades.sort_values('entry_date')
@@ -459,6 +714,8 @@ def plot_equity_curve(trades: pd.DataFrame, outpath: str):
 
 def plot_yearly_cumR(by_year: pd.DataFrame, outpath: str):
     """Bar chart of cumulative R per year."""
+    import matplotlib.pyplot as plt
+
     if by_year.empty:
         return
     plt.figure(figsize=(12, 5))
@@ -11,43 +11,214 @@ Features:
 - Commodity & stock pair support
 
 Usage:
-  # Build cached summary
+  # Build cached summary (also prerenders every pair page and its charts)
   python ob_ui.py --build
 
-  # Run web server (default: http://127.0.0.1:5001)
+  # Run web server (default: http://127.0.0.1:5001); add --debug for the reloader
   python ob_ui.py --port 5001
+
+  # Production: serve with waitress (8 threads) instead of the dev server
+  python ob_ui.py --prod --host 0.0.0.0
+
+  # ...or run under gunicorn
+  gunicorn -k gthread -w 4 --threads 8 -b 0.0.0.0:5001 ob_ui:APP
+
+  # Rebuild the cache in the background while the server keeps serving
+  curl -X POST http://127.0.0.1:5001/rebuild
+
+  Responses are Brotli/gzip compressed when Flask-Compress is installed
+  (plain gzip via the stdlib otherwise).
+  With kaleido installed, --build also exports PNG thumbnails for the chart
+  cards; the interactive chart then only loads in the expanded view.
+
+Deployment:
+  Page CSS/JS live under ./static and are referenced by URL, so a reverse
+  proxy can serve them without touching Flask, e.g. for nginx:
+
+    location /static/ { alias /path/to/AVV/static/; expires 30d; }
+
+  Chart files can be handed off the same way: run with
+  OB_CHART_ACCEL_PREFIX=/internal-charts/ and add
+
+    location /internal-charts/ {
+        internal;
+        alias /path/to/AVV/;
+        sendfile on;
+        tcp_nopush on;
+        gzip_static on;
+        brotli_static on;  # serves the .br files written by --build (ngx_brotli)
+        add_header Cache-Control "public, max-age=3600, stale-while-revalidate=86400";
+    }
+
+  Behind Apache (mod_xsendfile) or lighttpd, set OB_USE_X_SENDFILE=1 instead
+  so chart and static files are sent with X-Sendfile.
+
+  Chart pages load plotly.js from its CDN. For offline hosts, run with
+  OB_PLOTLY_JS=local: the bundle of the installed plotly package is written
+  to static/plotly.min.js and linked with a versioned, immutable URL.
 """
 
+from __future__ import annotations
+
 import os
+import json
+import mimetypes
+import sqlite3
+import functools
+import gzip
+import hashlib
+import importlib.metadata
+import pickle
 import argparse
+import csv
 import threading
 import time
-from flask import Flask, request, send_from_directory, redirect
+import zlib
+from collections import OrderedDict
+from urllib import request as urlrequest
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from flask import Flask, Response, abort, request, send_from_directory, redirect, render_template, stream_template
+from markupsafe import Markup, escape
+from werkzeug.utils import secure_filename
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
 
-from ichimoku_backtest import run_backtest_from_database
-from config import DATABASE_PATH
-import plotting
+from config import DATABASE_PATH, STOCKS_DB_PATH, COMMODITIES_DB_PATH
+from database import load_from_database
 from ob_refined_strategy import (
-    load_price_csv,
     compute_indicators,
     detect_order_blocks,
-    refined_backtest,
-    summarize_trades,
-    year_by_year,
+    ob_backtest,
+    ob_backtest_batch,
+    outcome_r_breakdown,
+    outcome_r_stats,
+    warm_up_kernels,
 )
 
-APP = Flask(__name__, static_folder=".", static_url_path="/static")
+# Plotly is only imported in the chart-building paths; annotations still name its Figure
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+try:
+    from flask_compress import Compress
+except Exception:
+    Compress = None
+
+try:
+    import brotli
+except Exception:
+    brotli = None
+
+try:
+    import kaleido
+except Exception:
+    kaleido = None
+
+APP = Flask(__name__, static_folder="static", static_url_path="/static")
+# Static assets (CSS/JS) rarely change; let browsers cache them for a day
+APP.config["SEND_FILE_MAX_AGE_DEFAULT"] = 86400
+# Let the front-end server send files itself (zero-copy sendfile) when it supports X-Sendfile
+APP.config["USE_X_SENDFILE"] = os.environ.get("OB_USE_X_SENDFILE") == "1"
+# Pages and chart files compress very well; prefer Brotli when the browser accepts it
+APP.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+APP.config["COMPRESS_MIMETYPES"] = ["text/html", "text/css", "application/javascript", "application/json"]
+APP.config["COMPRESS_LEVEL"] = 6
+APP.config["COMPRESS_MIN_SIZE"] = 512
+# The dashboard and pair pages are streamed; a long trade log is mostly repeated <tr> markup
+APP.config["COMPRESS_STREAMS"] = True
+if Compress is not None:
+    Compress(APP)
+else:
+    def _gzip_stream(chunks):
+        """Gzip a streamed body chunk by chunk, flushing so each piece still goes out immediately."""
+        z = zlib.compressobj(APP.config["COMPRESS_LEVEL"], zlib.DEFLATED, 31)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = z.compress(chunk) + z.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield z.flush()
+
+    @APP.after_request
+    def _gzip_response(response):
+        """Gzip text responses with the stdlib when Flask-Compress is missing."""
+        if (
+            response.direct_passthrough
+            or response.status_code != 200
+            or "Content-Encoding" in response.headers
+            or "gzip" not in request.headers.get("Accept-Encoding", "")
+            or response.mimetype not in APP.config["COMPRESS_MIMETYPES"]
+        ):
+            return response
+        if response.is_streamed:
+            if not APP.config["COMPRESS_STREAMS"]:
+                return response
+            # Streamed pages (stream_template) are compressed on the fly
+            response.response = _gzip_stream(response.response)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < APP.config["COMPRESS_MIN_SIZE"]:
+                return response
+            response.set_data(gzip.compress(data, compresslevel=APP.config["COMPRESS_LEVEL"]))
+        response.headers["Content-Encoding"] = "gzip"
+        response.vary.add("Accept-Encoding")
+        return response
 OB_CACHE_FILE = "ob_backtest_summary.csv"
+SUMMARY_COLUMNS = ["pair", "trades", "wins", "losses", "total_pnl", "win_rate", "avg_r"]
+# Counts fit in int32 and the R/percentage figures need no more than float32
+SUMMARY_DTYPES = {
+    "trades": np.int32,
+    "wins": np.int32,
+    "losses": np.int32,
+    "total_pnl": np.float32,
+    "win_rate": np.float32,
+    "avg_r": np.float32,
+}
+# While a build runs, finished rows are appended here and flushed every few pairs
+SUMMARY_FLUSH_EVERY = 10
+# Threads loading uncached pairs (SQLite + indicators) ahead of the batch backtest
+BUILD_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+PRERENDERED_FILE = "ob_prerendered.pkl"
+# Trade log rows inlined in the pair page; the rest are fetched from /pair/<pair>/trades
+TRADE_PAGE_SIZE = 100
+# Per-pair backtest results (see run_ob_backtest_for_pair)
+BACKTEST_CACHE_DIR = "cache"
+# Only backtests that took this long, or produced this many trades, are worth caching
+BACKTEST_CACHE_MIN_SECONDS = 0.5
+BACKTEST_CACHE_MIN_TRADES = 100
+# Pairs whose last backtest fell under both thresholds; their cache file is not even looked up
+CHEAP_PAIRS_FILE = os.path.join(BACKTEST_CACHE_DIR, "cheap_pairs.json")
+# Strategy parameters used by the UI backtests; part of the per-pair cache key
+BACKTEST_PARAMS = {
+    "ema_span": 50,
+    "atr_span": 14,
+    "lookback": 10,
+    "entry_wait_bars": 60,
+    "atr_threshold": 0.0060,
+    "stop_on_tie": True,
+}
+# Pair pages carry an ETag, so within this window they are reused and afterwards revalidated
+PAIR_CACHE_CONTROL = "private, max-age=60"
 CHART_EXT = ".html"
+# Charts change on every build: cache briefly, but let repeat visits reuse them while revalidating
+CHART_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+# Static PNG thumbnails for the chart cards (width, height); written by --build
+CHART_THUMB_SIZE = (400, 300)
+# Plotly config for chart pages: fit the iframe, no mode bar over the thumbnails
+CHART_PLOTLY_CONFIG = {"responsive": True, "displayModeBar": False}
+# Internal nginx location that serves chart files (see serve_chart); empty = serve from Flask
+CHART_ACCEL_PREFIX = os.environ.get("OB_CHART_ACCEL_PREFIX", "")
+# Serve plotly.js from ./static instead of the CDN (see _plotly_js_url)
+PLOTLY_JS_LOCAL = os.environ.get("OB_PLOTLY_JS") == "local"
+PLOTLY_JS_FILE = "plotly.min.js"
 
 
 def _list_sqlite_tables(sqlite_uri):
     """Return a list of table names for a sqlite:/// URI or file path."""
     try:
-        import sqlite3
         path = sqlite_uri.replace('sqlite:///', '') if sqlite_uri.startswith('sqlite:///') else sqlite_uri
         if not os.path.exists(path):
             return []
@@ -77,7 +248,6 @@ def health():
         else:
             cache_info = {'path': OB_CACHE_FILE, 'exists': False}
 
-        from config import DATABASE_PATH, STOCKS_DB_PATH, COMMODITIES_DB_PATH
         dbs = {
             'forex': _list_sqlite_tables(DATABASE_PATH),
             'stocks': _list_sqlite_tables(STOCKS_DB_PATH),
@@ -107,8 +277,6 @@ def admin_pairs():
       call the Ichimoku UI `/rebuild_async` endpoint to keep both caches in sync.
     """
     try:
-        import json
-        from urllib import request as urlrequest
         pairs_path = os.path.join(os.getcwd(), 'pairs.json')
 
         if request.method == 'POST':
@@ -127,15 +295,8 @@ def admin_pairs():
             with open(pairs_path, 'w') as fh:
                 json.dump(parsed, fh, indent=2)
 
-            # Start OB build in background thread
-            def _start_build():
-                try:
-                    build_summary(OB_CACHE_FILE)
-                except Exception:
-                    pass
-
-            t = threading.Thread(target=_start_build, daemon=True)
-            t.start()
+            # Queue OB build on the background worker
+            build_summary_async(OB_CACHE_FILE)
 
             # Trigger ichimoku UI rebuild (best-effort)
             try:
@@ -161,28 +322,16 @@ def admin_pairs():
             }
             content = json.dumps(default, indent=2)
 
-        html = get_base_css()
-        html += """
-        <div class="container">
-            <header>
-                <h1>🔧 Admin — Edit pairs.json</h1>
-            </header>
-            <form method="post">
-                <p>Edit the JSON below to add/remove pairs. Keys required: <code>FOREX_PAIRS</code>, <code>STOCK_PAIRS</code>, <code>COMMODITY_PAIRS</code>.</p>
-                <textarea name="pairs_json" style="width:100%;height:360px;font-family:monospace;">""" + content + """</textarea>
-                <div style="margin-top:12px"><button class="btn" type="submit">💾 Save & Rebuild</button> <a class="btn secondary" href="/">Back</a></div>
-            </form>
-            <p style="margin-top:16px;font-size:0.9em;color:#666">Note: this UI is unauthenticated and intended for local usage only.</p>
-        </div>
-        """
-        return html
+        return _render_page(_ADMIN_TMPL, content=content)
 
     except Exception as e:
         return f"Admin error: {e}", 500
 
-# Background build state
+# Background build state. Rebuilds run on a single-worker queue so request
+# handlers never block on them; the dashboard keeps serving the last CSV.
 _build_lock = threading.Lock()
-_build_thread = None
+_build_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ob-build")
+_build_future = None
 _build_state = {
     "running": False,
     "last_started": None,
@@ -203,7 +352,6 @@ DEFAULT_COMMODITY_PAIRS = [
 
 def _load_pairs_from_json(path='pairs.json'):
     try:
-        import json
         with open(path, 'r') as f:
             data = json.load(f)
         forex = data.get('FOREX_PAIRS', DEFAULT_FOREX_PAIRS)
@@ -216,623 +364,417 @@ def _load_pairs_from_json(path='pairs.json'):
 
 FOREX_PAIRS, STOCK_PAIRS, COMMODITY_PAIRS = _load_pairs_from_json()
 ALL_PAIRS = FOREX_PAIRS + STOCK_PAIRS + COMMODITY_PAIRS
+# Database of each dashboard category, and of every configured pair
+CATEGORY_DB = {"forex": DATABASE_PATH, "stocks": STOCKS_DB_PATH, "commodities": COMMODITIES_DB_PATH}
+PAIR_DB = {p: DATABASE_PATH for p in FOREX_PAIRS}
+PAIR_DB.update({p: STOCKS_DB_PATH for p in STOCK_PAIRS})
+PAIR_DB.update({p: COMMODITIES_DB_PATH for p in COMMODITY_PAIRS})
 
 
-def get_base_css():
-    """Return base CSS styling for OB UI."""
-    return """
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: #333;
-            line-height: 1.6;
-            min-height: 100vh;
-            padding: 20px;
-            transition: background 0.25s ease, color 0.25s ease;
-        }
-        
-        body.dark-mode {
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            color: #e0e0e0;
-        }
-        
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 12px;
-            box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
-            padding: 40px;
-            transition: background 0.25s ease, color 0.25s ease;
-        }
-        
-        .dark-mode .container {
-            background: #1a1a2e;
-            color: #e0e0e0;
-            box-shadow: 0 10px 40px rgba(0, 0, 0, 0.3);
-        }
-        
-        header {
-            margin-bottom: 40px;
-            border-bottom: 3px solid #667eea;
-            padding-bottom: 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        .dark-mode header {
-            border-bottom-color: #764ba2;
-        }
-        
-        h1, h2 {
-            color: #667eea;
-            margin: 20px 0;
-            font-size: 2.2em;
-        }
-        
-        .dark-mode h1, .dark-mode h2 {
-            color: #bb86fc;
-        }
-        
-        h3 {
-            color: #555;
-            margin: 15px 0;
-            font-size: 1.4em;
-        }
-        
-        .dark-mode h3 {
-            color: #bb86fc;
-        }
-        
-        .theme-toggle {
-            background: #667eea;
-            color: white;
-            border: none;
-            padding: 10px 20px;
-            border-radius: 6px;
-            cursor: pointer;
-            font-size: 14px;
-            transition: background 0.25s ease;
-        }
-        
-        .dark-mode .theme-toggle {
-            background: #764ba2;
-        }
-        
-        .theme-toggle:hover {
-            background: #764ba2;
-        }
-        
-        .dark-mode .theme-toggle:hover {
-            background: #bb86fc;
-        }
-        
-        /* Back to dashboard button */
-        .back-btn {
-            background: transparent;
-            color: #667eea;
-            border: 2px solid transparent;
-            padding: 8px 12px;
-            border-radius: 6px;
-            text-decoration: none;
-            font-weight: 600;
-            margin-right: 12px;
-        }
+# Static files are linked with a hash of their contents (see _static_url), so a
+# versioned URL never changes meaning and browsers need not revalidate it
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-        .back-btn:hover {
-            background: rgba(102,126,234,0.06);
-            border-color: rgba(102,126,234,0.12);
-        }
-        
-        .summary-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-            gap: 20px;
-            margin: 30px 0;
-        }
-        
-        .stat-card {
-            background: #f5f5f5;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            padding: 20px;
-            text-align: center;
-            transition: transform 0.2s ease, box-shadow 0.2s ease;
-        }
-        
-        .dark-mode .stat-card {
-            background: #2d2d44;
-            border-color: #444;
-        }
-        
-        .stat-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 8px 20px rgba(102, 126, 234, 0.2);
-        }
-        
-        .stat-card h3 {
-            color: #667eea;
-            font-size: 1em;
-            margin-bottom: 10px;
-        }
-        
-        .dark-mode .stat-card h3 {
-            color: #bb86fc;
-        }
-        
-        .stat-value {
-            font-size: 2em;
-            font-weight: bold;
-            color: #333;
-            margin: 10px 0;
-        }
-        
-        .dark-mode .stat-value {
-            color: #e0e0e0;
-        }
-        
-        .stat-label {
-            font-size: 0.85em;
-            color: #666;
-        }
-        
-        .dark-mode .stat-label {
-            color: #999;
-        }
-        
-        .equity-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 20px;
-            margin: 30px 0;
-        }
-        
-        .equity-card {
-            background: white;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-            transition: transform 0.2s ease, box-shadow 0.2s ease;
-        }
-        
-        .dark-mode .equity-card {
-            background: #2d2d44;
-            border-color: #444;
-        }
-        
-        .equity-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 8px 24px rgba(102, 126, 234, 0.2);
-        }
-        
-        .equity-card h4 {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px;
-            margin: 0;
-            font-size: 1.1em;
-        }
-        
-        .equity-card iframe {
-            width: 100%;
-            height: 300px;
-            border: none;
-        }
 
-        .chart-meta {
-            font-size: 12px;
-            color: #666;
-            padding: 8px 12px 16px 12px;
-        }
+@functools.lru_cache(maxsize=None)
+def _static_url(filename: str) -> str:
+    """URL of a file under ./static, versioned with a hash of its contents."""
+    try:
+        with open(os.path.join(APP.static_folder, filename), "rb") as f:
+            version = hashlib.sha1(f.read()).hexdigest()[:10]
+    except OSError:
+        return f"/static/{filename}"
+    return f"/static/{filename}?v={version}"
 
-        .dark-mode .chart-meta { color: #bbb; }
-        
-        .clickable {
-            cursor: pointer;
-        }
-        
-        .clickable:active {
-            opacity: 0.9;
-        }
-        
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-            background: white;
-        }
-        
-        .dark-mode table {
-            background: #2d2d44;
-        }
-        
-        thead {
-            background: #667eea;
-            color: white;
-        }
-        
-        .dark-mode thead {
-            background: #764ba2;
-        }
-        
-        td, th {
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }
-        
-        .dark-mode td, .dark-mode th {
-            border-bottom-color: #444;
-        }
-        
-        tbody tr:hover {
-            background: #f0f0f0;
-        }
-        
-        .dark-mode tbody tr:hover {
-            background: #363654;
-        }
-        
-        a {
-            color: #667eea;
-            text-decoration: none;
-            transition: color 0.2s ease;
-        }
-        
-        .dark-mode a {
-            color: #bb86fc;
-        }
-        
-        a:hover {
-            color: #764ba2;
-            text-decoration: underline;
-        }
-        
-        .back-link {
-            display: inline-block;
-            margin: 20px 0;
-            font-weight: bold;
-        }
-        
-        footer {
-            text-align: center;
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 2px solid #ddd;
-            color: #666;
-            font-size: 0.9em;
-        }
-        
-        .dark-mode footer {
-            border-top-color: #444;
-            color: #999;
-        }
-        
-        /* Modal styles */
-        .modal {
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(0, 0, 0, 0.5);
-        }
-        
-        .modal-content {
-            background: white;
-            margin: auto;
-            padding: 0;
-            border-radius: 8px;
-            width: 90%;
-            max-width: 1200px;
-            height: 90vh;
-            display: flex;
-            flex-direction: column;
-            position: relative;
-            top: 50%;
-            transform: translateY(-50%);
-        }
-        
-        .dark-mode .modal-content {
-            background: #1a1a2e;
-        }
-        
-        .modal-header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            border-radius: 8px 8px 0 0;
-        }
-        
-        .close-btn {
-            font-size: 28px;
-            font-weight: bold;
-            cursor: pointer;
-            transition: color 0.2s ease;
-        }
-        
-        .close-btn:hover {
-            color: #ddd;
-        }
-        
-        .modal-body {
-            flex: 1;
-            overflow: auto;
-            padding: 20px;
-        }
-        
-        .modal-body iframe {
-            width: 100%;
-            height: 100%;
-            border: none;
-        }
-        
-        .pairs-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(150px, 1fr));
-            gap: 15px;
-            margin: 20px 0;
-        }
-        
-        .pair-link {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px;
-            border-radius: 8px;
-            text-align: center;
-            font-weight: bold;
-            transition: transform 0.2s ease, box-shadow 0.2s ease;
-            display: block;
-            text-decoration: none;
-        }
-        
-        .pair-link:hover {
-            transform: translateY(-3px);
-            box-shadow: 0 6px 16px rgba(102, 126, 234, 0.3);
-            color: white;
-        }
-        
-        .analysis-section {
-            background: #f9f9f9;
-            border: 1px solid #ddd;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 20px 0;
-            color: #111;
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.5;
-            font-size: 15px;
-        }
 
-        .dark-mode .analysis-section {
-            background: #1a1a2e;
-            border-color: #2b2b3a;
-            color: #ffffff;
-        }
+@APP.after_request
+def _cache_versioned_static(response):
+    """Let browsers keep versioned static files (see `_static_url`) without revalidating."""
+    if request.endpoint == "static" and "v" in request.args and response.status_code in (200, 304):
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+    return response
 
-        .analysis-section ul { margin-left: 18px; }
-        .analysis-section li { margin: 8px 0; }
-        .analysis-section strong { color: #ffffff; }
-        .analysis-block { background: #f0f0f0; padding: 15px; border-radius: 8px; margin: 15px 0; color: #111; }
-        .dark-mode .analysis-block { background: #1a1a2e; color: #ffffff; }
-        
-        .error {
-            background: #ffebee;
-            color: #c62828;
-            padding: 15px;
-            border-radius: 6px;
-            margin: 15px 0;
-        }
-        
-        .dark-mode .error {
-            background: #3d1f1f;
-            color: #ff6b6b;
-        }
-        
-        .success {
-            background: #e8f5e9;
-            color: #2e7d32;
-            padding: 15px;
-            border-radius: 6px;
-            margin: 15px 0;
-        }
-        
-        .dark-mode .success {
-            background: #1f3d1f;
-            color: #66bb6a;
-        }
-        
-        hr {
-            margin: 30px 0;
-            border: none;
-            border-top: 2px solid #ddd;
-        }
-        
-        .dark-mode hr {
-            border-top-color: #444;
-        }
-        
-        /* Collapsible Trade Log Styles */
-        .collapsible-header {
-            background: #667eea;
-            color: white;
-            padding: 15px 20px;
-            cursor: pointer;
-            border: none;
-            width: 100%;
-            text-align: left;
-            font-size: 1.1em;
-            font-weight: bold;
-            border-radius: 6px 6px 0 0;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            transition: background 0.2s ease;
-        }
-        
-        .dark-mode .collapsible-header {
-            background: #764ba2;
-        }
-        
-        .collapsible-header:hover {
-            background: #764ba2;
-        }
-        
-        .dark-mode .collapsible-header:hover {
-            background: #bb86fc;
-        }
-        
-        .collapsible-content {
-            max-height: 500px;
-            overflow-y: auto;
-            transition: max-height 0.3s ease, opacity 0.3s ease;
-            opacity: 1;
-        }
-        
-        .collapsible-content.collapsed {
-            max-height: 0;
-            opacity: 0;
-            overflow: hidden;
-        }
-        
-        .toggle-icon {
-            display: inline-block;
-            transition: transform 0.3s ease;
-        }
-        
-        .toggle-icon.collapsed {
-            transform: rotate(-90deg);
-        }
-    </style>
-    """
+
+def get_base_css():
+    """Return the <link> tag for the base OB UI stylesheet (static/ob_ui.css)."""
+    return f'<link rel="stylesheet" href="{_static_url("ob_ui.css")}">'
 
 
 def get_theme_script():
-    """Return JavaScript for dark mode toggle with localStorage persistence."""
-    return """
-    <script>
-        // Load theme from localStorage
-        const savedTheme = localStorage.getItem('ob-ui-theme');
-        if (savedTheme === 'dark') {
-            document.body.classList.add('dark-mode');
-            const btn = document.getElementById('themeToggle');
-            if (btn) btn.textContent = '☀️ Light Mode';
-        }
-        
-        // Toggle function
-        function toggleTheme() {
-            document.body.classList.toggle('dark-mode');
-            const isDark = document.body.classList.contains('dark-mode');
-            localStorage.setItem('ob-ui-theme', isDark ? 'dark' : 'light');
-            const btn = document.getElementById('themeToggle');
-            if (btn) btn.textContent = isDark ? '☀️ Light Mode' : '🌙 Dark Mode';
-        }
-    </script>
+    """Return the <script> tag for the dark mode toggle (static/theme.js, localStorage persisted)."""
+    return f'<script src="{_static_url("theme.js")}"></script>'
+
+
+# The stylesheet and theme script tags never change at runtime: mark them safe
+# once at import and expose them to every template as globals, instead of
+# passing (and re-wrapping) them on each render.
+APP.jinja_env.globals.update(
+    base_css=Markup(get_base_css()),
+    theme_script=Markup(get_theme_script()),
+    static_url=_static_url,
+    trade_page_size=TRADE_PAGE_SIZE,
+    plotly_js_local=PLOTLY_JS_LOCAL,
+)
+
+
+# Page templates are compiled once at import; handing the Template objects
+# straight to render_template skips the loader lookup on every request.
+_INDEX_TMPL = APP.jinja_env.get_template("index.html")
+_PAIR_TMPL = APP.jinja_env.get_template("pair.html")
+_ADMIN_TMPL = APP.jinja_env.get_template("admin_pairs.html")
+_CHART_TMPL = APP.jinja_env.get_template("chart.html")
+_ANALYSIS_TMPL = APP.jinja_env.get_template("analysis.html")
+_TRADE_ROWS_TMPL = APP.jinja_env.get_template("trade_rows.html")
+
+
+def _render_page(template, **context) -> str:
+    """Render a page template (base CSS and theme script come from the Jinja globals)."""
+    return render_template(template, **context)
+
+
+def _stream_page(template, **context):
+    """Like `_render_page`, but stream the page as the template is evaluated."""
+    return stream_template(template, **context)
+
+
+def _strategy_fingerprint() -> str:
+    """Hash the strategy module source so cached results expire when the strategy code changes."""
+    try:
+        with open(detect_order_blocks.__code__.co_filename, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()[:12]
+    except OSError:
+        return ""
+
+
+_STRATEGY_FINGERPRINT = _strategy_fingerprint()
+
+
+# Templates and static files a pair page's markup is built from (chart.html
+# reaches it through the inlined srcdoc charts)
+PAIR_PAGE_TEMPLATES = ("base.html", "pair.html", "trade_rows.html", "analysis.html", "chart.html")
+PAIR_PAGE_STATIC = ("ob_ui.css", "ob_ui.js", "theme.js")
+
+
+def _page_fingerprint() -> str:
+    """Hash what a pair page depends on besides its data, so its ETag changes with a deploy.
+
+    Covers the page templates, the versioned static URLs it links, whether
+    plotly.js comes from the CDN or ./static (and which plotly release), and
+    whether Kaleido thumbnails are exported.
     """
+    h = hashlib.sha1()
+    for name in PAIR_PAGE_TEMPLATES:
+        source, _, _ = APP.jinja_env.loader.get_source(APP.jinja_env, name)
+        h.update(source.encode("utf-8"))
+    for name in PAIR_PAGE_STATIC:
+        h.update(_static_url(name).encode("utf-8"))
+    try:
+        plotly_version = importlib.metadata.version("plotly")
+    except importlib.metadata.PackageNotFoundError:
+        plotly_version = None
+    h.update(f"{PLOTLY_JS_LOCAL}:{plotly_version}:{kaleido is not None}".encode("utf-8"))
+    return h.hexdigest()[:12]
+
+
+_PAGE_FINGERPRINT = _page_fingerprint()
+
+
+def _db_file(db_path: str | None) -> str | None:
+    """Return the local file behind a sqlite:/// URI (or the path itself); None for an unknown pair."""
+    if db_path and db_path.startswith("sqlite:///"):
+        return db_path[len("sqlite:///"):]
+    return db_path
+
+
+def _backtest_cache_entry(pair_name: str, db_path: str):
+    """Return (cache file path, cache key) for a pair, or (None, None) if the DB is not a local file."""
+    db_file = _db_file(db_path)
+    try:
+        db_mtime = os.path.getmtime(db_file)
+    except (OSError, TypeError):
+        return None, None
+    params_hash = hashlib.sha1(repr(sorted(BACKTEST_PARAMS.items())).encode()).hexdigest()[:12]
+    path = os.path.join(BACKTEST_CACHE_DIR, f"ob_{pair_name}_{params_hash}.pkl")
+    return path, (pair_name, db_mtime, params_hash, _STRATEGY_FINGERPRINT)
+
+
+def _read_backtest_cache(path: str, key: tuple):
+    """Return the cached backtest result stored under `key`, or None."""
+    try:
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+    except Exception:
+        return None
+    return entry["result"] if entry.get("key") == key else None
+
+
+def _write_backtest_cache(path: str, key: tuple, result: dict) -> None:
+    """Store a backtest result; written to a temp file first so readers never see a partial file."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"key": key, "result": result}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"Could not write backtest cache {path}: {e}")
+
+
+_cheap_pairs = None
 
 
-def run_ob_backtest_for_pair(pair_name: str, db_path: str = None) -> dict:
+def _load_cheap_pairs() -> set:
+    """Return the set of pairs recorded in CHEAP_PAIRS_FILE (read once per process)."""
+    global _cheap_pairs
+    if _cheap_pairs is None:
+        try:
+            with open(CHEAP_PAIRS_FILE, "r", encoding="utf-8") as f:
+                _cheap_pairs = set(json.load(f))
+        except Exception:
+            _cheap_pairs = set()
+    return _cheap_pairs
+
+
+def _mark_cheap_pair(pair_name: str, cheap: bool) -> None:
+    """Add or remove a pair from the cheap-pairs list, rewriting the file only when it changes."""
+    cheap_pairs = _load_cheap_pairs()
+    if (pair_name in cheap_pairs) == cheap:
+        return
+    if cheap:
+        cheap_pairs.add(pair_name)
+    else:
+        cheap_pairs.discard(pair_name)
+    try:
+        os.makedirs(BACKTEST_CACHE_DIR, exist_ok=True)
+        tmp = f"{CHEAP_PAIRS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(sorted(cheap_pairs), f)
+        os.replace(tmp, CHEAP_PAIRS_FILE)
+    except Exception as e:
+        print(f"Could not write {CHEAP_PAIRS_FILE}: {e}")
+
+
+def _resolve_pair_db(pair_name: str) -> str | None:
+    """Return the database URI for a pair; pairs outside pairs.json are classified by ticker."""
+    db_path = PAIR_DB.get(pair_name)
+    if db_path is None and ("_daily" in pair_name or "_1h" in pair_name):
+        db_path = CATEGORY_DB[_pair_category(pair_name)]
+    return db_path
+
+
+# Recent backtests kept in memory, keyed on (pair, db_path, db mtime): the result and the
+# indicator frame behind it, which the chart writer reuses instead of reloading the pair.
+# Each entry's "lock" lets concurrent requests for the same data share one computation.
+_PAIR_MEMO = OrderedDict()
+_PAIR_MEMO_SIZE = 32
+_pair_memo_lock = threading.Lock()
+
+
+def _pair_memo(pair_name: str, db_path: str) -> dict:
+    """Return the in-memory entry for a pair's current data (an unshared one if the DB has no mtime)."""
+    try:
+        key = (pair_name, db_path, os.path.getmtime(_db_file(db_path)))
+    except (OSError, TypeError):
+        return {"lock": threading.Lock()}
+    with _pair_memo_lock:
+        entry = _PAIR_MEMO.get(key)
+        if entry is None:
+            entry = _PAIR_MEMO[key] = {"lock": threading.Lock()}
+            while len(_PAIR_MEMO) > _PAIR_MEMO_SIZE:
+                _PAIR_MEMO.popitem(last=False)
+        else:
+            _PAIR_MEMO.move_to_end(key)
+        return entry
+
+
+def run_ob_backtest_for_pair(pair_name: str, db_path: str = None, return_frames: bool = False) -> dict:
     """
     Run OB backtest for a single pair.
+
+    Results are cached on disk under BACKTEST_CACHE_DIR, keyed on the pair,
+    the database file's mtime, BACKTEST_PARAMS and the strategy module's
+    source, so a pair is only recomputed after its data, the strategy
+    parameters or the strategy code change.
+
+    Only expensive results are cached (see BACKTEST_CACHE_MIN_SECONDS and
+    BACKTEST_CACHE_MIN_TRADES); cheap pairs are listed in CHEAP_PAIRS_FILE
+    and simply recomputed, which keeps the cache small. On top of that the
+    last _PAIR_MEMO_SIZE results are kept in memory (see `_pair_memo`).
+
+    With `return_frames`, the result also carries the indicator frame ("df")
+    and the detected order blocks ("ob") it was computed from, for drawing
+    charts without loading the pair again.
     
     Returns:
-        dict with keys: stats, trades_df, summary, errors
+        dict with keys: stats, trades, summary (or error); plus df, ob with return_frames
     """
-    try:
-        # Determine correct database path
-        if db_path is None:
-            if "_daily" in pair_name or "_1h" in pair_name:
-                # Check if it's a stock or commodity
-                if any(stock in pair_name for stock in ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA"]):
-                    db_path = "sqlite:///stocks.db"
-                elif any(comm in pair_name for comm in ["GC_F", "CL_F", "NG_F", "HG_F", "SI_F"]):
-                    db_path = "sqlite:///commodities.db"
+    if db_path is None:
+        db_path = _resolve_pair_db(pair_name)
+
+    memo = _pair_memo(pair_name, db_path)
+    if "result" not in memo or (return_frames and "ob" not in memo):
+        # Whoever gets the lock first computes; the others then find the result in the memo
+        with memo["lock"]:
+            if "result" not in memo:
+                cache_path, cache_key, cached = _cached_ob_backtest(pair_name, db_path)
+                if cached is not None:
+                    memo["result"] = cached
                 else:
-                    db_path = "sqlite:///forex.db"
-        
-        # Load data from database
-        from database import load_from_database
-        df = load_from_database(pair_name, db_path)
+                    t0 = time.perf_counter()
+                    result = _compute_ob_backtest(pair_name, db_path, memo)
+                    _store_ob_backtest(pair_name, cache_path, cache_key, result, time.perf_counter() - t0)
+                    if "error" in result:
+                        return result
+                    memo["result"] = result
+            if return_frames and "ob" not in memo:
+                # A result read from the disk cache has no frame yet; load it once for this data
+                df = _indicator_frame(pair_name, db_path, memo)
+                memo["ob"] = detect_order_blocks(df, lookback=BACKTEST_PARAMS["lookback"])
+
+    result = memo["result"]
+    if return_frames:
+        result = dict(result, df=memo["df"], ob=memo["ob"])
+    return result
+
+
+def _cached_ob_backtest(pair_name: str, db_path: str) -> tuple:
+    """Return (cache file path, cache key, cached result or None) for a pair."""
+    cache_path, cache_key = _backtest_cache_entry(pair_name, db_path) if db_path else (None, None)
+    cached = None
+    if cache_path and pair_name not in _load_cheap_pairs():
+        cached = _read_backtest_cache(cache_path, cache_key)
+    return cache_path, cache_key, cached
+
+
+def _store_ob_backtest(pair_name: str, cache_path: str, cache_key: tuple, result: dict, elapsed: float) -> None:
+    """Cache a freshly computed result if it was expensive, and record whether the pair is cheap."""
+    if cache_path and "error" not in result:
+        # A cheap pair is recomputed next time; it is re-checked on every run, so it
+        # starts being cached as soon as it crosses either threshold
+        expensive = (
+            elapsed >= BACKTEST_CACHE_MIN_SECONDS
+            or len(result.get("trades", ())) > BACKTEST_CACHE_MIN_TRADES
+        )
+        _mark_cheap_pair(pair_name, not expensive)
+        if expensive:
+            _write_backtest_cache(cache_path, cache_key, result)
+
+
+def _load_ohlc(pair_name: str, db_path: str) -> pd.DataFrame:
+    """Load a pair's OHLC columns as float64; the frame is empty if the pair has no data."""
+    df = load_from_database(pair_name, db_path)
+    if df.empty:
+        return df
+    # Standardize columns; selecting the OHLC block already yields a new frame,
+    # and compute_indicators makes its own copy, so no explicit copy is needed
+    df = df.rename(columns=lambda c: c.lower().strip())[["open", "high", "low", "close"]].dropna()
+    return df.astype(np.float64, copy=False)
+
+
+def _indicator_frame(pair_name: str, db_path: str, memo: dict = None) -> pd.DataFrame:
+    """Load a pair and add the strategy indicators, reusing the frame kept in `memo`."""
+    if memo and "df" in memo:
+        return memo["df"]
+    df = _load_ohlc(pair_name, db_path)
+    if not df.empty:
+        df = compute_indicators(df, ema_span=BACKTEST_PARAMS["ema_span"], atr_span=BACKTEST_PARAMS["atr_span"])
+    if memo is not None:
+        memo["df"] = df
+    return df
+
+
+def _compute_ob_backtest(pair_name: str, db_path: str, memo: dict = None) -> dict:
+    """Load a pair from `db_path` (or `memo`) and run the OB backtest (uncached)."""
+    try:
+        # Load data from database and add indicators
+        df = _indicator_frame(pair_name, db_path, memo)
         
         if df.empty:
             return {"error": f"No data found for {pair_name}"}
         
-        # Standardize columns
-        df.columns = [c.lower().strip() for c in df.columns]
-        df = df[["open", "high", "low", "close"]].copy()
-        df.columns = ["open", "high", "low", "close"]
-        df = df.dropna()
-        
-        # Add indicators
-        df = compute_indicators(df, ema_span=50, atr_span=14)
-        
-        # Detect order blocks
-        ob = detect_order_blocks(df, lookback=10)
-        
-        if ob.empty:
-            return {
-                "stats": {
-                    "trades": 0,
-                    "wins": 0,
-                    "losses": 0,
-                    "total_pnl": 0,
-                    "win_rate": 0,
-                    "avg_r": 0,
-                },
-                "trades": pd.DataFrame(),
-                "summary": "No OB signals detected.",
-            }
-        
-        # Run backtest
-        trades = refined_backtest(df, ob, entry_wait_bars=60, atr_threshold=0.0060, stop_on_tie=True)
-        
-        if trades.empty:
-            return {
-                "stats": {
-                    "trades": 0,
-                    "wins": 0,
-                    "losses": 0,
-                    "total_pnl": 0,
-                    "win_rate": 0,
-                    "avg_r": 0,
-                },
-                "trades": pd.DataFrame(),
-                "summary": "No trades generated from OB signals.",
-            }
-        
-        # Calculate stats
-        stats = {
-            "trades": len(trades),
-            "wins": len(trades[trades["outcome_R"] > 0]),
-            "losses": len(trades[trades["outcome_R"] <= 0]),
-            "total_pnl": trades["outcome_R"].sum(),
-            "win_rate": (len(trades[trades["outcome_R"] > 0]) / len(trades) * 100) if len(trades) > 0 else 0,
-            "avg_r": trades["outcome_R"].mean() if len(trades) > 0 else 0,
+        # Detect order blocks and run the backtest in one compiled pass
+        ob_count, trades = ob_backtest(
+            df,
+            lookback=BACKTEST_PARAMS["lookback"],
+            entry_wait_bars=BACKTEST_PARAMS["entry_wait_bars"],
+            atr_threshold=BACKTEST_PARAMS["atr_threshold"],
+            stop_on_tie=BACKTEST_PARAMS["stop_on_tie"],
+        )
+        return _ob_backtest_result(ob_count, trades)
+    
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _ob_backtest_result(ob_count: int, trades: pd.DataFrame) -> dict:
+    """Build a pair's backtest result (stats, trades, summary) from the scan output."""
+    if ob_count == 0:
+        return {
+            "stats": {
+                "trades": 0,
+                "wins": 0,
+                "losses": 0,
+                "total_pnl": 0,
+                "win_rate": 0,
+                "avg_r": 0,
+            },
+            "trades": pd.DataFrame(),
+            "summary": "No OB signals detected.",
         }
-        
+    
+    if trades.empty:
         return {
-            "stats": stats,
-            "trades": trades,
-            "summary": f"{stats['trades']} trades, {stats['wins']} wins, {stats['losses']} losses, "
-                      f"{stats['win_rate']:.1f}% WR, {stats['avg_r']:.2f}R avg",
+            "stats": {
+                "trades": 0,
+                "wins": 0,
+                "losses": 0,
+                "total_pnl": 0,
+                "win_rate": 0,
+                "avg_r": 0,
+            },
+            "trades": pd.DataFrame(),
+            "summary": "No trades generated from OB signals.",
         }
     
-    except Exception as e:
-        return {"error": str(e)}
+    # Calculate stats
+    count = len(trades)
+    wins, losses, total_pnl = outcome_r_stats(np.ascontiguousarray(trades["outcome_R"].to_numpy(dtype=np.float64)))
+    stats = {
+        "trades": count,
+        "wins": int(wins),
+        "losses": int(losses),
+        "total_pnl": float(total_pnl),
+        "win_rate": wins / count * 100 if count > 0 else 0,
+        "avg_r": total_pnl / count if count > 0 else 0,
+    }
+    
+    return {
+        "stats": stats,
+        "trades": trades,
+        "summary": f"{stats['trades']} trades, {stats['wins']} wins, {stats['losses']} losses, "
+                  f"{stats['win_rate']:.1f}% WR, {stats['avg_r']:.2f}R avg",
+    }
+
+
+# Candlestick traces are SVG-only in Plotly; above this many bars the chart is
+# bucketed (see plotting.downsample_ohlc)
+MAX_CHART_BARS = 2000
+
+
+def _build_figure(traces: list, layout: dict) -> go.Figure:
+    """
+    Build a figure from plain trace and layout dicts in one step.
+
+    Plotly's per-property validation (most of the cost for charts with many
+    traces) is skipped, so the dicts must already be valid. A named template
+    is looked up here, since validation is what would otherwise resolve it.
+    """
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    if isinstance(layout.get("template"), str):
+        layout = dict(layout, template=pio.templates[layout["template"]])
+    return go.Figure(data=traces, layout=layout, _validate=False)
 
 
 def plot_ob_signals(df: pd.DataFrame, ob: pd.DataFrame, pair_name: str = "") -> go.Figure:
@@ -847,27 +789,32 @@ def plot_ob_signals(df: pd.DataFrame, ob: pd.DataFrame, pair_name: str = "") ->
     Returns:
         Plotly Figure
     """
-    fig = go.Figure()
+    from plotting import downsample_ohlc
+
+    # OB markers keep their exact dates; only the price series is bucketed
+    df = downsample_ohlc(df, max_bars=MAX_CHART_BARS)
     
     # Candlesticks
-    fig.add_trace(go.Candlestick(
-        x=df.index,
-        open=df["open"],
-        high=df["high"],
-        low=df["low"],
-        close=df["close"],
-        name="Price"
-    ))
+    traces = [{
+        "type": "candlestick",
+        "x": df.index,
+        "open": df["open"].to_numpy(),
+        "high": df["high"].to_numpy(),
+        "low": df["low"].to_numpy(),
+        "close": df["close"].to_numpy(),
+        "name": "Price",
+    }]
     
     # EMA(50)
     if "ema" in df.columns:
-        fig.add_trace(go.Scatter(
-            x=df.index,
-            y=df["ema"],
-            mode="lines",
-            name="EMA(50)",
-            line=dict(color="blue", width=2, dash="dot")
-        ))
+        traces.append({
+            "type": "scattergl",
+            "x": df.index,
+            "y": df["ema"].to_numpy(),
+            "mode": "lines",
+            "name": "EMA(50)",
+            "line": {"color": "blue", "width": 2, "dash": "dot"},
+        })
     
     # Mark OBs on chart
     if not ob.empty:
@@ -875,37 +822,36 @@ def plot_ob_signals(df: pd.DataFrame, ob: pd.DataFrame, pair_name: str = "") ->
         bearish_ob = ob[ob["type"] == "Bearish"]
         
         if not bullish_ob.empty:
-            fig.add_trace(go.Scatter(
-                x=bullish_ob["bos_date"],
-                y=bullish_ob["ob_low"],
-                mode="markers",
-                name="Bullish OB",
-                marker=dict(symbol="triangle-up", size=10, color="green"),
-                hovertemplate="Bullish OB<br>%{x|%Y-%m-%d}<extra></extra>"
-            ))
+            traces.append({
+                "type": "scattergl",
+                "x": bullish_ob["bos_date"].to_numpy(),
+                "y": bullish_ob["ob_low"].to_numpy(),
+                "mode": "markers",
+                "name": "Bullish OB",
+                "marker": {"symbol": "triangle-up", "size": 10, "color": "green"},
+                "hovertemplate": "Bullish OB<br>%{x|%Y-%m-%d}<extra></extra>",
+            })
         
         if not bearish_ob.empty:
-            fig.add_trace(go.Scatter(
-                x=bearish_ob["bos_date"],
-                y=bearish_ob["ob_high"],
-                mode="markers",
-                name="Bearish OB",
-                marker=dict(symbol="triangle-down", size=10, color="red"),
-                hovertemplate="Bearish OB<br>%{x|%Y-%m-%d}<extra></extra>"
-            ))
+            traces.append({
+                "type": "scattergl",
+                "x": bearish_ob["bos_date"].to_numpy(),
+                "y": bearish_ob["ob_high"].to_numpy(),
+                "mode": "markers",
+                "name": "Bearish OB",
+                "marker": {"symbol": "triangle-down", "size": 10, "color": "red"},
+                "hovertemplate": "Bearish OB<br>%{x|%Y-%m-%d}<extra></extra>",
+            })
     
-    fig.update_layout(
-        title=f"Order Block Detection – {pair_name}",
-        xaxis_title="Date",
-        yaxis_title="Price",
-        xaxis_rangeslider_visible=False,
-        hovermode="x unified",
-        template="plotly_dark",
-        width=1000,
-        height=600,
-    )
-    
-    return fig
+    return _build_figure(traces, {
+        "title": {"text": f"Order Block Detection – {pair_name}"},
+        "xaxis": {"title": {"text": "Date"}, "rangeslider": {"visible": False}},
+        "yaxis": {"title": {"text": "Price"}},
+        "hovermode": "x unified",
+        "template": "plotly_dark",
+        "width": 1000,
+        "height": 600,
+    })
 
 
 def plot_equity_curve(trades: pd.DataFrame, pair_name: str = "") -> go.Figure:
@@ -920,45 +866,46 @@ def plot_equity_curve(trades: pd.DataFrame, pair_name: str = "") -> go.Figure:
         Plotly Figure
     """
     if trades.empty:
-        fig = go.Figure()
-        fig.add_annotation(text="No trades to plot", showarrow=False)
-        return fig
+        return _build_figure([], {"annotations": [{"text": "No trades to plot", "showarrow": False}]})
     
     # Calculate cumulative P&L
-    trades_copy = trades.copy()
-    trades_copy["cumulative_R"] = trades_copy["outcome_R"].cumsum()
-    trades_copy["trade_number"] = range(1, len(trades_copy) + 1)
-    
-    fig = go.Figure()
+    outcome_r = trades["outcome_R"].to_numpy(dtype=np.float64)
+    cumulative_r = np.cumsum(outcome_r)
+    trade_number = np.arange(1, outcome_r.size + 1)
     
     # Equity curve
-    fig.add_trace(go.Scatter(
-        x=trades_copy["trade_number"],
-        y=trades_copy["cumulative_R"],
-        mode="lines+markers",
-        name="Cumulative P&L",
-        line=dict(color="#667eea", width=3),
-        marker=dict(size=8),
-        fill="tozeroy",
-        fillcolor="rgba(102, 126, 234, 0.2)",
-        hovertemplate="Trade %{x}<br>Cumulative P&L: %{y:.2f}R<extra></extra>"
-    ))
+    traces = [{
+        "type": "scatter",
+        "x": trade_number,
+        "y": cumulative_r,
+        "mode": "lines+markers",
+        "name": "Cumulative P&L",
+        "line": {"color": "#667eea", "width": 3},
+        "marker": {"size": 8},
+        "fill": "tozeroy",
+        "fillcolor": "rgba(102, 126, 234, 0.2)",
+        "hovertemplate": "Trade %{x}<br>Cumulative P&L: %{y:.2f}R<extra></extra>",
+    }]
     
-    # Breakeven line
-    fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="Breakeven")
-    
-    fig.update_layout(
-        title=f"Equity Curve – {pair_name}",
-        xaxis_title="Trade Number",
-        yaxis_title="Cumulative P&L (R-Multiples)",
-        hovermode="x unified",
-        template="plotly_dark",
-        width=1000,
-        height=600,
-        showlegend=True,
-    )
-    
-    return fig
+    return _build_figure(traces, {
+        # Breakeven line (what fig.add_hline would add)
+        "shapes": [{
+            "type": "line", "xref": "x domain", "x0": 0, "x1": 1, "yref": "y", "y0": 0, "y1": 0,
+            "line": {"color": "gray", "dash": "dash"},
+        }],
+        "annotations": [{
+            "text": "Breakeven", "showarrow": False, "xref": "x domain", "x": 1, "yref": "y", "y": 0,
+            "xanchor": "right", "yanchor": "bottom",
+        }],
+        "title": {"text": f"Equity Curve – {pair_name}"},
+        "xaxis": {"title": {"text": "Trade Number"}},
+        "yaxis": {"title": {"text": "Cumulative P&L (R-Multiples)"}},
+        "hovermode": "x unified",
+        "template": "plotly_dark",
+        "width": 1000,
+        "height": 600,
+        "showlegend": True,
+    })
 
 
 def plot_traded_positions(trades: pd.DataFrame, df: pd.DataFrame, pair_name: str = "") -> go.Figure:
@@ -973,77 +920,196 @@ def plot_traded_positions(trades: pd.DataFrame, df: pd.DataFrame, pair_name: str
     Returns:
         Plotly Figure
     """
-    fig = go.Figure()
+    from plotting import downsample_ohlc
 
-    # Candlesticks
+    # Candlesticks, bucketed like plot_ob_signals; the trade markers keep their exact dates
     try:
-        fig.add_trace(go.Candlestick(
-            x=df.index,
-            open=df['open'],
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
-            name='Price'
-        ))
+        df = downsample_ohlc(df, max_bars=MAX_CHART_BARS)
+        traces = [{
+            "type": "candlestick",
+            "x": df.index,
+            "open": df['open'].to_numpy(),
+            "high": df['high'].to_numpy(),
+            "low": df['low'].to_numpy(),
+            "close": df['close'].to_numpy(),
+            "name": 'Price',
+        }]
     except Exception:
-        fig.add_annotation(text="No price data available", showarrow=False)
-        return fig
+        return _build_figure([], {"annotations": [{"text": "No price data available", "showarrow": False}]})
 
     # Add entries/exits
     if trades is None or trades.empty:
-        fig.add_annotation(text="No trades to plot", showarrow=False)
-        fig.update_layout(title=f"Traded Positions – {pair_name}", template="plotly_dark")
-        return fig
-
-    for _, t in trades.iterrows():
-        # robustly get fields
-        entry_dt = t.get('entry_date') or t.get('entryTime') or t.get('entry_time')
-        exit_dt = t.get('exit_date') or t.get('exitTime') or t.get('exit_time')
-        entry_price = t.get('entry') if pd.notna(t.get('entry')) else None
-        exit_price = t.get('exit') if pd.notna(t.get('exit')) else t.get('exit_price')
-        outcome = t.get('outcome_R', 0)
-
-        # If dates are strings, attempt parse
-        try:
-            if entry_dt is not None and not isinstance(entry_dt, (pd.Timestamp,)):
-                entry_dt = pd.to_datetime(entry_dt)
-            if exit_dt is not None and not isinstance(exit_dt, (pd.Timestamp,)):
-                exit_dt = pd.to_datetime(exit_dt)
-        except Exception:
-            pass
+        return _build_figure(traces, {
+            "annotations": [{"text": "No trades to plot", "showarrow": False}],
+            "title": {"text": f"Traded Positions – {pair_name}"},
+            "template": "plotly_dark",
+        })
+
+    def column(*names, dates=False):
+        # The first of `names` the trades have, as a list with None for missing values
+        for name in names:
+            if name in trades.columns:
+                values = trades[name]
+                if dates and values.dtype.kind != "M":
+                    # String dates are parsed in one pass; unparseable columns are kept as they are
+                    try:
+                        values = pd.to_datetime(values)
+                    except Exception:
+                        pass
+                return values.astype(object).where(values.notna(), None).tolist()
+        return [None] * len(trades)
+
+    entry_dts = column('entry_date', 'entryTime', 'entry_time', dates=True)
+    exit_dts = column('exit_date', 'exitTime', 'exit_time', dates=True)
+    entry_prices = column('entry')
+    exit_prices = [p if p is not None else alt for p, alt in zip(column('exit'), column('exit_price'))]
+    outcomes = trades['outcome_R'].tolist() if 'outcome_R' in trades.columns else [0] * len(trades)
+    colors = ['green' if outcome > 0 else 'red' for outcome in outcomes]
+
+    # One trace per kind of mark (per-point colours and symbols) rather than one per trade
+    entries = [i for i, (dt, price) in enumerate(zip(entry_dts, entry_prices)) if dt is not None and price is not None]
+    exits = [i for i, (dt, price) in enumerate(zip(exit_dts, exit_prices)) if dt is not None and price is not None]
+
+    # Lines between entry and exit: one trace per colour, segments split by gaps
+    closed = set(entries).intersection(exits)
+    for color in ('green', 'red'):
+        xs, ys = [], []
+        for i in sorted(closed):
+            if colors[i] == color:
+                xs += [entry_dts[i], exit_dts[i], None]
+                ys += [entry_prices[i], exit_prices[i], None]
+        if xs:
+            traces.append({
+                "type": "scatter", "x": xs, "y": ys, "mode": 'lines',
+                "line": {"color": color, "width": 2}, "opacity": 0.6, "showlegend": False,
+            })
+
+    # Entry markers
+    if entries:
+        traces.append({
+            "type": "scatter", "x": [entry_dts[i] for i in entries], "y": [entry_prices[i] for i in entries],
+            "mode": 'markers',
+            "marker": {
+                "symbol": ['triangle-up' if outcomes[i] >= 0 else 'triangle-down' for i in entries],
+                "size": 12,
+                "color": [colors[i] for i in entries],
+            },
+            "name": 'Entry', "hovertemplate": "Entry<br>%{x|%Y-%m-%d}<br>%{y:.4f}<extra></extra>",
+        })
+
+    # Exit markers
+    if exits:
+        traces.append({
+            "type": "scatter", "x": [exit_dts[i] for i in exits], "y": [exit_prices[i] for i in exits],
+            "mode": 'markers',
+            "marker": {"symbol": 'circle', "size": 10, "color": [colors[i] for i in exits]},
+            "name": 'Exit', "hovertemplate": "Exit<br>%{x|%Y-%m-%d}<br>%{y:.4f}<extra></extra>",
+        })
+
+    return _build_figure(traces, {
+        "title": {"text": f"Traded Positions – {pair_name}"},
+        "xaxis": {"title": {"text": 'Date'}, "rangeslider": {"visible": False}},
+        "yaxis": {"title": {"text": 'Price'}},
+        "hovermode": 'x unified',
+        "template": 'plotly_dark',
+        "width": 1000,
+        "height": 600,
+    })
+
+
+def chart_data_path(path: str) -> str:
+    """Return the figure JSON file that backs the chart page at `path`."""
+    return os.path.splitext(path)[0] + ".json"
+
+
+@functools.lru_cache(maxsize=None)
+def _plotly_js_url() -> str:
+    """URL chart pages load plotly.js from: the CDN, or a local copy when PLOTLY_JS_LOCAL is set.
+
+    The local copy is the installed plotly package's bundle, (re)written to
+    ./static once per process when it differs, and linked through `_static_url`
+    so browsers cache it as immutable.
+    """
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    if not PLOTLY_JS_LOCAL:
+        return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+    path = os.path.join(APP.static_folder, PLOTLY_JS_FILE)
+    bundle = get_plotlyjs().encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            current = f.read() == bundle
+    except OSError:
+        current = False
+    if not current:
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(bundle)
+        os.replace(tmp, path)
+    return _static_url(PLOTLY_JS_FILE)
+
+
+def write_chart_html(fig: go.Figure, path: str) -> None:
+    """
+    Write a Plotly figure as a chart page for the iframes.
 
-        color = 'green' if outcome > 0 else 'red'
-
-        # Entry marker
-        if entry_dt is not None and entry_price is not None:
-            fig.add_trace(go.Scatter(
-                x=[entry_dt], y=[entry_price], mode='markers',
-                marker=dict(symbol='triangle-up' if outcome >= 0 else 'triangle-down', size=12, color=color),
-                name='Entry', hovertemplate=f"Entry<br>%{{x|%Y-%m-%d}}<br>{entry_price:.4f}<extra></extra>"
-            ))
-
-        # Exit marker
-        if exit_dt is not None and exit_price is not None:
-            fig.add_trace(go.Scatter(
-                x=[exit_dt], y=[exit_price], mode='markers',
-                marker=dict(symbol='circle', size=10, color=color),
-                name='Exit', hovertemplate=f"Exit<br>%{{x|%Y-%m-%d}}<br>{exit_price:.4f}<extra></extra>"
-            ))
-
-        # Line between entry and exit
-        if entry_dt is not None and exit_dt is not None and entry_price is not None and exit_price is not None:
-            fig.add_trace(go.Scatter(
-                x=[entry_dt, exit_dt], y=[entry_price, exit_price], mode='lines',
-                line=dict(color=color, width=2), opacity=0.6, showlegend=False
-            ))
-
-    fig.update_layout(
-        title=f"Traded Positions – {pair_name}",
-        xaxis_title='Date', yaxis_title='Price',
-        xaxis_rangeslider_visible=False, hovermode='x unified', template='plotly_dark', width=1000, height=600
+    The figure itself goes to a sibling .json file (see `chart_data_path`),
+    and `path` gets a small page that loads plotly.js (see `_plotly_js_url`)
+    and fetches that JSON. The browser caches plotly.js once for every chart,
+    and the figure is serialised without generating a full standalone HTML
+    document.
+    """
+    data_path = chart_data_path(path)
+    fig.write_json(data_path, validate=False)
+    page = _CHART_TMPL.render(
+        title=fig.layout.title.text or os.path.basename(path),
+        plotly_js=_plotly_js_url(),
+        data_url="/chart/" + os.path.basename(data_path),
+        config=CHART_PLOTLY_CONFIG,
     )
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def chart_thumb_path(path: str) -> str:
+    """Return the PNG thumbnail file that goes with chart page `path`."""
+    return os.path.splitext(path)[0] + ".png"
 
-    return fig
+
+def write_chart_thumbnail(path: str) -> str | None:
+    """Export a static PNG thumbnail of the chart page `path` (see `chart_thumb_path`).
+
+    The figure is read back from the chart's JSON data file, so this can run
+    after the page was written. Returns the thumbnail file name, or None when
+    Kaleido is not installed or the export fails.
+    """
+    if kaleido is None:
+        return None
+    import plotly.io as pio
+
+    thumb_path = chart_thumb_path(path)
+    try:
+        fig = pio.read_json(chart_data_path(path))
+        width, height = CHART_THUMB_SIZE
+        fig.write_image(thumb_path, format="png", width=width, height=height, engine="kaleido")
+    except Exception as e:
+        print(f"Thumbnail export failed for {path}: {e}")
+        return None
+    return thumb_path
+
+
+def precompress_chart(path: str) -> bool:
+    """Write `<path>.br` next to a chart file so it can be served pre-compressed.
+
+    Returns False when Brotli is not installed or the chart does not exist.
+    """
+    if brotli is None or not os.path.isfile(path):
+        return False
+    with open(path, "rb") as f:
+        data = brotli.compress(f.read(), quality=11)
+    with open(path + ".br", "wb") as f:
+        f.write(data)
+    return True
 
 
 def plot_bokeh_candlestick(df: pd.DataFrame, trades: pd.DataFrame = None, pair_name: str = "") -> str:
@@ -1200,13 +1266,7 @@ def generate_analysis_text(stats: dict, trades: pd.DataFrame, pair_name: str = "
         HTML string with analysis
     """
     if stats.get("trades", 0) == 0:
-        return """
-        <div class="analysis-section">
-            <h3>📊 Analysis</h3>
-            <p><strong>Result:</strong> No trades generated from OB signals.</p>
-            <p>The Order Block strategy did not detect any valid entry opportunities within the test period.</p>
-        </div>
-        """
+        return _ANALYSIS_TMPL.render(a=None)
     
     trades_count = stats.get("trades", 0)
     wins = stats.get("wins", 0)
@@ -1262,117 +1322,57 @@ def generate_analysis_text(stats: dict, trades: pd.DataFrame, pair_name: str = "
     else:
         r_insight = f"The strategy loses {abs(avg_r):.2f}R per trade on average, indicating negative expectancy."
     
-    # Total P&L assessment
-    pnl_verdict = "LOSS" if total_pnl < 0 else "PROFIT"
-    pnl_color = "red" if total_pnl < 0 else "green"
-    
     # Extended performance insights
-    if trades_count > 0:
-        loss_pnl = trades[trades['outcome_R'] <= 0]['outcome_R'].sum() if 'outcome_R' in trades.columns else 0
-        win_pnl = trades[trades['outcome_R'] > 0]['outcome_R'].sum() if 'outcome_R' in trades.columns else 0
-        avg_win = trades[trades['outcome_R'] > 0]['outcome_R'].mean() if wins > 0 else 0
-        avg_loss = trades[trades['outcome_R'] <= 0]['outcome_R'].mean() if losses > 0 else 0
+    if trades_count > 0 and 'outcome_R' in trades.columns and len(trades) > 0:
+        # One pass over outcome_R yields every statistic below
+        r = np.ascontiguousarray(trades['outcome_R'].to_numpy(dtype=np.float64))
+        win_pnl, loss_pnl, n_win, n_loss, largest_win, largest_loss = outcome_r_breakdown(r)
+        avg_win = win_pnl / n_win if n_win else 0
+        avg_loss = loss_pnl / n_loss if n_loss else 0
         profit_factor = abs(win_pnl / loss_pnl) if loss_pnl != 0 else float('inf')
-        largest_win = trades['outcome_R'].max() if len(trades) > 0 else 0
-        largest_loss = trades['outcome_R'].min() if len(trades) > 0 else 0
     else:
         loss_pnl = win_pnl = avg_win = avg_loss = profit_factor = largest_win = largest_loss = 0
     
-    html = f"""
-    <div class="analysis-section">
-        <h3>📊 Backtest Analysis for {pair_name}</h3>
-        
-        <div class="analysis-block">
-            <p><strong>Overall Verdict:</strong> <span style="color: #333; font-size: 1.2em;">{quality_verdict}</span></p>
-            <p>{quality_desc}</p>
-        </div>
-        
-        <h4>📈 Performance Breakdown</h4>
-        <div class="analysis-block">
-        <ul>
-            <li><strong>Sample Size:</strong> {trades_count} trades executed during backtest period. This sample provides {'strong' if trades_count >= 20 else 'moderate' if trades_count >= 10 else 'limited'} statistical confidence.</li>
-            
-            <li><strong>Win/Loss Record:</strong> {wins} winning trades vs {losses} losing trades. 
-                {'This shows a healthy win rate with more wins than losses.' if win_rate > 50 else 'This is below the 50% breakeven threshold and indicates the strategy is losing more trades than it wins.'}
-            </li>
-            
-            <li><strong>Win Rate Analysis:</strong> {win_rate:.1f}% ({win_loss_insight})
-                <ul style="margin-left: 20px; margin-top: 8px;">
-                    <li>Expected breakeven: ~50% (1:1 risk-reward)</li>
-                    <li>Actual performance: {'Well above' if win_rate >= 60 else 'Above' if win_rate > 50 else 'Below'} breakeven</li>
-                    <li>Win rate sustainability: {'Very high - this strategy has strong edge' if win_rate >= 60 else 'Good - edge present' if win_rate > 55 else 'Moderate - limited edge' if win_rate > 50 else 'Low - strategy is losing'}</li>
-                </ul>
-            </li>
-            
-            <li><strong>Risk-Adjusted Returns (R-Multiples):</strong> {r_insight}
-                <ul style="margin-left: 20px; margin-top: 8px;">
-                    <li>Average per winning trade: {avg_win:+.3f}R</li>
-                    <li>Average per losing trade: {avg_loss:+.3f}R</li>
-                    <li>Profit Factor: {profit_factor:.2f}x (winners are {profit_factor:.2f}x larger than losers)</li>
-                    <li>Largest winning trade: {largest_win:+.2f}R</li>
-                    <li>Largest losing trade: {largest_loss:+.2f}R</li>
-                </ul>
-            </li>
-            
-            <li><strong>Total P&L Summary:</strong> <span style="color: {pnl_color}; font-weight: bold;">{total_pnl:+.2f}R total ({pnl_verdict})</span>
-                <ul style="margin-left: 20px; margin-top: 8px;">
-                    <li>Gross profit from winners: {win_pnl:+.2f}R</li>
-                    <li>Total loss from losers: {loss_pnl:+.2f}R</li>
-                    <li>Net outcome: {total_pnl:+.2f}R ({'Highly positive edge' if total_pnl > 5 else 'Positive edge' if total_pnl > 0 else 'Negative - strategy needs redesign'})</li>
-                </ul>
-            </li>
-        </ul>
-        </div>
-        
-        <h4>🎯 Key Insights</h4>
-        <ul>
-    """
-    
-    # Add insights based on metrics
-    if win_rate >= 60:
-        html += "<li>✅ <strong>High Win Rate:</strong> The strategy consistently picks profitable setups.</li>"
-    elif win_rate < 45:
-        html += "<li>⚠️ <strong>Low Win Rate:</strong> More than half of trades are losing. This needs investigation.</li>"
-    
-    if avg_r > 0.5:
-        html += "<li>✅ <strong>Strong Risk/Reward:</strong> Winners significantly outweigh losers in magnitude.</li>"
-    elif avg_r < 0:
-        html += "<li>❌ <strong>Negative Expectancy:</strong> Losers are larger than winners on average.</li>"
-    
-    if total_pnl > 0 and avg_r > 0:
-        html += "<li>✅ <strong>Profitable:</strong> The strategy generated positive returns with valid edge.</li>"
-    elif total_pnl > 0 and avg_r <= 0:
-        html += "<li>⚠️ <strong>Profitable by Luck:</strong> Positive total P&L but negative expectancy (unsustainable).</li>"
-    elif total_pnl <= 0:
-        html += "<li>❌ <strong>Unprofitable:</strong> The strategy resulted in losses. Optimization needed.</li>"
-    
-    # Recommendation
-    html += """
-        </ul>
-        
-        <h4>💡 Recommendation</h4>
-    """
-    
-    if quality_verdict == "✅ EXCELLENT":
-        html += "<p>✅ This is a <strong>production-ready strategy</strong> with strong historical performance. Consider forward testing and live deployment with proper position sizing.</p>"
-    elif quality_verdict == "✅ GOOD":
-        html += "<p>✅ This is a <strong>promising strategy</strong> with solid edge. Consider further optimization and validation on different market regimes.</p>"
-    elif quality_verdict == "⚠️ ACCEPTABLE":
-        html += "<p>⚠️ This strategy shows <strong>potential but needs refinement</strong>. Test parameter adjustments and validate on out-of-sample data.</p>"
-    elif quality_verdict == "⚠️ MARGINAL":
-        html += "<p>⚠️ This strategy is <strong>near-breakeven and risky</strong>. Significant optimization or redesign is recommended before live trading.</p>"
-    else:
-        html += "<p>❌ This strategy is <strong>not viable in its current form</strong>. Major revisions, parameter changes, or strategy redesign is needed.</p>"
-    
-    html += """
-    </div>
-    """
-    
-    return html
+    # Every derived scalar goes to the template in one plain dict
+    return _ANALYSIS_TMPL.render(a={
+        "pair_name": pair_name,
+        "quality_verdict": quality_verdict,
+        "quality_desc": quality_desc,
+        "trades_count": trades_count,
+        "wins": wins,
+        "losses": losses,
+        "win_rate": win_rate,
+        "win_loss_insight": win_loss_insight,
+        "avg_r": avg_r,
+        "r_insight": r_insight,
+        "total_pnl": total_pnl,
+        "win_pnl": win_pnl,
+        "loss_pnl": loss_pnl,
+        "avg_win": avg_win,
+        "avg_loss": avg_loss,
+        "profit_factor": profit_factor,
+        "largest_win": largest_win,
+        "largest_loss": largest_loss,
+    })
+
+
+def _partial_summary_file(cache_file: str) -> str:
+    """Return the file build_summary fills while it runs; it replaces `cache_file` when done."""
+    return f"{cache_file}.partial"
 
 
 def build_summary(cache_file: str):
-    """Build OB backtest summary for all pairs and save to CSV."""
+    """
+    Build OB backtest summary for all pairs and save to CSV.
+
+    Pairs with a cached backtest are read back; the others are loaded here
+    and scanned together by one parallel kernel (`ob_backtest_batch`), so the
+    whole build runs in this process.
+
+    Rows are written to _partial_summary_file(cache_file) as pairs finish, so
+    the pairs done so far survive a crash and the dashboard can show them
+    mid-build. The finished summary is then swapped in with os.replace.
+    """
     with _build_lock:
         _build_state["running"] = True
         _build_state["last_started"] = time.time()
@@ -1380,33 +1380,89 @@ def build_summary(cache_file: str):
     
     try:
         results = []
-        
-        for pair in ALL_PAIRS:
-            print(f"Running OB backtest for {pair}...")
-            try:
-                result = run_ob_backtest_for_pair(pair)
+        partial = _partial_summary_file(cache_file)
+        with open(partial, "w", newline="", encoding="utf-8") as progress:
+            progress_writer = csv.DictWriter(progress, fieldnames=SUMMARY_COLUMNS, lineterminator="\n")
+            progress_writer.writeheader()
+
+            def record(pair, result):
+                print(f"OB backtest for {pair}...")
                 if "error" in result:
                     print(f"  Error: {result['error']}")
-                    continue
-                
+                    return
                 stats = result.get("stats", {})
-                results.append({
-                    "pair": pair,
-                    "trades": stats.get("trades", 0),
-                    "wins": stats.get("wins", 0),
-                    "losses": stats.get("losses", 0),
-                    "total_pnl": stats.get("total_pnl", 0),
-                    "win_rate": stats.get("win_rate", 0),
-                    "avg_r": stats.get("avg_r", 0),
-                })
-            except Exception as e:
-                print(f"  Exception for {pair}: {e}")
-                continue
+                # float32 values are written with their shortest repr, which keeps the CSV small
+                row = {"pair": pair}
+                row.update({col: dtype(stats.get(col, 0)) for col, dtype in SUMMARY_DTYPES.items()})
+                results.append(row)
+                progress_writer.writerow(row)
+                if len(results) % SUMMARY_FLUSH_EVERY == 0:
+                    progress.flush()
+
+            uncached = []
+            for pair in ALL_PAIRS:
+                db_path = _resolve_pair_db(pair)
+                cache_path, cache_key, cached = _cached_ob_backtest(pair, db_path)
+                if cached is not None:
+                    record(pair, cached)
+                else:
+                    uncached.append((pair, db_path, cache_path, cache_key))
+
+            def load(entry):
+                pair, db_path = entry[:2]
+                t0 = time.perf_counter()
+                try:
+                    return _indicator_frame(pair, db_path), time.perf_counter() - t0
+                except Exception as e:
+                    return e, 0.0
+
+            # SQLite reads and the indicator maths mostly run outside the GIL, so pairs load side by side
+            pending = []
+            with ThreadPoolExecutor(max_workers=BUILD_LOAD_WORKERS) as ex:
+                for (pair, _, cache_path, cache_key), (df, elapsed) in zip(uncached, ex.map(load, uncached)):
+                    if isinstance(df, Exception):
+                        record(pair, {"error": str(df)})
+                    elif df.empty:
+                        record(pair, {"error": f"No data found for {pair}"})
+                    else:
+                        pending.append((pair, df, cache_path, cache_key, elapsed))
+
+            # The pairs are independent, so one kernel call scans them all in parallel threads
+            t0 = time.perf_counter()
+            scans = ob_backtest_batch(
+                [df for _, df, _, _, _ in pending],
+                lookback=BACKTEST_PARAMS["lookback"],
+                entry_wait_bars=BACKTEST_PARAMS["entry_wait_bars"],
+                atr_threshold=BACKTEST_PARAMS["atr_threshold"],
+                stop_on_tie=BACKTEST_PARAMS["stop_on_tie"],
+            )
+            # Each pair is charged its load plus its share of the scan by bar count, so the
+            # cache decision matches `run_ob_backtest_for_pair`, which times load and scan together
+            scan_per_bar = (time.perf_counter() - t0) / max(1, sum(len(df) for _, df, _, _, _ in pending))
+            for (pair, df, cache_path, cache_key, elapsed), (ob_count, trades) in zip(pending, scans):
+                try:
+                    result = _ob_backtest_result(ob_count, trades)
+                except Exception as e:
+                    print(f"  Exception for {pair}: {e}")
+                    continue
+                _store_ob_backtest(pair, cache_path, cache_key, result, elapsed + scan_per_bar * len(df))
+                record(pair, result)
+        
+        # Keep the CSV in pairs.json order regardless of completion order
+        order = {pair: i for i, pair in enumerate(ALL_PAIRS)}
+        results.sort(key=lambda row: order[row["pair"]])
         
         if results:
-            df = pd.DataFrame(results)
-            df.to_csv(cache_file, index=False)
+            # A handful of fixed-schema rows: write them directly rather than via a DataFrame,
+            # then swap the file in so readers never see a half-written summary
+            with open(partial, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS, lineterminator="\n")
+                writer.writeheader()
+                writer.writerows(results)
+            os.replace(partial, cache_file)
             print(f"Summary saved to {cache_file}")
+        else:
+            os.remove(partial)
         
         _build_state["last_finished"] = time.time()
     
@@ -1419,246 +1475,145 @@ def build_summary(cache_file: str):
             _build_state["running"] = False
 
 
+def _build_and_prerender(cache_file: str) -> None:
+    """Background rebuild: the summary, then (like `--build`) every pair's page and chart files."""
+    build_summary(cache_file)
+    # Prerendered pages are tied to OB_CACHE_FILE; a failed build leaves the old ones in place
+    if cache_file == OB_CACHE_FILE and not _build_state["last_error"]:
+        try:
+            prerender_pairs(PRERENDERED_FILE)
+        except Exception as e:
+            print(f"Prerender error: {e}")
+
+
+def build_summary_async(cache_file: str = OB_CACHE_FILE) -> dict:
+    """Queue `build_summary` (and the pair page prerender) on the background worker.
+
+    Returns a dict with `started` (False if a build is already queued or
+    running) and `last_started` (epoch seconds of the current build).
+    """
+    global _build_future
+    with _build_lock:
+        if _build_future is not None and not _build_future.done():
+            return {"started": False, "last_started": _build_state["last_started"]}
+        _build_state["running"] = True
+        _build_state["last_started"] = time.time()
+        _build_future = _build_executor.submit(_build_and_prerender, cache_file)
+        return {"started": True, "last_started": _build_state["last_started"]}
+
+
+@APP.route("/rebuild", methods=["GET", "POST"])
+def rebuild():
+    """Start a background rebuild and return immediately (202 Accepted)."""
+    status = build_summary_async(OB_CACHE_FILE)
+    return status, 202 if status["started"] else 409
+
+
+# Dashboard categories (pane id suffix, tab label), in display order
+CATEGORY_TABS = (("forex", "Forex"), ("stocks", "Stocks"), ("commodities", "Commodities"))
+_STOCK_TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA"]
+_COMMODITY_TICKERS = ["GC_F", "CL_F", "NG_F", "HG_F", "SI_F"]
+
+
+def _ticker_category(pair: str) -> str:
+    """Classify a pair by the tickers in its name ('forex', 'stocks' or 'commodities')."""
+    if any(s in pair for s in _STOCK_TICKERS):
+        return "stocks"
+    if any(c in pair for c in _COMMODITY_TICKERS):
+        return "commodities"
+    return "forex"
+
+
+# The configured pairs are classified once; only unknown names fall back to the ticker scan
+_PAIR_CATEGORY = {pair: _ticker_category(pair) for pair in ALL_PAIRS}
+
+
+def _pair_category(pair: str) -> str:
+    """Return the dashboard category ('forex', 'stocks' or 'commodities') for a pair."""
+    return _PAIR_CATEGORY.get(pair) or _ticker_category(pair)
+
+
+def _summary_rows_html(df: pd.DataFrame) -> Markup:
+    """Render dashboard table rows for a block of the summary, a whole column at a time."""
+    if df.empty:
+        return Markup("")
+    pair = df["pair"].map(lambda p: str(escape(p)))
+    pnl_class = pd.Series(np.where(df["total_pnl"] > 0, "pos", "neg"), index=df.index)
+    rows = (
+        "<tr><td><strong>" + pair + "</strong></td>"
+        + "<td>" + df["trades"].astype(str) + "</td>"
+        + '<td class="pos">' + df["wins"].astype(str) + "</td>"
+        + '<td class="neg">' + df["losses"].astype(str) + "</td>"
+        + "<td>" + df["win_rate"].map("{:.1f}%".format) + "</td>"
+        + '<td class="' + pnl_class + '">' + df["total_pnl"].map("{:.2f}R".format) + "</td>"
+        + "<td>" + df["avg_r"].map("{:.2f}R".format) + "</td>"
+        + '<td><a href="/pair/' + pair + '">View Details →</a></td></tr>'
+    )
+    return Markup("\n".join(rows.tolist()))
+
+
+@functools.lru_cache(maxsize=2)
+def _dashboard_summary(path: str, mtime: float) -> tuple:
+    """Parse a summary CSV into the dashboard totals and per-category rows.
+
+    Keyed on the file's mtime, so the CSV is only re-read after a build rewrites it.
+    Returns (None, []) while the file has no rows yet.
+    """
+    df = pd.read_csv(path, dtype=SUMMARY_DTYPES)
+    if df.empty:
+        return None, []
+
+    # One pass over the numeric block instead of six Series reductions
+    totals = df[SUMMARY_COLUMNS[1:]].to_numpy(dtype=np.float64).sum(axis=0)
+    trades, wins, losses, total_pnl, win_rate_sum, avg_r_sum = totals
+    summary = {
+        "total_trades": int(trades),
+        "total_wins": int(wins),
+        "total_losses": int(losses),
+        "total_pnl": float(total_pnl),
+        "avg_wr": win_rate_sum / len(df),
+        "avg_r": avg_r_sum / len(df),
+    }
+
+    # Classify each pair once, then render each category's rows once per summary file
+    groups = dict(tuple(df.groupby(df["pair"].map(_pair_category), sort=False)))
+    categories = [
+        (f"cat-{category}", label, _summary_rows_html(groups[category]) if category in groups else Markup(""))
+        for category, label in CATEGORY_TABS
+    ]
+    return summary, categories
+
+
 @APP.route("/")
 def index():
     """OB backtest summary dashboard."""
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Order Block Strategy – Dashboard</title>
-        {get_base_css()}
-        <style>
-            /* Category tabs on dashboard */
-            .category-tabs {{ display:flex; gap:8px; margin:12px 0; }}
-            .category-btn {{ padding:8px 12px; border-radius:6px; background:#222; color:#ddd; border:1px solid #333; cursor:pointer; }}
-            .category-btn.active {{ background:#7b3be6; color:#fff; }}
-            .category-pane {{ display:none; margin-top:12px; }}
-            .category-pane.active {{ display:block; }}
-            /* Analysis section dark-mode compatible font/color */
-            .analysis-section {{ color: #222; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }}
-            .dark-mode .analysis-section {{ color: #e0e0e0; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <header>
-                <div>
-                    <h1>🔷 Order Block Strategy</h1>
-                    <p>Advanced price-action backtest dashboard</p>
-                </div>
-                <div style="display:flex;gap:8px;align-items:center;">
-                    <a href="/admin/pairs" class="btn secondary" style="padding:8px 12px;font-size:0.9em;">⚙️ Admin</a>
-                    <button id="themeToggle" class="theme-toggle" onclick="toggleTheme()">🌙 Dark Mode</button>
-                </div>
-            </header>
-            
-            <h2>Dashboard Summary</h2>
-    """
-    
-    # Load cache if available
-    if os.path.exists(OB_CACHE_FILE):
+    build_started = None
+    if _build_state["running"] and _build_state["last_started"]:
+        build_started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(_build_state["last_started"]))
+
+    summary = None
+    categories = []
+    error = None
+
+    # Load cache if available; a first build shows the pairs it has finished so far
+    path = OB_CACHE_FILE
+    if build_started and not os.path.exists(path):
+        path = _partial_summary_file(OB_CACHE_FILE)
+    if os.path.exists(path):
         try:
-            df = pd.read_csv(OB_CACHE_FILE)
-            
-            html += """
-            <div class="summary-grid">
-            """
-            
-            # Summary stats
-            total_trades = df["trades"].sum()
-            total_wins = df["wins"].sum()
-            total_losses = df["losses"].sum()
-            total_pnl = df["total_pnl"].sum()
-            avg_wr = df["win_rate"].mean()
-            avg_r = df["avg_r"].mean()
-            
-            html += f"""
-                <div class="stat-card">
-                    <h3>Total Trades</h3>
-                    <div class="stat-value">{total_trades}</div>
-                    <div class="stat-label">Across all pairs</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Total Wins</h3>
-                    <div class="stat-value" style="color: green;">{total_wins}</div>
-                    <div class="stat-label">{total_losses} losses</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Average Win Rate</h3>
-                    <div class="stat-value">{avg_wr:.1f}%</div>
-                    <div class="stat-label">Across all pairs</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Average R-Multiple</h3>
-                    <div class="stat-value">{avg_r:.2f}R</div>
-                    <div class="stat-label">Mean outcome per trade</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Total P&L (R)</h3>
-                    <div class="stat-value" style="color: {'green' if total_pnl > 0 else 'red'};">{total_pnl:.2f}R</div>
-                    <div class="stat-label">Cumulative outcome</div>
-                </div>
-            </div>
-            
-            <h2>Pair Performance</h2>
-            <div class="category-tabs">
-                <button class="category-btn active" onclick="showCategory('cat-forex', this)">Forex</button>
-                <button class="category-btn" onclick="showCategory('cat-stocks', this)">Stocks</button>
-                <button class="category-btn" onclick="showCategory('cat-commodities', this)">Commodities</button>
-            </div>
-
-            <div id="cat-forex" class="category-pane active">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Pair</th>
-                            <th>Trades</th>
-                            <th>Wins</th>
-                            <th>Losses</th>
-                            <th>Win Rate</th>
-                            <th>Total P&L</th>
-                            <th>Avg R</th>
-                            <th>Action</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-
-            # build category lists
-            stocks = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA"]
-            commodities = ["GC_F", "CL_F", "NG_F", "HG_F", "SI_F"]
-
-            # Forex pane rows (exclude stocks & commodities)
-            for _, row in df.iterrows():
-                pair = row["pair"]
-                if any(s in pair for s in stocks) or any(c in pair for c in commodities):
-                    continue
-                html += f"""
-                        <tr>
-                            <td><strong>{pair}</strong></td>
-                            <td>{int(row['trades'])}</td>
-                            <td style=\"color: green;\">{int(row['wins'])}</td>
-                            <td style=\"color: red;\">{int(row['losses'])}</td>
-                            <td>{row['win_rate']:.1f}%</td>
-                            <td style=\"color: {'green' if row['total_pnl'] > 0 else 'red'};\">{row['total_pnl']:.2f}R</td>
-                            <td>{row['avg_r']:.2f}R</td>
-                            <td><a href=\"/pair/{pair}\">View Details →</a></td>
-                        </tr>
-                """
-
-            html += """
-                    </tbody>
-                </table>
-            </div>
-
-            <div id="cat-stocks" class="category-pane">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Pair</th>
-                            <th>Trades</th>
-                            <th>Wins</th>
-                            <th>Losses</th>
-                            <th>Win Rate</th>
-                            <th>Total P&L</th>
-                            <th>Avg R</th>
-                            <th>Action</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-
-            for _, row in df.iterrows():
-                pair = row["pair"]
-                if any(s in pair for s in stocks):
-                    html += f"""
-                        <tr>
-                            <td><strong>{pair}</strong></td>
-                            <td>{int(row['trades'])}</td>
-                            <td style=\"color: green;\">{int(row['wins'])}</td>
-                            <td style=\"color: red;\">{int(row['losses'])}</td>
-                            <td>{row['win_rate']:.1f}%</td>
-                            <td style=\"color: {'green' if row['total_pnl'] > 0 else 'red'};\">{row['total_pnl']:.2f}R</td>
-                            <td>{row['avg_r']:.2f}R</td>
-                            <td><a href=\"/pair/{pair}\">View Details →</a></td>
-                        </tr>
-                    """
-
-            html += """
-                    </tbody>
-                </table>
-            </div>
-
-            <div id="cat-commodities" class="category-pane">
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Pair</th>
-                            <th>Trades</th>
-                            <th>Wins</th>
-                            <th>Losses</th>
-                            <th>Win Rate</th>
-                            <th>Total P&L</th>
-                            <th>Avg R</th>
-                            <th>Action</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-
-            for _, row in df.iterrows():
-                pair = row["pair"]
-                if any(c in pair for c in commodities):
-                    html += f"""
-                        <tr>
-                            <td><strong>{pair}</strong></td>
-                            <td>{int(row['trades'])}</td>
-                            <td style=\"color: green;\">{int(row['wins'])}</td>
-                            <td style=\"color: red;\">{int(row['losses'])}</td>
-                            <td>{row['win_rate']:.1f}%</td>
-                            <td style=\"color: {'green' if row['total_pnl'] > 0 else 'red'};\">{row['total_pnl']:.2f}R</td>
-                            <td>{row['avg_r']:.2f}R</td>
-                            <td><a href=\"/pair/{pair}\">View Details →</a></td>
-                        </tr>
-                    """
-
-            html += """
-                    </tbody>
-                </table>
-            </div>
-
-            <script>
-                function showCategory(id, btn) {{
-                    document.querySelectorAll('.category-pane').forEach(p => p.classList.remove('active'));
-                    document.querySelectorAll('.category-btn').forEach(b => b.classList.remove('active'));
-                    const el = document.getElementById(id);
-                    if (el) el.classList.add('active');
-                    if (btn) btn.classList.add('active');
-                }}
-            </script>
-            """
-        
+            summary, categories = _dashboard_summary(path, os.path.getmtime(path))
         except Exception as e:
-            html += f'<div class="error">Error loading cache: {e}</div>'
-    else:
-        html += """
-        <div class="error">
-            📊 No summary cache found. Run <code>python ob_ui.py --build</code> to generate backtest results.
-        </div>
-        """
-    
-    html += f"""
-        {get_theme_script()}
-        <hr>
-        <footer>Order Block Strategy UI • Powered by Python, Flask & Plotly</footer>
-        </div>
-    </body>
-    </html>
-    """
-    return html
+            summary = None
+            error = f"Error loading cache: {e}"
+
+    # Streamed like the pair page, so the head (stylesheet, scripts) goes out before the tables
+    return _stream_page(
+        _INDEX_TMPL,
+        build_started=build_started,
+        summary=summary,
+        categories=categories,
+        error=error,
+    )
 
 
 @APP.route("/bokeh/<pair>")
@@ -1706,406 +1661,431 @@ def bokeh_chart(pair):
         return jsonify({"error": f"Bokeh error: {str(e)}"}), 500
 
 
-@APP.route("/pair/<pair>")
-def pair_detail(pair):
-    """Detailed analysis for a single pair."""
-    html = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{pair} – Order Block Analysis</title>
-        {get_base_css()}
-        <style>
-            .tab-buttons {{ display:flex; gap:8px; margin:12px 0; }}
-            .tab-btn {{ padding:8px 12px; border-radius:6px; background:#222; color:#ddd; border:1px solid #333; cursor:pointer; }}
-            .tab-btn.active {{ background:#0b84ff; color:#fff; }}
-            .tab-content {{ margin-top:12px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <header>
-                <div>
-                    <h1>🔷 {pair}</h1>
-                    <p>Order Block Analysis</p>
-                </div>
-                <div style="display:flex; align-items:center; gap:8px;">
-                    <a href="/" class="back-btn">← Dashboard</a>
-                    <button id="themeToggle" class="theme-toggle" onclick="toggleTheme()">🌙 Dark Mode</button>
-                </div>
-            </header>
+def _format_trade_rows(trades: pd.DataFrame) -> list:
+    """Format the trade log into display-ready dicts for the pair template."""
+    n = len(trades)
+
+    def column(name, default=None):
+        # Whole columns as Python lists (datetimes stay Timestamps), skipping per-row Series access
+        return trades[name].tolist() if name in trades.columns else [default] * n
+
+    def date(name):
+        # One vectorised pass to str(Timestamp)'s text, instead of a Timestamp object per cell
+        dtype = trades[name].dtype if name in trades.columns else None
+        if isinstance(dtype, np.dtype) and dtype.kind == "M":
+            stamps = np.datetime_as_string(trades[name].to_numpy(), unit="s").tolist()
+            return [s if s == "NaT" else s.replace("T", " ") for s in stamps]
+        return column(name, 'N/A')
+
+    def price(name):
+        # Format every value, then patch the NaN rows from a mask instead of testing each cell
+        if name not in trades.columns:
+            return ['N/A'] * n
+        values = trades[name].to_numpy(dtype=np.float64)
+        text = [f"{v:.4f}" for v in values.tolist()]
+        for i in np.flatnonzero(np.isnan(values)).tolist():
+            text[i] = 'N/A'
+        return text
+
+    outcomes = column('outcome_R', 0)
+    return [
+        {
+            "type": kind,
+            "ob_date": ob_date,
+            "entry_date": entry_date,
+            "entry": entry,
+            "stop": stop,
+            "R": risk,
+            "outcome": f"{outcome:.2f}R",
+            "outcome_class": "pos" if outcome > 0 else "neg",
+        }
+        for kind, ob_date, entry_date, entry, stop, risk, outcome in zip(
+            column('type', 'N/A'),
+            date('ob_date'),
+            date('entry_date'),
+            price('entry'),
+            price('stop'),
+            price('R'),
+            outcomes,
+        )
+    ]
+
+
+# Chart cards on the Plots tab, in display order: (icon, label)
+CHART_CARDS = (
+    ("📊", "OB Detection Chart"),
+    ("🎯", "Traded Positions"),
+    ("📈", "Equity Curve"),
+)
+
+def _chart_srcdoc(path: str):
+    """Return a chart page's HTML to inline into the pair page (iframe srcdoc), or None if unreadable.
+
+    Chart pages are small loaders (see `write_chart_html`); the figure itself
+    stays in its JSON file, so inlining every page only saves the /chart
+    round trip for the loader.
     """
-    
     try:
-        # Run backtest
-        result = run_ob_backtest_for_pair(pair)
-        
-        if "error" in result:
-            html += f'<div class="error">Error: {result["error"]}</div>'
-            html += '<a href="/" class="back-link">← Back to Dashboard</a>'
-            html += f'{get_theme_script()}</div></body></html>'
-            return html
-        
-        stats = result.get("stats", {})
-        trades = result.get("trades", pd.DataFrame())
-        
-        # Summary section — now inside tabbed Details View
-        html += f"""
-            <div class="tabs">
-                <div class="tab-buttons">
-                    <button class="tab-btn active" onclick="showTab('tab-summary', this)">Summary</button>
-                    <button class="tab-btn" onclick="showTab('tab-trades', this)">Trades</button>
-                    <button class="tab-btn" onclick="showTab('tab-plots', this)">Plots</button>
-                    <button class="tab-btn" onclick="showTab('tab-bokeh', this)">Interactive</button>
-                    <button class="tab-btn" onclick="showTab('tab-analysis', this)">Analysis</button>
-                </div>
-
-                <div class="tab-content" id="tab-summary">
-                    <h2>Summary</h2>
-                    <div class="summary-grid">
-                <div class="stat-card">
-                    <h3>Total Trades</h3>
-                    <div class="stat-value">{stats.get('trades', 0)}</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Wins / Losses</h3>
-                    <div class="stat-value">{stats.get('wins', 0)} / {stats.get('losses', 0)}</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Win Rate</h3>
-                    <div class="stat-value">{stats.get('win_rate', 0):.1f}%</div>
-                </div>
-                <div class="stat-card">
-                    <h3>Total P&L</h3>
-                    <div class="stat-value" style="color: {'green' if stats.get('total_pnl', 0) > 0 else 'red'};">
-                        {stats.get('total_pnl', 0):.2f}R
-                    </div>
-                </div>
-                <div class="stat-card">
-                    <h3>Avg R-Multiple</h3>
-                    <div class="stat-value">{stats.get('avg_r', 0):.2f}R</div>
-                </div>
-            </div>
-        </div>
-        """
-        
-        # Trades table (collapsible)
-        # Wrap trade log in its own tab content
-        if not trades.empty:
-            html += f"""
-            <div class="tab-content" id="tab-trades" style="display:none">
-            <h2>Trade Log</h2>
-            <button class="collapsible-header" onclick="toggleCollapsible(this)">
-                <span><span class="toggle-icon">▶</span> Expand Trade Log ({len(trades)} trades)</span>
-            </button>
-            <div class="collapsible-content">
-            <table>
-                <thead>
-                    <tr>
-                        <th>OB Type</th>
-                        <th>OB Date</th>
-                        <th>Entry Date</th>
-                        <th>Entry Price</th>
-                        <th>Stop Price</th>
-                        <th>Risk (R)</th>
-                        <th>Outcome</th>
-                    </tr>
-                </thead>
-                <tbody>
-            """
-            
-            for _, trade in trades.iterrows():
-                outcome_color = "green" if trade.get("outcome_R", 0) > 0 else "red"
-                
-                # Format trade values safely
-                entry_str = f"{trade.get('entry'):.4f}" if pd.notna(trade.get('entry')) else 'N/A'
-                stop_str = f"{trade.get('stop'):.4f}" if pd.notna(trade.get('stop')) else 'N/A'
-                r_str = f"{trade.get('R'):.4f}" if pd.notna(trade.get('R')) else 'N/A'
-                
-                html += f"""
-                    <tr>
-                        <td>{trade.get('type', 'N/A')}</td>
-                        <td>{trade.get('ob_date', 'N/A')}</td>
-                        <td>{trade.get('entry_date', 'N/A')}</td>
-                        <td>{entry_str}</td>
-                        <td>{stop_str}</td>
-                        <td>{r_str}</td>
-                        <td style="color: {outcome_color}; font-weight: bold;">
-                            {trade.get('outcome_R', 0):.2f}R
-                        </td>
-                    </tr>
-                """
-            
-            html += """
-                </tbody>
-            </table>
-            </div>
-            </div>
-            """
-        
-        # Charts (placed into the Plots tab)
-        try:
-            from database import load_from_database
-            
-            # Determine correct DB path
-            if any(stock in pair for stock in ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA"]):
-                db_path = "sqlite:///stocks.db"
-            elif any(comm in pair for comm in ["GC_F", "CL_F", "NG_F", "HG_F", "SI_F"]):
-                db_path = "sqlite:///commodities.db"
-            else:
-                db_path = "sqlite:///forex.db"
-            
-            df = load_from_database(pair, db_path)
-            df.columns = [c.lower().strip() for c in df.columns]
-            df = df[["open", "high", "low", "close"]].copy()
-            df.columns = ["open", "high", "low", "close"]
-            df = compute_indicators(df)
-            ob = detect_order_blocks(df)
-            
-            # Create and save charts
-            fig = plot_ob_signals(df, ob, pair)
-            chart_file = f"{pair}_ob_clean.html"
-            fig.write_html(chart_file)
-            
-            # Create trades overlay chart (entries/exits)
-            try:
-                fig_trades = plot_traded_positions(trades, df, pair)
-                trades_file = f"{pair}_ob_trades.html"
-                fig_trades.write_html(trades_file)
-            except Exception:
-                trades_file = chart_file
-
-            # Create equity curve
-            fig_equity = plot_equity_curve(trades, pair)
-            equity_file = f"{pair}_ob_equity.html"
-            fig_equity.write_html(equity_file)
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
 
-            # Create Bokeh candlestick chart
-            bokeh_html = ""
-            try:
-                 bokeh_html = plot_bokeh_candlestick(df, trades, pair_name)
-            except Exception as e:
-                bokeh_html = f"<div style='padding:20px;color:red;'><strong>Bokeh Error:</strong> {str(e)}</div>"
 
-            # Helper to get file metadata
-            def _file_meta(path: str) -> str:
-                try:
-                    if not os.path.exists(path):
-                        return "—"
-                    size = os.path.getsize(path)
-                    mtime = time.localtime(os.path.getmtime(path))
-                    friendly_size = f"{size/1024:.1f} KB"
-                    friendly_time = time.strftime('%Y-%m-%d %H:%M', mtime)
-                    return f"{friendly_size} · {friendly_time}"
-                except Exception:
-                    return "—"
-
-            chart_meta = _file_meta(chart_file)
-            trades_meta = _file_meta(trades_file)
-            equity_meta = _file_meta(equity_file)
-            
-            html += f"""
-            <div class="tab-content" id="tab-plots" style="display:none">
-            <h2>Charts</h2>
-            <div class="equity-grid">
-                <div class="equity-card clickable" onclick="openModal('{chart_file}', 'OB Detection Chart')">
-                    <h4>📊 OB Detection Chart</h4>
-                    <iframe data-src="/chart/{chart_file}" src="about:blank" onclick="event.stopPropagation()"></iframe>
-                    <div class="chart-meta">{chart_meta}</div>
-                </div>
-                <div class="equity-card clickable" onclick="openModal('{trades_file}', 'Traded Positions')">
-                    <h4>🎯 Traded Positions</h4>
-                    <iframe data-src="/chart/{trades_file}" src="about:blank" onclick="event.stopPropagation()"></iframe>
-                    <div class="chart-meta">{trades_meta}</div>
-                </div>
-                <div class="equity-card clickable" onclick="openModal('{equity_file}', 'Equity Curve')">
-                    <h4>📈 Equity Curve</h4>
-                    <iframe data-src="/chart/{equity_file}" src="about:blank" onclick="event.stopPropagation()"></iframe>
-                    <div class="chart-meta">{equity_meta}</div>
-                </div>
-            </div>
-            """
-            
-            # Add analysis text (place it in the Analysis tab)
-            analysis_html = generate_analysis_text(stats, trades, pair)
-            # close the plots tab content and add bokeh tab and analysis tab
-            html += f"""
-            </div>
-            <div class="tab-content" id="tab-bokeh" style="display:none">
-            <h2>Interactive Candlestick Chart</h2>
-            <p style="margin:12px 0;font-size:0.9em;color:#999;">Hover over candles to view OHLC data. Pan, zoom, and toggle entry/exit markers using the toolbar.</p>
-            <div id="bokeh-container" data-pair="{pair}">Interactive chart not loaded. <button id="load-bokeh-btn">Load Chart</button></div>
-            </div>
-            <div class="tab-content" id="tab-analysis" style="display:none">
-            """
-            html += analysis_html
-            html += """
-            </div>
-            """
-        
-        except Exception as e:
-            print(f"Chart generation error for {pair}: {e}")
-        
-    except Exception as e:
-        html += f'<div class="error">Error: {str(e)}</div>'
-    
-    # Modal
-    html += r"""
-    <div id="chartModal" class="modal">
-        <div class="modal-content">
-            <div class="modal-header">
-                <span id="modalTitle">Chart</span>
-                <span class="close-btn" onclick="closeModal()">&times;</span>
-            </div>
-            <div class="modal-body">
-                <iframe id="modalIframe"></iframe>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        function showTab(tabId, btn) {
-            // hide all tab contents
-            document.querySelectorAll('.tab-content').forEach(el => el.style.display = 'none');
-            // remove active class from buttons
-            document.querySelectorAll('.tab-btn').forEach(b => b.classList.remove('active'));
-            // show requested tab
-            const t = document.getElementById(tabId);
-            if (t) {
-                t.style.display = 'block';
-                // Lazy-load any iframe thumbnails inside this tab
-                t.querySelectorAll('iframe[data-src]').forEach(iframe => {
-                    try {
-                        if (!iframe.src || iframe.src === 'about:blank') {
-                            iframe.src = iframe.getAttribute('data-src');
-                            iframe.setAttribute('data-loaded', '1');
-                        }
-                    } catch (e) {
-                        console.warn('Failed to lazy-load iframe', e);
-                    }
-                });
-                // If this is the bokeh tab, trigger async load of the Bokeh chart
-                if (tabId === 'tab-bokeh') {
-                    try {
-                        loadBokeh();
-                    } catch (e) {
-                        console.warn('Failed to load Bokeh chart', e);
-                    }
+def _file_meta(path: str) -> str:
+    """Return '<size> · <mtime>' of the figure behind chart page `path` (see `chart_data_path`),
+    or an em dash if unavailable."""
+    try:
+        data_path = chart_data_path(path)
+        if not os.path.exists(data_path):
+            return "—"
+        size = os.path.getsize(data_path)
+        mtime = time.localtime(os.path.getmtime(data_path))
+        friendly_size = f"{size/1024:.1f} KB"
+        friendly_time = time.strftime('%Y-%m-%d %H:%M', mtime)
+        return f"{friendly_size} · {friendly_time}"
+    except Exception:
+        return "—"
+
+
+def _pair_summary_context(result: dict) -> dict:
+    """Build the Summary and Trades tab context from a backtest result."""
+    stats = result.get("stats", {})
+    trades = result.get("trades", pd.DataFrame())
+    return {
+        "stats": {
+            "trades": stats.get("trades", 0),
+            "wins": stats.get("wins", 0),
+            "losses": stats.get("losses", 0),
+            "win_rate": stats.get("win_rate", 0),
+            "total_pnl": stats.get("total_pnl", 0),
+            "avg_r": stats.get("avg_r", 0),
+        },
+        "trades": _format_trade_rows(trades) if not trades.empty else [],
+    }
+
+
+def _charts_current(files, db_path: str) -> bool:
+    """True when every chart page and its JSON are newer than the pair's data and the code drawing them,
+    and the pages load the current plotly.js (see `_plotly_js_url`)."""
+    try:
+        newest_input = max(
+            os.path.getmtime(p)
+            for p in (_db_file(db_path), __file__, detect_order_blocks.__code__.co_filename)
+        )
+        if not all(
+            os.path.getmtime(p) >= newest_input
+            for path in files
+            for p in (path, chart_data_path(path))
+        ):
+            return False
+        # Pages are a few hundred bytes; one written for the CDN (or an older bundle) is redrawn
+        plotly_js = _plotly_js_url()
+        for path in files:
+            with open(path, encoding="utf-8") as f:
+                if plotly_js not in f.read():
+                    return False
+        return True
+    except (OSError, TypeError):
+        return False
+
+
+def _pair_charts_context(pair: str, result: dict) -> dict:
+    """Write the pair's chart files and build the Plots and Analysis tab context.
+
+    Chart files left by an earlier run are reused while they are newer than
+    the pair's database (see `_charts_current`), so a cold page cache does
+    not redraw every chart.
+    """
+    stats = result.get("stats", {})
+    trades = result.get("trades", pd.DataFrame())
+    try:
+        db_path = _resolve_pair_db(pair)
+        files = (f"{pair}_ob_clean.html", f"{pair}_ob_trades.html", f"{pair}_ob_equity.html")
+        if not _charts_current(files, db_path):
+            files = _write_pair_charts(pair, db_path, trades)
+        return {
+            "charts": [
+                {
+                    "icon": icon,
+                    "label": label,
+                    "file": path,
+                    "meta": _file_meta(path),
+                    "srcdoc": _chart_srcdoc(path),
                 }
-            }
-            // mark button active
-            if (btn) btn.classList.add('active');
+                for (icon, label), path in zip(CHART_CARDS, files)
+            ],
+            # Analysis text (placed in the Analysis tab)
+            "analysis_html": generate_analysis_text(stats, trades, pair),
         }
+    
+    except Exception as e:
+        print(f"Chart generation error for {pair}: {e}")
+        return {"charts": None, "analysis_html": ""}
 
-        // Ensure default tab is shown on load
-        document.addEventListener('DOMContentLoaded', function() {
-            // if a tab button is active, use it; otherwise default to summary
-            const active = document.querySelector('.tab-btn.active');
-            if (active) {
-                const onclick = active.getAttribute('onclick');
-                // try to parse the target id from the onclick call
-                const m = onclick && onclick.match(/showTab\('([^']+)'/);
-                if (m && m[1]) showTab(m[1], active);
-                else showTab('tab-summary', active);
-            } else {
-                showTab('tab-summary', document.querySelector('.tab-btn'));
-            }
-        });
-
-        // Function to load Bokeh chart asynchronously
-        function loadBokeh() {
-            const container = document.getElementById('bokeh-container');
-            if (!container) return;
-            if (container.getAttribute('data-loaded') === '1') return;
-            container.innerHTML = 'Loading interactive chart...';
-            const pairName = container.getAttribute('data-pair');
-            fetch('/bokeh/' + encodeURIComponent(pairName))
-                .then(r => {
-                    if (!r.ok) throw new Error('Network response was not ok');
-                    return r.text();
-                })
-                .then(html => {
-                    container.innerHTML = html;
-                    container.setAttribute('data-loaded', '1');
-                })
-                .catch(async err => {
-                    console.error('Error fetching Bokeh chart', err);
-                    let msg = 'Failed to load interactive chart.';
-                    try { msg = await (err.text ? err.text() : Promise.resolve(err.message)); } catch (e) {}
-                    container.innerHTML = `<div class="error">${msg}</div>`;
-                });
-        }
 
-        // Attach click handler to manual load button if present
-        document.addEventListener('DOMContentLoaded', function() {
-            const btn = document.getElementById('load-bokeh-btn');
-            if (btn) btn.addEventListener('click', () => loadBokeh());
-        });
-
-        function toggleCollapsible(button) {
-            const content = button.nextElementSibling;
-            const icon = button.querySelector('.toggle-icon');
-            
-            if (content.classList.contains('collapsed')) {
-                content.classList.remove('collapsed');
-                icon.classList.remove('collapsed');
-            } else {
-                content.classList.add('collapsed');
-                icon.classList.add('collapsed');
-            }
-        }
-        
-        function openModal(chartFile, chartLabel) {
-            const modal = document.getElementById('chartModal');
-            const iframe = document.getElementById('modalIframe');
-            const title = document.getElementById('modalTitle');
-            
-            iframe.src = '/chart/' + chartFile;
-            title.textContent = chartLabel + ' - Full View';
-            modal.style.display = 'block';
-        }
-        
-        function closeModal() {
-            const modal = document.getElementById('chartModal');
-            modal.style.display = 'none';
-        }
-        
-        window.onclick = function(event) {
-            const modal = document.getElementById('chartModal');
-            if (event.target == modal) {
-                modal.style.display = 'none';
-            }
-        }
-        
-        document.addEventListener('keydown', function(event) {
-            if (event.key === 'Escape') {
-                closeModal();
-            }
-        });
-    </script>
+def _write_pair_charts(pair: str, db_path: str, trades: pd.DataFrame) -> tuple:
+    """Draw and write the pair's three charts; returns their page files in CHART_CARDS order."""
+    # The backtest usually just prepared this frame, so it comes from memory
+    frames = run_ob_backtest_for_pair(pair, db_path, return_frames=True)
+    df, ob = frames["df"], frames["ob"]
     
-    <hr>
-    <div style="text-align:center; margin:20px 0;">
-        <a href="/" class="back-btn">← Back to Dashboard</a>
-    </div>
-    <footer>Order Block Strategy UI • Powered by Python, Flask & Plotly</footer>
-    </div>
-    """
+    # Create charts
+    fig = plot_ob_signals(df, ob, pair)
+    chart_file = f"{pair}_ob_clean.html"
     
-    html += f"{get_theme_script()}"
-    html += """
-    </body>
-    </html>
+    # Create trades overlay chart (entries/exits)
+    try:
+        fig_trades = plot_traded_positions(trades, df, pair)
+    except Exception:
+        fig_trades = None
+    trades_file = f"{pair}_ob_trades.html"
+
+    # Create equity curve
+    fig_equity = plot_equity_curve(trades, pair)
+    equity_file = f"{pair}_ob_equity.html"
+
+    # The files are independent, so serialise and write them concurrently
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        clean_write = pool.submit(write_chart_html, fig, chart_file)
+        equity_write = pool.submit(write_chart_html, fig_equity, equity_file)
+        trades_write = pool.submit(write_chart_html, fig_trades, trades_file) if fig_trades is not None else None
+        clean_write.result()
+        equity_write.result()
+        if trades_write is None or trades_write.exception() is not None:
+            trades_file = chart_file
+
+    return chart_file, trades_file, equity_file
+
+
+# Pair pages are cached per summary-cache mtime: `--build` (or /rebuild)
+# rewrites OB_CACHE_FILE, which changes the mtime and so implicitly invalidates
+# every entry computed against the previous build.
+_PAIR_CACHE_SIZE = max(len(ALL_PAIRS) * 2, 32)
+
+
+class _PairMemo:
+    """
+    Memoize `func(pair, cache_mtime)`, evicting the least frequently viewed pair.
+
+    Entries are keyed on the pair alone and remember the cache mtime they were
+    built for. After a rebuild an entry is recomputed in place and keeps its
+    view count, so popular pairs stay cached across builds while one-off
+    URLs are the first to go.
+    """
+
+    def __init__(self, func, maxsize: int):
+        self._func = func
+        self._maxsize = maxsize
+        self._entries = {}  # pair -> [cache_mtime, value, views]
+        self._lock = threading.Lock()
+        functools.update_wrapper(self, func)
+
+    def __call__(self, pair: str, cache_mtime: float):
+        with self._lock:
+            entry = self._entries.get(pair)
+            if entry is not None:
+                entry[2] += 1
+                if entry[0] == cache_mtime:
+                    return entry[1]
+        value = self._func(pair, cache_mtime)
+        with self._lock:
+            entry = self._entries.get(pair)
+            if entry is None:
+                if len(self._entries) >= self._maxsize:
+                    coldest = min(self._entries, key=lambda p: self._entries[p][2])
+                    del self._entries[coldest]
+                self._entries[pair] = [cache_mtime, value, 1]
+            else:
+                entry[0] = cache_mtime
+                entry[1] = value
+        return value
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _cache_mtime() -> float:
+    """Return the modification time of OB_CACHE_FILE (0.0 if it does not exist)."""
+    try:
+        return os.path.getmtime(OB_CACHE_FILE)
+    except OSError:
+        return 0.0
+
+
+@functools.partial(_PairMemo, maxsize=_PAIR_CACHE_SIZE)
+def _pair_backtest(pair: str, cache_mtime: float) -> tuple:
+    """Return the backtest result and Summary/Trades context for a pair."""
+    result = run_ob_backtest_for_pair(pair)
+    if "error" in result:
+        return result, {"error": result["error"]}
+    return result, _pair_summary_context(result)
+
+
+@functools.partial(_PairMemo, maxsize=_PAIR_CACHE_SIZE)
+def _pair_charts(pair: str, cache_mtime: float) -> dict:
+    """Return the Plots/Analysis context for a pair, writing its chart files once."""
+    result, _ = _pair_backtest(pair, cache_mtime)
+    return _pair_charts_context(pair, result)
+
+
+# Pair page contexts written by `--build`, tagged with the cache mtime they belong to
+_prerendered = {"cache_mtime": None, "pairs": {}}
+
+
+def prerender_pairs(out_file: str = PRERENDERED_FILE) -> int:
+    """Render every pair's page context (and chart files) and pickle them to `out_file`.
+
+    Chart files are also Brotli-compressed (see `precompress_chart`) and get a
+    PNG thumbnail when Kaleido is installed (see `write_chart_thumbnail`).
+
+    Returns the number of pairs written.
     """
-    return html
+    cache_mtime = _cache_mtime()
+    pairs = {}
+    for pair in ALL_PAIRS:
+        print(f"Prerendering {pair}...")
+        try:
+            _, summary = _pair_backtest(pair, cache_mtime)
+            if "error" in summary:
+                continue
+            charts = _pair_charts(pair, cache_mtime)
+            pairs[pair] = {"summary": summary, "charts": charts}
+            for card in charts["charts"] or ():
+                precompress_chart(card["file"])
+                precompress_chart(chart_data_path(card["file"]))
+                # Cards with a thumbnail show the PNG; the modal still opens the interactive chart
+                card["thumb"] = write_chart_thumbnail(card["file"])
+        except Exception as e:
+            print(f"  Exception for {pair}: {e}")
+    with open(out_file, "wb") as f:
+        pickle.dump({"cache_mtime": cache_mtime, "pairs": pairs}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return len(pairs)
+
+
+def _prerendered_pairs(cache_mtime: float) -> dict:
+    """Return the prerendered pair contexts for this build (empty if they are stale)."""
+    global _prerendered
+    if _prerendered["cache_mtime"] != cache_mtime:
+        try:
+            with open(PRERENDERED_FILE, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            data = {}
+        if data.get("cache_mtime") != cache_mtime:
+            # Remember the miss so a stale or missing file is only read once per build
+            data = {"cache_mtime": cache_mtime, "pairs": {}}
+        _prerendered = data
+    return _prerendered["pairs"]
+
+
+def _pair_etag(pair: str, cache_mtime: float) -> str:
+    """ETag of a pair page: changes with the pair's data, the summary build, the strategy code
+    and the page's templates and assets (see `_page_fingerprint`)."""
+    db_path = _resolve_pair_db(pair)
+    try:
+        db_mtime = os.path.getmtime(_db_file(db_path))
+    except (OSError, TypeError):
+        db_mtime = None
+    key = f"{pair}:{db_mtime}:{cache_mtime}:{_STRATEGY_FINGERPRINT}:{_PAGE_FINGERPRINT}"
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+@APP.route("/pair/<pair>")
+def pair_detail(pair):
+    """Detailed analysis for a single pair.
+
+    The response is streamed so the browser can paint the header (and start
+    fetching static assets) while the backtest runs, then the summary and
+    trade log while the chart files are being written. Repeat views of the
+    same build are served from `prerender_pairs` output or from
+    `_pair_backtest`/`_pair_charts`, and a browser revalidating its copy
+    gets a 304 without any rendering (see `_pair_etag`).
+    """
+    cache_mtime = _cache_mtime()
+    etag = _pair_etag(pair, cache_mtime)
+    # Weak: the bytes differ with the negotiated Content-Encoding
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag, weak=True)
+        resp.headers["Cache-Control"] = PAIR_CACHE_CONTROL
+        return resp
+    prerendered = _prerendered_pairs(cache_mtime).get(pair)
+
+    def load_backtest() -> dict:
+        if prerendered:
+            return prerendered["summary"]
+        try:
+            return _pair_backtest(pair, cache_mtime)[1]
+        except Exception as e:
+            return {"error": str(e)}
+
+    def load_charts() -> dict:
+        if prerendered:
+            return prerendered["charts"]
+        return _pair_charts(pair, cache_mtime)
+
+    resp = APP.make_response(
+        _stream_page(_PAIR_TMPL, pair=pair, load_backtest=load_backtest, load_charts=load_charts)
+    )
+    resp.set_etag(etag, weak=True)
+    resp.headers["Cache-Control"] = PAIR_CACHE_CONTROL
+    return resp
+
+
+@APP.route("/pair/<pair>/trades")
+def pair_trades(pair):
+    """Trade log rows past the first page, as <tr> fragments for the pair page's "Load more" button."""
+    offset = max(request.args.get("offset", TRADE_PAGE_SIZE, type=int), 0)
+    limit = max(request.args.get("limit", TRADE_PAGE_SIZE, type=int), 0)
+    cache_mtime = _cache_mtime()
+    prerendered = _prerendered_pairs(cache_mtime).get(pair)
+    summary = prerendered["summary"] if prerendered else _pair_backtest(pair, cache_mtime)[1]
+    if "error" in summary:
+        abort(404)
+    rows = summary["trades"][offset:offset + limit]
+    return Response(_TRADE_ROWS_TMPL.render(trades=rows), mimetype="text/html")
+
+
+def _chart_content_type(filename: str) -> str:
+    """Content type of a chart file (page, figure JSON or PNG thumbnail)."""
+    mimetype = mimetypes.guess_type(filename)[0] or "text/html"
+    return f"{mimetype}; charset=utf-8" if mimetype.startswith("text/") else mimetype
 
 
 @APP.route("/chart/<filename>")
 def serve_chart(filename):
-    """Serve chart HTML files."""
-    return send_from_directory(".", filename)
+    """Serve chart files (pages, figure JSON and PNG thumbnails).
+
+    Behind nginx, set OB_CHART_ACCEL_PREFIX (e.g. "/internal-charts/") so the
+    bytes are sent by nginx via X-Accel-Redirect instead of a Flask worker;
+    with OB_USE_X_SENDFILE=1 the file responses carry X-Sendfile instead.
+    """
+    if CHART_ACCEL_PREFIX:
+        filename = secure_filename(filename)
+        if not filename or not os.path.isfile(filename):
+            abort(404)
+        resp = Response(content_type=_chart_content_type(filename))
+        resp.headers["X-Accel-Redirect"] = CHART_ACCEL_PREFIX + filename
+        return resp
+    # Serve the --build precompressed copy when it is current and the browser accepts it
+    br_file = filename + ".br"
+    if (
+        request.accept_encodings["br"]
+        and os.path.isfile(br_file)
+        and os.path.isfile(filename)
+        and os.path.getmtime(br_file) >= os.path.getmtime(filename)
+    ):
+        resp = send_from_directory(".", br_file, conditional=True)
+        resp.headers["Content-Encoding"] = "br"
+        resp.headers["Content-Type"] = _chart_content_type(filename)
+        resp.vary.add("Accept-Encoding")
+    else:
+        # Conditional: ETag/Last-Modified from the file, so revalidation is a 304
+        resp = send_from_directory(".", filename, conditional=True)
+    resp.headers["Cache-Control"] = CHART_CACHE_CONTROL
+    return resp
 
 
 def main():
@@ -2113,16 +2093,33 @@ def main():
     parser.add_argument("--build", action="store_true", help="Build cache and exit")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=5001, help="Port to bind to (default 5001)")
+    parser.add_argument("--debug", action="store_true", help="Enable Flask debug mode and the reloader")
+    parser.add_argument("--prod", action="store_true", help="Serve with waitress instead of the Flask dev server")
     args = parser.parse_args()
 
+    # Compile the Numba kernels (or load them from cache) before any backtest
+    # runs, so neither the build workers nor the first request pay for the JIT
+    warm_up_kernels()
+
     if args.build:
         print("Building OB backtest cache...")
         build_summary(OB_CACHE_FILE)
         print(f"Cache saved to {OB_CACHE_FILE}")
+        count = prerender_pairs(PRERENDERED_FILE)
+        print(f"Prerendered {count} pair pages to {PRERENDERED_FILE}")
         return
 
+    # Templates only need re-reading from disk while developing
+    APP.config["TEMPLATES_AUTO_RELOAD"] = args.debug
+    APP.jinja_env.auto_reload = args.debug
+
     print(f"🔷 Starting OB UI server on http://{args.host}:{args.port}")
-    APP.run(host=args.host, port=args.port, debug=True)
+    if args.prod:
+        from waitress import serve
+
+        serve(APP, host=args.host, port=args.port, threads=8, channel_timeout=60)
+        return
+    APP.run(host=args.host, port=args.port, debug=args.debug, threaded=True, use_reloader=args.debug)
 
 
 if __name__ == "__main__":
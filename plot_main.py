@@ -3,12 +3,33 @@ Main script for plotting financial data.
 Generates candlestick charts and other visualizations for stored data.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from config import CURRENCY_PAIRS, DATABASE_PATH
-from database import load_from_database, list_tables, get_database_info
+from database import load_from_database, load_many_from_database, list_tables, get_database_info
 from plotting import plot_candlestick, plot_price_line, plot_ohlc, save_candlestick_html
 
+# Each pair's HTML chart is built and written on its own, so they are spread over the CPUs
+CHART_WORKERS = os.cpu_count() or 1
+
+
+def _load_pair_tables(data_type: str) -> dict:
+    """Load every configured pair's `data_type` table over one database connection."""
+    table_names = [f"{from_symbol}_{to_symbol}_{data_type}" for from_symbol, to_symbol in CURRENCY_PAIRS]
+    print(f"\n📈 Loading {len(table_names)} {data_type} tables...")
+    return load_many_from_database(table_names, DATABASE_PATH)
+
+
+def _pair_table(tables: dict, table_name: str):
+    """Return a table from `_load_pair_tables`; a missing one is looked up again for a descriptive error."""
+    df = tables.get(table_name)
+    if df is None:
+        df = load_from_database(table_name, DATABASE_PATH)
+    return df
 
-def plot_single_pair(from_symbol: str, to_symbol: str, data_type: str = "daily"):
+
+def plot_single_pair(from_symbol: str, to_symbol: str, data_type: str = "daily", df=None):
     """
     Plot a single currency pair.
     
@@ -16,12 +37,14 @@ def plot_single_pair(from_symbol: str, to_symbol: str, data_type: str = "daily")
         from_symbol: Base currency (e.g., 'EUR')
         to_symbol: Quote currency (e.g., 'USD')
         data_type: Type of data - 'daily' or 'hourly'
+        df: The pair's data if already loaded (default: load it from the database)
     """
     table_name = f"{from_symbol}_{to_symbol}_{data_type}"
     
     try:
-        print(f"\n📈 Loading {table_name}...")
-        df = load_from_database(table_name, DATABASE_PATH)
+        if df is None:
+            print(f"\n📈 Loading {table_name}...")
+            df = load_from_database(table_name, DATABASE_PATH)
         
         print(f"📊 Plotting candlestick chart for {from_symbol}/{to_symbol} ({data_type})...")
         title = f"{from_symbol}/{to_symbol} - {data_type.capitalize()} Candlestick Chart"
@@ -39,8 +62,10 @@ def plot_all_daily_pairs():
     print("PLOTTING ALL DAILY FOREX PAIRS")
     print("="*60)
     
+    tables = _load_pair_tables("daily")
     for from_symbol, to_symbol in CURRENCY_PAIRS:
-        plot_single_pair(from_symbol, to_symbol, data_type="daily")
+        df = tables.get(f"{from_symbol}_{to_symbol}_daily")
+        plot_single_pair(from_symbol, to_symbol, data_type="daily", df=df)
 
 
 def plot_all_hourly_pairs():
@@ -51,8 +76,10 @@ def plot_all_hourly_pairs():
     print("PLOTTING ALL HOURLY FOREX PAIRS")
     print("="*60)
     
+    tables = _load_pair_tables("hourly")
     for from_symbol, to_symbol in CURRENCY_PAIRS:
-        plot_single_pair(from_symbol, to_symbol, data_type="hourly")
+        df = tables.get(f"{from_symbol}_{to_symbol}_hourly")
+        plot_single_pair(from_symbol, to_symbol, data_type="hourly", df=df)
 
 
 def plot_price_lines():
@@ -63,12 +90,12 @@ def plot_price_lines():
     print("PLOTTING PRICE LINES")
     print("="*60)
     
+    tables = _load_pair_tables("daily")
     for from_symbol, to_symbol in CURRENCY_PAIRS:
         table_name = f"{from_symbol}_{to_symbol}_daily"
         
         try:
-            print(f"\n📈 Loading {table_name}...")
-            df = load_from_database(table_name, DATABASE_PATH)
+            df = _pair_table(tables, table_name)
             
             print(f"📊 Plotting price line for {from_symbol}/{to_symbol}...")
             title = f"{from_symbol}/{to_symbol} - Closing Price"
@@ -78,28 +105,46 @@ def plot_price_lines():
             print(f"❌ Error plotting {table_name}: {str(e)}")
 
 
+def _save_pair_html(job: tuple):
+    """Save one pair's daily candlestick chart; `job` is (from_symbol, to_symbol, df)."""
+    from_symbol, to_symbol, df = job
+    try:
+        print(f"💾 Saving HTML chart for {from_symbol}/{to_symbol}...")
+        filename = f"{from_symbol}_{to_symbol}_daily.html"
+        title = f"{from_symbol}/{to_symbol} - Daily Candlestick Chart"
+        save_candlestick_html(df, filename, title=title)
+    except Exception as e:
+        print(f"❌ Error saving chart for {from_symbol}_{to_symbol}_daily: {str(e)}")
+
+
 def save_charts_as_html():
     """
     Save candlestick charts as HTML files for all pairs.
+    
+    The tables are loaded here; with more than one CPU the charts are then
+    built and written in worker processes (see CHART_WORKERS).
     """
     print("\n" + "="*60)
     print("SAVING CHARTS AS HTML")
     print("="*60)
     
+    tables = _load_pair_tables("daily")
+    jobs = []
     for from_symbol, to_symbol in CURRENCY_PAIRS:
         table_name = f"{from_symbol}_{to_symbol}_daily"
         
         try:
-            print(f"\n📈 Loading {table_name}...")
-            df = load_from_database(table_name, DATABASE_PATH)
-            
-            print(f"💾 Saving HTML chart for {from_symbol}/{to_symbol}...")
-            filename = f"{from_symbol}_{to_symbol}_daily.html"
-            title = f"{from_symbol}/{to_symbol} - Daily Candlestick Chart"
-            save_candlestick_html(df, filename, title=title)
-            
+            jobs.append((from_symbol, to_symbol, _pair_table(tables, table_name)))
         except Exception as e:
             print(f"❌ Error saving chart for {table_name}: {str(e)}")
+    
+    workers = min(len(jobs), CHART_WORKERS)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_save_pair_html, jobs))
+    else:
+        for job in jobs:
+            _save_pair_html(job)
 
 
 def show_database_tables():
@@ -3,10 +3,71 @@ Plotting module for financial data visualization.
 Uses Plotly for interactive candlestick charts and other visualizations.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 
+# Longer price series are bucketed down to this many candles before plotting
+MAX_CHART_BARS = 5000
+# Layout shared by the single-instrument candlestick/OHLC charts; only the title and template vary
+_CANDLE_LAYOUT = {
+    "xaxis": {"title": {"text": "Date"}, "rangeslider": {"visible": False}},
+    "yaxis": {"title": {"text": "Price"}},
+    "hovermode": "x unified",
+}
+
+
+def downsample_ohlc(df: pd.DataFrame, max_bars: int = MAX_CHART_BARS) -> pd.DataFrame:
+    """
+    Bucket an OHLC frame down to at most `max_bars` rows.
+    
+    Each bucket keeps its first open, highest high, lowest low and last close
+    (other columns, e.g. an EMA, take their last value) and is stamped with
+    the bucket's first date. Frames that are already small are returned as is.
+    """
+    n = len(df)
+    if n <= max_bars:
+        return df
+    step = -(-n // max_bars)
+    starts = np.arange(0, n, step)
+    ends = np.minimum(starts + step, n) - 1
+    out = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == "open":
+            out[col] = values[starts]
+        elif col == "high":
+            out[col] = np.maximum.reduceat(values, starts)
+        elif col == "low":
+            out[col] = np.minimum.reduceat(values, starts)
+        else:
+            out[col] = values[ends]
+    return pd.DataFrame(out, index=df.index[starts])
+
+
+def _price_figure(trace_type: str, df: pd.DataFrame, title: str, template: str) -> go.Figure:
+    """
+    Build a candlestick or OHLC figure of `df` with the shared `_CANDLE_LAYOUT`.
+    
+    The trace gets raw arrays and Plotly's per-property validation is skipped,
+    which is most of the cost of building the figure; the named template is
+    resolved here because validation would otherwise do it. Long series are
+    downsampled first (see `downsample_ohlc`).
+    """
+    df = downsample_ohlc(df)
+    trace = {
+        "type": trace_type,
+        "x": df.index,
+        "open": df['open'].to_numpy(),
+        "high": df['high'].to_numpy(),
+        "low": df['low'].to_numpy(),
+        "close": df['close'].to_numpy(),
+    }
+    layout = dict(_CANDLE_LAYOUT, title={"text": title}, template=pio.templates[template])
+    return go.Figure(data=[trace], layout=layout, _validate=False)
+
 
 def get_theme_detection_script() -> str:
     """
@@ -85,45 +146,32 @@ def get_theme_detection_script() -> str:
     """
 
 
-def plot_candlestick(df: pd.DataFrame, title: str = "Candlestick Chart") -> None:
+def plot_candlestick(df: pd.DataFrame, title: str = "Candlestick Chart", *, template: str = "plotly_dark") -> None:
     """
     Create and display an interactive candlestick chart.
     
     Args:
         df: DataFrame with columns: open, high, low, close, and datetime index
         title: Title of the chart
+        template: Plotly template (theme) name
     """
     # Ensure index is datetime
     if not isinstance(df.index, pd.DatetimeIndex):
         df.index = pd.to_datetime(df.index)
     
-    fig = go.Figure(data=[go.Candlestick(
-        x=df.index,
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close']
-    )])
-    
-    fig.update_layout(
-        title=title,
-        yaxis_title="Price",
-        xaxis_title="Date",
-        xaxis_rangeslider_visible=False,
-        template="plotly_dark",
-        hovermode="x unified"
-    )
+    fig = _price_figure("candlestick", df, title, template)
     
     fig.show()
 
 
-def plot_price_line(df: pd.DataFrame, title: str = "Price Chart") -> None:
+def plot_price_line(df: pd.DataFrame, title: str = "Price Chart", *, template: str = "plotly_white") -> None:
     """
     Create and display a line chart of closing prices.
     
     Args:
         df: DataFrame with columns: close, and datetime index
         title: Title of the chart
+        template: Plotly template (theme) name
     """
     # Ensure index is datetime
     if not isinstance(df.index, pd.DatetimeIndex):
@@ -143,52 +191,39 @@ def plot_price_line(df: pd.DataFrame, title: str = "Price Chart") -> None:
         title=title,
         yaxis_title="Price",
         xaxis_title="Date",
-        template="plotly_white",
+        template=template,
         hovermode="x unified"
     )
     
     fig.show()
 
 
-def plot_ohlc(df: pd.DataFrame, title: str = "OHLC Chart") -> None:
+def plot_ohlc(df: pd.DataFrame, title: str = "OHLC Chart", *, template: str = "plotly_dark") -> None:
     """
     Create and display an OHLC (Open-High-Low-Close) bar chart.
     
     Args:
         df: DataFrame with columns: open, high, low, close, and datetime index
         title: Title of the chart
+        template: Plotly template (theme) name
     """
     # Ensure index is datetime
     if not isinstance(df.index, pd.DatetimeIndex):
         df.index = pd.to_datetime(df.index)
     
-    fig = go.Figure(data=[go.Ohlc(
-        x=df.index,
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close']
-    )])
-    
-    fig.update_layout(
-        title=title,
-        yaxis_title="Price",
-        xaxis_title="Date",
-        xaxis_rangeslider_visible=False,
-        template="plotly_dark",
-        hovermode="x unified"
-    )
+    fig = _price_figure("ohlc", df, title, template)
     
     fig.show()
 
 
-def plot_multiple_candlesticks(data_dict: dict, title: str = "Multiple Instruments") -> None:
+def plot_multiple_candlesticks(data_dict: dict, title: str = "Multiple Instruments", *, template: str = "plotly_dark") -> None:
     """
     Create candlestick charts for multiple instruments in subplots.
     
     Args:
         data_dict: Dictionary with format {instrument_name: dataframe}
         title: Title of the chart
+        template: Plotly template (theme) name
     """
     num_pairs = len(data_dict)
     fig = make_subplots(
@@ -202,6 +237,7 @@ def plot_multiple_candlesticks(data_dict: dict, title: str = "Multiple Instrumen
         # Ensure index is datetime
         if not isinstance(df.index, pd.DatetimeIndex):
             df.index = pd.to_datetime(df.index)
+        df = downsample_ohlc(df)
         
         fig.add_trace(
             go.Candlestick(
@@ -218,14 +254,14 @@ def plot_multiple_candlesticks(data_dict: dict, title: str = "Multiple Instrumen
     fig.update_layout(
         title=title,
         height=300 * num_pairs,
-        template="plotly_dark",
+        template=template,
         hovermode="x unified"
     )
     
     fig.show()
 
 
-def save_candlestick_html(df: pd.DataFrame, filename: str, title: str = "Candlestick Chart") -> None:
+def save_candlestick_html(df: pd.DataFrame, filename: str, title: str = "Candlestick Chart", *, template: str = "plotly_dark") -> None:
     """
     Create a candlestick chart and save it as an HTML file.
     The saved HTML will detect parent dark-mode and adjust theme dynamically.
@@ -234,29 +270,15 @@ def save_candlestick_html(df: pd.DataFrame, filename: str, title: str = "Candles
         df: DataFrame with columns: open, high, low, close, and datetime index
         filename: Output HTML filename
         title: Title of the chart
+        template: Plotly template (theme) name
     """
     # Ensure index is datetime
     if not isinstance(df.index, pd.DatetimeIndex):
         df.index = pd.to_datetime(df.index)
     
-    fig = go.Figure(data=[go.Candlestick(
-        x=df.index,
-        open=df['open'],
-        high=df['high'],
-        low=df['low'],
-        close=df['close']
-    )])
-    
-    fig.update_layout(
-        title=title,
-        yaxis_title="Price",
-        xaxis_title="Date",
-        xaxis_rangeslider_visible=False,
-        template="plotly_dark",
-        hovermode="x unified"
-    )
+    fig = _price_figure("candlestick", df, title, template)
     
-    fig.write_html(filename)
+    fig.write_html(filename, include_plotlyjs="cdn", validate=False)
     
     # Inject theme-detection script into the saved HTML
     with open(filename, 'a') as f:
@@ -265,7 +287,7 @@ def save_candlestick_html(df: pd.DataFrame, filename: str, title: str = "Candles
     print(f"✅ Chart saved to {filename}")
 
 
-def plot_equity_curve(equity_series, title: str = "Equity Curve", filename: str = None, show: bool = True):
+def plot_equity_curve(equity_series, title: str = "Equity Curve", filename: str = None, show: bool = True, *, template: str = "plotly_dark"):
     """
     Plot an equity curve (P/L over time) and optionally save to an HTML file.
 
@@ -274,6 +296,7 @@ def plot_equity_curve(equity_series, title: str = "Equity Curve", filename: str
         title: Chart title
         filename: If provided, write the interactive chart to this HTML file
         show: If True, render the figure immediately
+        template: Plotly template (theme) name
     Returns:
         plotly Figure
     """
@@ -309,12 +332,12 @@ def plot_equity_curve(equity_series, title: str = "Equity Curve", filename: str
         title=title,
         xaxis_title='Time',
         yaxis_title='Equity ($)',
-        template='plotly_dark',
+        template=template,
         hovermode='x unified',
     )
 
     if filename:
-        fig.write_html(filename)
+        fig.write_html(filename, include_plotlyjs="cdn", validate=False)
         
         # Inject theme-detection script into the saved HTML
         with open(filename, 'a') as f:
@@ -13,13 +13,59 @@ Usage:
     stats, df, bt = run_backtest_with_strategy(df, strategy)
 """
 
+import hashlib
+from collections import OrderedDict
 from typing import Dict, Any
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
 from strategy_framework import BaseStrategy
 
 
+# RSI and ATR of recently seen price data, keyed on (price digest, rsi_length, atr_length):
+# runs that only change the oversold/overbought thresholds reuse them
+_INDICATOR_MEMO = OrderedDict()
+_INDICATOR_MEMO_SIZE = 8
+
+
+def _price_digest(df: pd.DataFrame) -> str:
+    """Hash of the High/Low/Close values the indicators are computed from."""
+    digest = hashlib.sha1()
+    for col in ('High', 'Low', 'Close'):
+        digest.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)).data)
+    return digest.hexdigest()
+
+
+def _jit(func):
+    """Compile `func` with Numba (cached on disk) when it is installed; otherwise run it as plain Python."""
+    return func if njit is None else njit(cache=True)(func)
+
+
+@_jit
+def _rsi_signal_loop(rsi, oversold, overbought):
+    """Signal per bar: 1 where RSI crosses above `oversold`, -1 where it crosses below `overbought`.
+
+    A bar loop over the raw array rather than masks, so rules that carry state
+    from bar to bar (an open position, a cooldown) can be added here.
+    """
+    n = rsi.shape[0]
+    out = np.zeros(n, np.int8)
+    for i in range(1, n):
+        prev = rsi[i - 1]
+        curr = rsi[i]
+        if prev <= oversold and curr > oversold:
+            out[i] = 1
+        elif prev >= overbought and curr < overbought:
+            out[i] = -1
+    return out
+
+
 class RSIStrategy(BaseStrategy):
     """
     Simple RSI (Relative Strength Index) overbought/oversold strategy.
@@ -74,12 +120,23 @@ class RSIStrategy(BaseStrategy):
         Returns:
             DataFrame with RSI and ATR
         """
+        key = (_price_digest(df), self.rsi_length, self.atr_length)
+        cached = _INDICATOR_MEMO.get(key)
+        if cached is not None:
+            print(f"   📊 Reusing RSI (length={self.rsi_length}) and ATR (length={self.atr_length})")
+            df['RSI'] = cached[0].copy()
+            df['ATR'] = cached[1].copy()
+            return df
+        
         print(f"   📊 Adding RSI (length={self.rsi_length})")
         df = self.add_rsi(df, column='Close', length=self.rsi_length)
         
         print(f"   ⚠️  Adding ATR (length={self.atr_length})")
         df = self.add_atr(df, length=self.atr_length)
         
+        _INDICATOR_MEMO[key] = (df['RSI'].to_numpy(copy=True), df['ATR'].to_numpy(copy=True))
+        while len(_INDICATOR_MEMO) > _INDICATOR_MEMO_SIZE:
+            _INDICATOR_MEMO.popitem(last=False)
         return df
     
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -99,20 +156,8 @@ class RSIStrategy(BaseStrategy):
         """
         print(f"   🎯 Generating RSI signals (OS={self.oversold}, OB={self.overbought})")
         
-        df['signal'] = 0
-        
-        for i in range(1, len(df)):
-            rsi_prev = df['RSI'].iloc[i-1]
-            rsi_curr = df['RSI'].iloc[i]
-            
-            # Long: RSI crosses above oversold
-            if rsi_prev <= self.oversold and rsi_curr > self.oversold:
-                df.loc[df.index[i], 'signal'] = 1
-            
-            # Short: RSI crosses below overbought
-            elif rsi_prev >= self.overbought and rsi_curr < self.overbought:
-                df.loc[df.index[i], 'signal'] = -1
-        
+        rsi = np.ascontiguousarray(df['RSI'].to_numpy(dtype=np.float64))
+        df['signal'] = _rsi_signal_loop(rsi, float(self.oversold), float(self.overbought))
         return df
     
     def get_parameters(self) -> Dict[str, Any]:
@@ -0,0 +1,183 @@
+/*
+ * Order Block UI – page behaviour shared by the dashboard and pair views.
+ * Served from /static so browsers cache it across pages.
+ */
+
+// Dashboard category tabs
+function showCategory(id, btn) {
+    document.querySelectorAll('.category-pane').forEach(p => p.classList.remove('active'));
+    document.querySelectorAll('.category-btn').forEach(b => b.classList.remove('active'));
+    const el = document.getElementById(id);
+    if (el) el.classList.add('active');
+    if (btn) btn.classList.add('active');
+}
+
+// Pair detail view
+function showTab(tabId, btn) {
+    // hide all tab contents
+    document.querySelectorAll('.tab-content').forEach(el => el.style.display = 'none');
+    // remove active class from buttons
+    document.querySelectorAll('.tab-btn').forEach(b => b.classList.remove('active'));
+    // show requested tab
+    const t = document.getElementById(tabId);
+    if (t) {
+        t.style.display = 'block';
+        // If this is the bokeh tab, trigger async load of the Bokeh chart
+        if (tabId === 'tab-bokeh') {
+            try {
+                loadBokeh();
+            } catch (e) {
+                console.warn('Failed to load Bokeh chart', e);
+            }
+        }
+    }
+    // mark button active
+    if (btn) btn.classList.add('active');
+}
+
+// Mount chart thumbnails only once they scroll into view (hidden tabs never intersect)
+function mountIframe(iframe) {
+    if (iframe.dataset.loaded) return;
+    if (iframe.dataset.srcdoc) {
+        // Small charts are inlined in the page, so no /chart round trip is needed
+        iframe.srcdoc = iframe.dataset.srcdoc;
+    } else if (iframe.dataset.src) {
+        iframe.src = iframe.dataset.src;
+    } else {
+        return;
+    }
+    iframe.dataset.loaded = '1';
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const frames = document.querySelectorAll('iframe[data-src], iframe[data-srcdoc]');
+    if (!('IntersectionObserver' in window)) {
+        frames.forEach(mountIframe);
+        return;
+    }
+    const io = new IntersectionObserver((entries) => {
+        entries.forEach(e => {
+            if (e.isIntersecting) {
+                mountIframe(e.target);
+                io.unobserve(e.target);
+            }
+        });
+    }, { rootMargin: '200px' });
+    frames.forEach(f => io.observe(f));
+});
+
+// Ensure default tab is shown on load
+document.addEventListener('DOMContentLoaded', function() {
+    const first = document.querySelector('.tab-btn');
+    if (!first) return;
+    // if a tab button is active, use it; otherwise default to summary
+    const active = document.querySelector('.tab-btn.active');
+    showTab(active ? active.dataset.tab : 'tab-summary', active || first);
+});
+
+// Function to load Bokeh chart asynchronously
+function loadBokeh() {
+    const container = document.getElementById('bokeh-container');
+    if (!container) return;
+    if (container.dataset.loaded === '1') return;
+    container.innerHTML = 'Loading interactive chart...';
+    const pairName = container.dataset.pair;
+    fetch('/bokeh/' + encodeURIComponent(pairName))
+        .then(r => {
+            if (!r.ok) throw new Error('Network response was not ok');
+            return r.text();
+        })
+        .then(html => {
+            container.innerHTML = html;
+            container.dataset.loaded = '1';
+        })
+        .catch(async err => {
+            console.error('Error fetching Bokeh chart', err);
+            let msg = 'Failed to load interactive chart.';
+            try { msg = await (err.text ? err.text() : Promise.resolve(err.message)); } catch (e) {}
+            container.innerHTML = `<div class="error">${msg}</div>`;
+        });
+}
+
+// Attach click handler to manual load button if present
+document.addEventListener('DOMContentLoaded', function() {
+    const btn = document.getElementById('load-bokeh-btn');
+    if (btn) btn.addEventListener('click', () => loadBokeh());
+});
+
+// Trade log pages past the first are fetched as <tr> fragments and appended
+function loadMoreTrades(btn) {
+    const offset = parseInt(btn.dataset.offset, 10);
+    const limit = parseInt(btn.dataset.limit, 10);
+    btn.disabled = true;
+    fetch('/pair/' + encodeURIComponent(btn.dataset.pair) + '/trades?offset=' + offset + '&limit=' + limit)
+        .then(r => {
+            if (!r.ok) throw new Error('Network response was not ok');
+            return r.text();
+        })
+        .then(html => {
+            document.getElementById('trade-rows').insertAdjacentHTML('beforeend', html);
+            const next = offset + limit;
+            if (next >= parseInt(btn.dataset.total, 10)) {
+                btn.remove();
+            } else {
+                btn.dataset.offset = next;
+                btn.disabled = false;
+            }
+        })
+        .catch(err => {
+            console.error('Error fetching trades', err);
+            btn.disabled = false;
+        });
+}
+
+function toggleCollapsible(button) {
+    const content = button.nextElementSibling;
+    const icon = button.querySelector('.toggle-icon');
+
+    if (content.classList.contains('collapsed')) {
+        content.classList.remove('collapsed');
+        icon.classList.remove('collapsed');
+    } else {
+        content.classList.add('collapsed');
+        icon.classList.add('collapsed');
+    }
+}
+
+function openModal(chartFile, chartLabel) {
+    const modal = document.getElementById('chartModal');
+    const iframe = document.getElementById('modalIframe');
+    const title = document.getElementById('modalTitle');
+
+    // Re-opening the chart that is already in the modal keeps the loaded document
+    if (iframe.dataset.chart !== chartFile) {
+        const thumb = document.querySelector('iframe[data-chart="' + chartFile + '"]');
+        if (thumb && thumb.dataset.srcdoc) {
+            iframe.srcdoc = thumb.dataset.srcdoc;
+        } else {
+            iframe.removeAttribute('srcdoc');
+            iframe.src = '/chart/' + chartFile;
+        }
+        iframe.dataset.chart = chartFile;
+    }
+    title.textContent = chartLabel + ' - Full View';
+    modal.style.display = 'block';
+}
+
+function closeModal() {
+    const modal = document.getElementById('chartModal');
+    if (modal) modal.style.display = 'none';
+}
+
+window.onclick = function(event) {
+    const modal = document.getElementById('chartModal');
+    if (modal && event.target == modal) {
+        modal.style.display = 'none';
+    }
+}
+
+document.addEventListener('keydown', function(event) {
+    if (event.key === 'Escape') {
+        closeModal();
+    }
+});
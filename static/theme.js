@@ -0,0 +1,16 @@
+// Load theme from localStorage
+const savedTheme = localStorage.getItem('ob-ui-theme');
+if (savedTheme === 'dark') {
+    document.body.classList.add('dark-mode');
+    const btn = document.getElementById('themeToggle');
+    if (btn) btn.textContent = '☀️ Light Mode';
+}
+
+// Toggle function
+function toggleTheme() {
+    document.body.classList.toggle('dark-mode');
+    const isDark = document.body.classList.contains('dark-mode');
+    localStorage.setItem('ob-ui-theme', isDark ? 'dark' : 'light');
+    const btn = document.getElementById('themeToggle');
+    if (btn) btn.textContent = isDark ? '☀️ Light Mode' : '🌙 Dark Mode';
+}
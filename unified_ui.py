@@ -23,7 +23,7 @@ import os
 import argparse
 import requests
 import json
-from flask import Flask, render_template_string, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for
 from datetime import datetime
 import threading
 
@@ -98,8 +98,8 @@ def index():
     ichimoku_status = "✅ Online" if ichimoku_health else "❌ Offline"
     ob_status = "✅ Online" if ob_health else "❌ Offline"
     
-    return render_template_string(
-        UNIFIED_DASHBOARD_HTML,
+    return render_template(
+        _UNIFIED_DASHBOARD_TMPL,
         active_strategy=active,
         ichimoku_status=ichimoku_status,
         ob_status=ob_status,
@@ -178,11 +178,11 @@ def admin_panel():
     except Exception:
         pairs_data = {'FOREX_PAIRS': [], 'STOCK_PAIRS': [], 'COMMODITY_PAIRS': []}
     
-    return render_template_string(ADMIN_PANEL_HTML,
-                                  pairs_json=json.dumps(pairs_data, indent=2),
-                                  ichimoku_online=ichimoku_health is not None,
-                                  ob_online=ob_health is not None,
-                                  timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return render_template(_ADMIN_PANEL_TMPL,
+                           pairs_json=json.dumps(pairs_data, indent=2),
+                           ichimoku_online=ichimoku_health is not None,
+                           ob_online=ob_health is not None,
+                           timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
 
 @APP.route('/api/pairs')
@@ -1243,6 +1243,11 @@ ADMIN_PANEL_HTML = r"""
 </html>
 """
 
+# The page sources never change at runtime: compile them once here, instead of
+# render_template_string re-parsing the whole page on every request
+_UNIFIED_DASHBOARD_TMPL = APP.jinja_env.from_string(UNIFIED_DASHBOARD_HTML)
+_ADMIN_PANEL_TMPL = APP.jinja_env.from_string(ADMIN_PANEL_HTML)
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Unified Strategy Dashboard')
     parser.add_argument('--port', type=int, default=5002, help='Port to run on (default: 5002)')
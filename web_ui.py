@@ -20,13 +20,18 @@ Notes:
 
 import os
 import argparse
+import functools
+import hashlib
+import pickle
 import threading
 import time
-from flask import Flask, request, send_from_directory, redirect
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, request, send_from_directory, redirect, stream_with_context
 import pandas as pd
 
 from ichimoku_backtest import run_all_pairs_backtest, run_backtest_from_database
-from config import DATABASE_PATH
+from config import DATABASE_PATH, STOCKS_DB_PATH, COMMODITIES_DB_PATH, STOCK_SYMBOLS, COMMODITY_SYMBOLS
+from database import list_tables
 import plotting
 import ichimoku
 from backtest_analysis import analyze_backtest_results, format_analysis_for_html, get_analysis_css
@@ -34,6 +39,10 @@ from backtest_analysis import analyze_backtest_results, format_analysis_for_html
 APP = Flask(__name__)
 CACHE_FILE = "backtest_summary.csv"
 CHART_EXT = ".html"
+# Charts only change when a build rewrites them; revalidation against the file's ETag is a 304
+CHART_MAX_AGE = 3600
+# Per-pair backtest results behind the pair page (see _pair_backtest); shared with ob_ui
+BACKTEST_CACHE_DIR = "cache"
 
 # Background build state (threaded fallback)
 _build_lock = threading.Lock()
@@ -652,6 +661,13 @@ def get_base_css():
     """
 
 
+# Page CSS never changes at runtime; build it once instead of on every request
+_BASE_CSS = get_base_css()
+_PAIR_PAGE_CSS = _BASE_CSS + get_analysis_css()
+# Dashboard page, compiled once (templates/ichimoku_index.html)
+_INDEX_TMPL = APP.jinja_env.get_template("ichimoku_index.html")
+
+
 def build_summary(cache_path: str = CACHE_FILE):
     """Synchronous build that delegates to worker-safe `build_tasks.build_summary`.
 
@@ -722,199 +738,120 @@ def build_summary_async(cache_path: str = CACHE_FILE) -> dict:
         return {"started": True}
 
 
+@functools.lru_cache(maxsize=8)
+def _read_summary(path: str, mtime: float) -> pd.DataFrame:
+    """Parse a summary CSV; keyed on its mtime, so it is only re-read after a build rewrites it.
+
+    The frame is shared between requests: callers copy it before modifying it.
+    """
+    return pd.read_csv(path)
+
+
 @APP.route("/")
 def index():
+    """Stream the dashboard; the page head and tabs are sent before the summaries are read."""
 
-    # Load Forex and Stock summaries
-    forex_df = None
-    stock_df = None
-    if os.path.exists(CACHE_FILE):
-        forex_df = pd.read_csv(CACHE_FILE)
-    else:
-        build_summary_async(CACHE_FILE)
-        forex_df = pd.DataFrame([{"Pair": "(building)", "Return [%]": None}])
-
-    if os.path.exists("stock_backtest_summary.csv"):
-        stock_df = pd.read_csv("stock_backtest_summary.csv")
-    else:
-        stock_df = pd.DataFrame([{"Symbol": "(building)", "Return [%]": None}])
+    def load_tables():
+        # Load Forex and Stock summaries
+        forex_df = None
+        stock_df = None
+        if os.path.exists(CACHE_FILE):
+            forex_df = _read_summary(CACHE_FILE, os.path.getmtime(CACHE_FILE))
+        else:
+            build_summary_async(CACHE_FILE)
+            forex_df = pd.DataFrame([{"Pair": "(building)", "Return [%]": None}])
 
-    # Helper for details link
-    def chart_link_fx(pair_text: str):
-        try:
-            sym = pair_text.replace("/", "_") + "_daily"
-            return f'<a href="/pair/{sym}">View Details →</a>'
-        except Exception:
-            return "(no data)"
+        if os.path.exists("stock_backtest_summary.csv"):
+            stock_df = _read_summary("stock_backtest_summary.csv", os.path.getmtime("stock_backtest_summary.csv"))
+        else:
+            stock_df = pd.DataFrame([{"Symbol": "(building)", "Return [%]": None}])
 
-    def chart_link_stock(symbol: str):
-        try:
-            sym = symbol + "_daily"
-            return f'<a href="/pair/{sym}">View Details →</a>'
-        except Exception:
-            return "(no data)"
-
-    fx_display = forex_df.copy()
-    fx_display["Details"] = fx_display["Pair"].apply(chart_link_fx)
-    if "Chart" in fx_display.columns:
-        fx_display = fx_display.drop("Chart", axis=1)
-    for col in fx_display.columns:
-        if col not in ["Pair", "Details"]:
+        # Helper for details link
+        def chart_link_fx(pair_text: str):
             try:
-                fx_display[col] = fx_display[col].apply(lambda x: f"{x:.2f}" if x is not None else "N/A")
-            except:
-                pass
+                sym = pair_text.replace("/", "_") + "_daily"
+                return f'<a href="/pair/{sym}">View Details →</a>'
+            except Exception:
+                return "(no data)"
 
-    stock_display = stock_df.copy()
-    stock_display["Details"] = stock_display["Symbol"].apply(chart_link_stock)
-    for col in stock_display.columns:
-        if col not in ["Symbol", "Details"]:
+        def chart_link_stock(symbol: str):
             try:
-                stock_display[col] = stock_display[col].apply(lambda x: f"{x:.2f}" if x is not None else "N/A")
-            except:
-                pass
+                sym = symbol + "_daily"
+                return f'<a href="/pair/{sym}">View Details →</a>'
+            except Exception:
+                return "(no data)"
+
+        fx_display = forex_df.copy()
+        fx_display["Details"] = fx_display["Pair"].apply(chart_link_fx)
+        if "Chart" in fx_display.columns:
+            fx_display = fx_display.drop("Chart", axis=1)
+        for col in fx_display.columns:
+            if col not in ["Pair", "Details"]:
+                try:
+                    fx_display[col] = fx_display[col].apply(lambda x: f"{x:.2f}" if x is not None else "N/A")
+                except:
+                    pass
 
-    status_html = ""
-    if _build_state.get("running"):
-        status_html = f"<div class='status-banner running'><div><span class='building-indicator'>⚙️</span> Build running...</div></div>"
-    elif _build_state.get("last_error"):
-        status_html = f"<div class='error-box'><strong>Last Build Error:</strong> {_build_state.get('last_error')}</div>"
-    else:
-        status_html = f"<div class='status-banner success'>✅ All systems operational</div>"
+        stock_display = stock_df.copy()
+        stock_display["Details"] = stock_display["Symbol"].apply(chart_link_stock)
+        for col in stock_display.columns:
+            if col not in ["Symbol", "Details"]:
+                try:
+                    stock_display[col] = stock_display[col].apply(lambda x: f"{x:.2f}" if x is not None else "N/A")
+                except:
+                    pass
 
-    html = get_base_css()
-    html += """
-    <div class="container">
-        <header style="display:flex;justify-content:space-between;align-items:flex-start;">
-            <div>
-                <h1>📊 Ichimoku Backtest Dashboard</h1>
-                <p style="color: #999; margin-top: 10px;">Real-time FX & Stock trading strategy analysis and equity curve visualization</p>
-            </div>
-            <a href="/admin/pairs" class="btn secondary" style="padding:8px 12px;font-size:0.9em;align-self:center;margin-top:10px;">⚙️ Admin</a>
-        </header>
-        <div class="tab-nav">
-            <button class="tab-btn active" onclick="showTab('forex')">Forex Results</button>
-            <button class="tab-btn" onclick="showTab('stock')">Stock Results</button>
-            <button class="tab-btn" onclick="showTab('commodity')">Commodity Results</button>
-        </div>
-        <div id="tab-forex" class="tab-content active">
-            <h3>📈 Forex Backtest Results</h3>
-            {forex_table}
-            <h3>💹 Forex Equity Curves</h3>
-            {forex_equity}
-        </div>
-        <div id="tab-stock" class="tab-content">
-            <h3>📈 Stock Backtest Results</h3>
-            {stock_table}
-            <h3>💹 Stock Equity Curves</h3>
-            {stock_equity}
-        </div>
-        <div id="tab-commodity" class="tab-content">
-            <h3>⛏️ Commodity Backtest Results</h3>
-            {commodity_table}
-            <h3>💹 Commodity Equity Curves</h3>
-            {commodity_equity}
-        </div>
-        <hr>
-        <div class="button-group">
-            <a href="/rebuild_async" class="btn">🔄 Rebuild Summary (Async)</a>
-            <a href="/build_status" class="btn secondary">📊 Build Status</a>
-        </div>
-        <footer>Ichimoku Backtest Dashboard • Powered by Python, Flask & Plotly</footer>
-    </div>
-    <script>
-    function showTab(tab) {
-        document.querySelectorAll('.tab-btn').forEach(btn => btn.classList.remove('active'));
-        document.querySelectorAll('.tab-content').forEach(tabEl => tabEl.classList.remove('active'));
-        document.querySelector('.tab-btn[onclick*="' + tab + '"]').classList.add('active');
-        document.getElementById('tab-' + tab).classList.add('active');
-    }
-    </script>
-    <style>
-    .tab-nav { display: flex; gap: 20px; margin-bottom: 30px; }
-    .tab-btn { padding: 12px 32px; font-size: 1.1em; border: none; border-radius: 8px 8px 0 0; background: #f0f0f0; color: #667eea; cursor: pointer; font-weight: 600; transition: all 0.3s; }
-    .tab-btn.active { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; }
-    .tab-content { display: none; }
-    .tab-content.active { display: block; }
-    </style>
-    """
+        status_html = ""
+        if _build_state.get("running"):
+            status_html = f"<div class='status-banner running'><div><span class='building-indicator'>⚙️</span> Build running...</div></div>"
+        elif _build_state.get("last_error"):
+            status_html = f"<div class='error-box'><strong>Last Build Error:</strong> {_build_state.get('last_error')}</div>"
+        else:
+            status_html = f"<div class='status-banner success'>✅ All systems operational</div>"
+
+        # Render tables and equity curves
+        forex_table = fx_display.to_html(escape=False, index=False, classes="results-table")
+        stock_table = stock_display.to_html(escape=False, index=False, classes="results-table")
+
+        # Forex equity curves
+        forex_equity_files = []
+        for pair in ["EUR_USD_daily", "GBP_USD_daily", "USD_JPY_daily", "AUD_USD_daily", "USD_CAD_daily"]:
+            eq_file = f"{pair}_equity{CHART_EXT}"
+            if os.path.exists(eq_file):
+                pair_display = pair.replace("_daily", "").replace("_", "/")
+                forex_equity_files.append((pair_display, eq_file, pair))
+        # Stock equity curves (if any)
+        stock_equity_files = []
+        for symbol in stock_df["Symbol"].dropna().unique():
+            eq_file = f"{symbol}_daily_equity{CHART_EXT}"
+            if os.path.exists(eq_file):
+                stock_equity_files.append((symbol, eq_file, f"{symbol}_daily"))
+        # Commodity table (if available)
+        commodity_table = ""
+        if os.path.exists('commodity_backtest_summary.csv'):
+            commodity_df = _read_summary('commodity_backtest_summary.csv', os.path.getmtime('commodity_backtest_summary.csv'))
+            def chart_link_comm(row):
+                try:
+                    sym = row.replace('=','_') + '_daily'
+                    return f'<a href="/pair/{sym}">View Details →</a>'
+                except Exception:
+                    return '(no data)'
+            comm_display = commodity_df.copy()
+            if 'Ticker' in comm_display.columns:
+                comm_display['Details'] = comm_display['Ticker'].apply(chart_link_comm)
+            commodity_table = comm_display.to_html(escape=False, index=False, classes='results-table')
+        return {
+            "forex_table": forex_table,
+            "forex_equity": forex_equity_files,
+            "stock_table": stock_table,
+            "stock_equity": stock_equity_files,
+            "commodity_table": commodity_table,
+        }
 
-    # Render tables and equity curves
-    forex_table = fx_display.to_html(escape=False, index=False, classes="results-table")
-    stock_table = stock_display.to_html(escape=False, index=False, classes="results-table")
-
-    # Forex equity curves
-    forex_equity_files = []
-    for pair in ["EUR_USD_daily", "GBP_USD_daily", "USD_JPY_daily", "AUD_USD_daily", "USD_CAD_daily"]:
-        eq_file = f"{pair}_equity{CHART_EXT}"
-        if os.path.exists(eq_file):
-            pair_display = pair.replace("_daily", "").replace("_", "/")
-            forex_equity_files.append((pair_display, eq_file, pair))
-    forex_equity = ""
-    if forex_equity_files:
-        forex_equity += "<div class='equity-grid'>"
-        for pair_display, eq_file, pair_full in forex_equity_files:
-            forex_equity += f"""
-            <div class='equity-card'>
-                <h4>💰 {pair_display}</h4>
-                <iframe src="/chart/{eq_file}"></iframe>
-                <div class='card-footer'>
-                    <a href="/pair/{pair_full}">View Full Analysis →</a>
-                </div>
-            </div>
-            """
-        forex_equity += "</div>"
-    else:
-        forex_equity += "<p>⏳ No equity curves available yet.</p>"
-
-    # Stock equity curves (if any)
-    stock_equity_files = []
-    for symbol in stock_df["Symbol"].dropna().unique():
-        eq_file = f"{symbol}_daily_equity{CHART_EXT}"
-        if os.path.exists(eq_file):
-            stock_equity_files.append((symbol, eq_file, f"{symbol}_daily"))
-    stock_equity = ""
-    if stock_equity_files:
-        stock_equity += "<div class='equity-grid'>"
-        for symbol, eq_file, pair_full in stock_equity_files:
-            stock_equity += f"""
-            <div class='equity-card'>
-                <h4>💰 {symbol}</h4>
-                <iframe src="/chart/{eq_file}"></iframe>
-                <div class='card-footer'>
-                    <a href="/pair/{pair_full}">View Full Analysis →</a>
-                </div>
-            </div>
-            """
-        stock_equity += "</div>"
-    else:
-        stock_equity += "<p>⏳ No equity curves available yet.</p>"
-
-    # Fill template
-    # Insert tables and equity sections using f-string to avoid KeyError from CSS curly braces
-    # Commodity table (if available)
-    commodity_table = ""
-    commodity_equity = ""
-    if os.path.exists('commodity_backtest_summary.csv'):
-        commodity_df = pd.read_csv('commodity_backtest_summary.csv')
-        def chart_link_comm(row):
-            try:
-                sym = row.replace('=','_') + '_daily'
-                return f'<a href="/pair/{sym}">View Details →</a>'
-            except Exception:
-                return '(no data)'
-        comm_display = commodity_df.copy()
-        if 'Ticker' in comm_display.columns:
-            comm_display['Details'] = comm_display['Ticker'].apply(chart_link_comm)
-        commodity_table = comm_display.to_html(escape=False, index=False, classes='results-table')
-
-    html = html.replace("{forex_table}", forex_table)
-    html = html.replace("{forex_equity}", forex_equity)
-    html = html.replace("{stock_table}", stock_table)
-    html = html.replace("{stock_equity}", stock_equity)
-    html = html.replace("{commodity_table}", commodity_table)
-    html = html.replace("{commodity_equity}", commodity_equity)
-    return html
+    return Response(
+        stream_with_context(_INDEX_TMPL.generate(base_css=_BASE_CSS, load_tables=load_tables)),
+        mimetype="text/html",
+    )
 
 
 @APP.route("/rebuild")
@@ -937,7 +874,7 @@ def rebuild_async():
 @APP.route("/build_status")
 def build_status():
     s = _build_state.copy()
-    html = get_base_css()
+    html = _BASE_CSS
     html += """
     <div class="container">
         <header>
@@ -1025,7 +962,7 @@ def admin_pairs():
             }
             content = json.dumps(default, indent=2)
 
-        html = get_base_css()
+        html = _BASE_CSS
         html += """
         <div class="container">
             <header>
@@ -1047,38 +984,202 @@ def admin_pairs():
 
 @APP.route("/pair/<pair>")
 def pair_details(pair: str):
+    """Stream the pair page; the header is sent before the backtest runs.
+
+    A pair without a table is answered with a 400 up front, since the status
+    cannot change once streaming has started.
+    """
+    db_path = _pair_db_path(pair)
+    tables = _db_tables(db_path, _db_mtime(db_path))
+    if pair not in tables:
+        error = f"Table '{pair}' does not exist in {db_path}. Available tables: {sorted(tables)}"
+        return _PAIR_PAGE_CSS + '<div class="container">' + _pair_error_html(pair, error), 400
+    return Response(stream_with_context(_pair_details_stream(pair)), mimetype="text/html")
+
+
+# Ticker sets for `_pair_db_path`, built once from config
+_STOCK_SYMBOLS = frozenset(s.upper() for s in STOCK_SYMBOLS)
+# Commodity tables are named after the ticker with '=' replaced (e.g., GC_F_daily -> GC=F)
+_COMMODITY_PREFIXES = tuple(sym.replace('=', '_') for sym in COMMODITY_SYMBOLS)
+
+
+@functools.lru_cache(maxsize=256)
+def _pair_db_path(pair: str) -> str:
+    """Determine which database holds `pair` based on its name."""
+    # Check if it's a stock
+    if pair.split('_')[0].upper() in _STOCK_SYMBOLS:
+        return STOCKS_DB_PATH
+    # Check if it's a commodity
+    if pair.startswith(_COMMODITY_PREFIXES):
+        return COMMODITIES_DB_PATH
+    # Default to forex
+    return DATABASE_PATH
+
+
+def _db_mtime(db_path: str):
+    """Modification time of the file behind a sqlite:/// URI, or None if it is missing."""
+    db_file = db_path[len("sqlite:///"):] if db_path.startswith("sqlite:///") else db_path
     try:
-        # Determine which database to use based on pair name
-        from config import STOCK_SYMBOLS, COMMODITY_SYMBOLS, STOCKS_DB_PATH, COMMODITIES_DB_PATH
-        
-        # Check if it's a stock
-        base_symbol = pair.split('_')[0].upper()
-        if base_symbol in [s.upper() for s in STOCK_SYMBOLS]:
-            db_path = STOCKS_DB_PATH
-        # Check if it's a commodity (e.g., GC_F_daily -> GC=F)
-        elif any(pair.startswith(sym.replace('=', '_')) for sym in COMMODITY_SYMBOLS):
-            db_path = COMMODITIES_DB_PATH
-        # Default to forex
+        return os.path.getmtime(db_file)
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _db_tables(db_path: str, mtime) -> frozenset:
+    """Table names of a database; keyed on its mtime, so it is only inspected again after a write."""
+    if mtime is None:
+        return frozenset()
+    return frozenset(list_tables(db_path))
+
+
+def _strategy_fingerprint() -> str:
+    """Hash of the Ichimoku strategy sources, so cached results are dropped when the code changes."""
+    digest = hashlib.sha1()
+    for path in (ichimoku.__file__, run_backtest_from_database.__code__.co_filename):
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            pass
+    return digest.hexdigest()[:12]
+
+
+_STRATEGY_FINGERPRINT = _strategy_fingerprint()
+
+
+def _pair_backtest(pair: str):
+    """Return (stats, df) for a pair page, from the disk cache when the database is unchanged.
+
+    Entries are keyed on the database mtime and the strategy code, so they survive
+    restarts and are shared by every worker serving the same directory.
+    """
+    db_path = _pair_db_path(pair)
+    db_mtime = _db_mtime(db_path)
+    key = None if db_mtime is None else (pair, db_mtime, _STRATEGY_FINGERPRINT)
+    path = os.path.join(BACKTEST_CACHE_DIR, f"ichimoku_{pair}.pkl")
+    if key is not None:
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            if entry.get("key") == key:
+                return entry["stats"], entry["df"]
+        except Exception:
+            pass
+
+    stats, df, _bt = run_backtest_from_database(pair, db_path=db_path, show_plot=False)
+    # The strategy instance holds the whole backtest; the page only reads the statistics
+    stats = stats.drop(labels=["_strategy"], errors="ignore")
+    if key is not None:
+        try:
+            os.makedirs(BACKTEST_CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump({"key": key, "stats": stats, "df": df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"Could not write backtest cache {path}: {e}")
+    return stats, df
+
+
+def _equity_chart(pair, pair_display, stats):
+    eq_html = f"{pair}_equity{CHART_EXT}"
+    equity_series = getattr(stats, '_equity_series', None)
+    if equity_series is None:
+        equity_df = getattr(stats, '_equity_df', None)
+        if equity_df is None:
+            # Stats read back from the cache keep the curve as an entry, not as an attribute
+            equity_df = stats.get('_equity_curve')
+        if equity_df is not None and 'Equity' in equity_df.columns:
+            equity_series = equity_df['Equity']
+
+    if equity_series is None:
+        return None
+    plotting.plot_equity_curve(equity_series, title=f"Equity Curve: {pair_display}", filename=eq_html, show=False)
+    return f"💰 Equity Curve", eq_html
+
+
+def _clean_chart(pair, pair_display, df):
+    clean_html = f"{pair}_clean{CHART_EXT}"
+    rename_map = {}
+    for orig in ['Open','High','Low','Close']:
+        if orig in df.columns:
+            rename_map[orig] = orig.lower()
+    df_clean = df.rename(columns=rename_map)
+    plotting.save_candlestick_html(df_clean, clean_html, title=f"{pair_display} - Clean Chart")
+    return f"📈 Candlestick Chart", clean_html
+
+
+def _ichimoku_chart(pair, df):
+    ann_html = f"{pair}_ichimoku{CHART_EXT}"
+    fig = ichimoku.plot_signals_ichimoku(df, 0, len(df) - 1, show_cloud=True, show=False)
+    fig.write_html(ann_html, include_plotlyjs="cdn", validate=False)
+    return f"☁️ Ichimoku Analysis", ann_html
+
+
+def _chart_card(chart_label, chart_file):
+    # compute file meta
+    try:
+        if os.path.exists(chart_file):
+            _size = os.path.getsize(chart_file)
+            _meta_size = f"{_size/1024:.1f} KB"
+            _meta_time = time.strftime('%Y-%m-%d %H:%M', time.localtime(os.path.getmtime(chart_file)))
+            _meta = f"{_meta_size} · {_meta_time}"
         else:
-            db_path = DATABASE_PATH
+            _meta = '—'
+    except Exception:
+        _meta = '—'
 
-        stats, df, bt = run_backtest_from_database(pair, db_path=db_path, show_plot=False)
-    except Exception as e:
-        html = get_base_css()
-        html += f"""
-        <div class="container">
+    return f"""
+        <div class='equity-card clickable' onclick="openModal('{chart_file}', '{chart_label}')">
+            <h4>{chart_label}</h4>
+            <iframe data-src="/chart/{chart_file}" src="about:blank" onclick="event.stopPropagation()"></iframe>
+            <div class="chart-meta">{_meta}</div>
+        </div>
+        """
+
+
+def _pair_error_html(pair: str, error: str) -> str:
+    """Error box closing a pair page's container when the backtest cannot run."""
+    return f"""
             <div class="error-box">
                 <h2>Error</h2>
                 <p>Could not run backtest for {pair}</p>
-                <pre>{str(e)}</pre>
+                <pre>{error}</pre>
             </div>
             <a href="/" class="back-link">← Back to Dashboard</a>
         </div>
         """
-        return html, 400
 
+
+def _pair_details_stream(pair: str):
+    """Yield the pair page in pieces as the backtest and charts complete."""
     pair_display = pair.replace("_daily", "").replace("_", "/")
-    
+
+    yield _PAIR_PAGE_CSS
+    yield f"""
+    <div class="container">
+        <header>
+            <h1>📊 {pair_display} Analysis</h1>
+            <p style="color: #999;">Detailed backtest results and charts</p>
+        </header>
+    """
+
+    try:
+        stats, df = _pair_backtest(pair)
+    except Exception as e:
+        yield _pair_error_html(pair, str(e))
+        return
+
+    # Charts are written in the background while the metrics and analysis go out
+    pool = ThreadPoolExecutor(max_workers=3)
+    chart_futures = [
+        pool.submit(_equity_chart, pair, pair_display, stats),
+        pool.submit(_clean_chart, pair, pair_display, df),
+        pool.submit(_ichimoku_chart, pair, df),
+    ]
+    pool.shutdown(wait=False)
+
     # Collect stats for display
     stats_dict = {}
     for key in ["Return [%]", "Max. Drawdown [%]", "Win Rate [%]", "# Trades", "Exposure Time [%]"]:
@@ -1092,19 +1193,7 @@ def pair_details(pair: str):
     analysis = analyze_backtest_results(stats, pair=pair_display)
     analysis_html = format_analysis_for_html(analysis)
 
-    html = get_base_css()
-    html += get_analysis_css()
-    html += f"""
-    <div class="container">
-        <header>
-            <h1>📊 {pair_display} Analysis</h1>
-            <p style="color: #999;">Detailed backtest results and charts</p>
-        </header>
-    """
-    
-    
-    html += "<h3>📈 Performance Metrics</h3>"
-    html += "<div class='stats-list'>"
+    parts = ["<h3>📈 Performance Metrics</h3>", "<div class='stats-list'>"]
     
     metrics = [
         ("Return [%]", "📊", stats_dict.get("Return [%]", "N/A")),
@@ -1115,88 +1204,38 @@ def pair_details(pair: str):
     ]
     
     for label, icon, value in metrics:
-        html += f"""
+        parts.append(f"""
         <div class='stat-box'>
             <strong>{icon} {label}</strong>
             <span>{value}</span>
         </div>
-        """
+        """)
     
-    html += "</div>"
+    parts.append("</div>")
     
     # Add analysis section
-    html += "<h3>💡 AI-Generated Analysis & Insights</h3>"
-    html += analysis_html
+    parts.append("<h3>💡 AI-Generated Analysis & Insights</h3>")
+    parts.append(analysis_html)
 
     # Charts section
-    html += "<h3>📊 Charts</h3>"
-    html += "<div class='equity-grid'>"
-    
-    charts = []
-    
-    # Equity curve
-    try:
-        eq_html = f"{pair}_equity{CHART_EXT}"
-        equity_series = getattr(stats, '_equity_series', None)
-        if equity_series is None:
-            equity_df = getattr(stats, '_equity_df', None)
-            if equity_df is not None and 'Equity' in equity_df.columns:
-                equity_series = equity_df['Equity']
-
-        if equity_series is not None:
-            plotting.plot_equity_curve(equity_series, title=f"Equity Curve: {pair_display}", filename=eq_html, show=False)
-            charts.append((f"💰 Equity Curve", eq_html))
-    except Exception as e:
-        print(f"Equity chart error: {e}")
-
-    # Clean candlestick chart
-    try:
-        clean_html = f"{pair}_clean{CHART_EXT}"
-        df_clean = df.copy()
-        rename_map = {}
-        for orig in ['Open','High','Low','Close']:
-            if orig in df_clean.columns:
-                rename_map[orig] = orig.lower()
-        df_clean = df_clean.rename(columns=rename_map)
-        plotting.save_candlestick_html(df_clean, clean_html, title=f"{pair_display} - Clean Chart")
-        charts.append((f"📈 Candlestick Chart", clean_html))
-    except Exception as e:
-        print(f"Clean chart error: {e}")
+    parts.append("<h3>📊 Charts</h3>")
+    parts.append("<div class='equity-grid'>")
+    yield "".join(parts)
 
-    # Ichimoku chart
-    try:
-        ann_html = f"{pair}_ichimoku{CHART_EXT}"
-        fig = ichimoku.plot_signals_ichimoku(df, 0, len(df) - 1, show_cloud=True, show=False)
-        fig.write_html(ann_html)
-        charts.append((f"☁️ Ichimoku Analysis", ann_html))
-    except Exception as e:
-        print(f"Ichimoku chart error: {e}")
-
-    for chart_label, chart_file in charts:
-        # compute file meta
+    # Cards keep their fixed order; each one is sent as soon as its chart is written
+    for name, future in zip(("Equity", "Clean", "Ichimoku"), chart_futures):
         try:
-            if os.path.exists(chart_file):
-                _size = os.path.getsize(chart_file)
-                _meta_size = f"{_size/1024:.1f} KB"
-                _meta_time = time.strftime('%Y-%m-%d %H:%M', time.localtime(os.path.getmtime(chart_file)))
-                _meta = f"{_meta_size} · {_meta_time}"
-            else:
-                _meta = '—'
-        except Exception:
-            _meta = '—'
-
-        html += f"""
-        <div class='equity-card clickable' onclick="openModal('{chart_file}', '{chart_label}')">
-            <h4>{chart_label}</h4>
-            <iframe data-src="/chart/{chart_file}" src="about:blank" onclick="event.stopPropagation()"></iframe>
-            <div class="chart-meta">{_meta}</div>
-        </div>
-        """
-
-    html += "</div>"
+            chart = future.result()
+        except Exception as e:
+            print(f"{name} chart error: {e}")
+            continue
+        if chart is not None:
+            yield _chart_card(*chart)
+
+    yield "</div>"
     
     # Add modal for chart expansion
-    html += """
+    yield """
     <div id="chartModal" class="modal">
         <div class="modal-content">
             <div class="modal-header">
@@ -1254,12 +1293,12 @@ def pair_details(pair: str):
     <footer>Ichimoku Backtest Dashboard • Powered by Python, Flask & Plotly</footer>
     </div>
     """
-    return html
 
 
 @APP.route("/chart/<filename>")
 def serve_chart(filename):
-    return send_from_directory(".", filename)
+    """Serve chart files; in production nginx can serve these directly with an alias for /chart/."""
+    return send_from_directory(".", filename, conditional=True, max_age=CHART_MAX_AGE)
 
 
 def main():